@@ -1,4 +1,31 @@
-from loading_sdk.sync_api import LoadingApiClient
-from loading_sdk.async_api import AsyncLoadingApiClient
+import importlib
+from typing import TYPE_CHECKING
 
-__all__ = ["LoadingApiClient", "AsyncLoadingApiClient"]
+if TYPE_CHECKING:
+    from loading_sdk.async_api import AsyncLoadingApiClient
+    from loading_sdk.background import BackgroundLoadingApiClient
+    from loading_sdk.sync_api import LoadingApiClient
+
+__all__ = ["LoadingApiClient", "AsyncLoadingApiClient", "BackgroundLoadingApiClient"]
+
+# The clients are imported when they are first used, so a process that only uses
+# one of them doesn't pay for importing the http library of the other.
+_LAZY_IMPORTS = {
+    "LoadingApiClient": "loading_sdk.sync_api",
+    "AsyncLoadingApiClient": "loading_sdk.async_api",
+    "BackgroundLoadingApiClient": "loading_sdk.background",
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(_LAZY_IMPORTS[name]), name)
+    globals()[name] = value
+
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
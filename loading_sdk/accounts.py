@@ -0,0 +1,410 @@
+import collections
+import itertools
+import threading
+import time
+import zlib
+
+POLICIES = ("round_robin", "least_loaded", "sticky")
+
+NO_ACCOUNT = {"code": 503, "message": "No account available"}
+
+# The positions of the arguments of each pool method that hold the thread or post
+# id that the sticky policy routes by, and the id of the post or thread it edits.
+ROUTES = {
+    "create_post": (0, None),
+    "edit_post": (0, 0),
+    "create_thread": (None, None),
+    "edit_thread": (0, 0),
+    "get_profile": (None, None),
+}
+
+
+class Account:  # pylint: disable=too-many-instance-attributes
+    """The state of one account in an account pool.
+
+    :param client: Authenticated client of the account
+    :param name: Name of the account in the stats
+    :type name: str
+    """
+
+    def __init__(self, client, name):
+        self.client = client
+        self.name = name
+        self.in_flight = 0
+        self.requests = 0
+        self.errors = 0
+        self.rate_limited = 0
+        self.failures = 0
+        self.available_at = 0.0
+        self.sent_at = collections.deque()
+
+    def stats(self, now):
+        return {
+            "name": self.name,
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "errors": self.errors,
+            "rate_limited": self.rate_limited,
+            "healthy": self.available_at <= now,
+        }
+
+
+class AccountRouter:  # pylint: disable=too-many-instance-attributes
+    """Picks the account that each call of an account pool is sent with, and keeps
+    track of the rate limits and the health of the accounts.
+
+    Only the author of a post or thread can edit it, so edits of posts and threads
+    that the pool created are sent with the account that created them.
+
+    An account is rested for ``cooldown`` seconds when the api answers 429, or when
+    ``max_failures`` calls in a row fail. Accounts that have sent ``max_requests``
+    requests in the last ``period`` seconds are skipped until the oldest of them is
+    older than that.
+
+    :param clients: Clients of the accounts
+    :type clients: list
+    :param policy: How calls are spread over the accounts: "round_robin",
+        "least_loaded" or "sticky", which sends all calls about a thread or post with
+        the same account (**optional**)
+    :type policy: str
+    :param max_requests: Maximum number of requests of an account per period
+        (**optional**)
+    :type max_requests: int
+    :param period: Seconds of the rate limit period (**optional**)
+    :type period: float
+    :param cooldown: Seconds an account rests after a 429 or repeated failures
+        (**optional**)
+    :type cooldown: float
+    :param max_failures: Number of failed calls in a row that makes an account
+        unhealthy (**optional**)
+    :type max_failures: int
+    :param max_authors: Number of created posts and threads whose author is
+        remembered (**optional**)
+    :type max_authors: int
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        clients,
+        policy="round_robin",
+        *,
+        max_requests=None,
+        period=60,
+        cooldown=60,
+        max_failures=3,
+        max_authors=100000,
+    ):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy: {policy}")
+
+        if not clients:
+            raise ValueError("An account pool needs at least one client")
+
+        self.accounts = [Account(client, str(i)) for i, client in enumerate(clients)]
+        self.policy = policy
+        self.max_requests = max_requests
+        self.period = period
+        self.cooldown = cooldown
+        self.max_failures = max_failures
+        self.max_authors = max_authors
+        self._authors = collections.OrderedDict()
+        self._turns = itertools.cycle(range(len(self.accounts)))
+        self._lock = threading.Lock()
+
+    def acquire(self, key=None, post_id=None):
+        """Returns the account that a call should be sent with, or None if every
+        account is resting or rate limited.
+
+        :param key: Thread or post id that the sticky policy routes by (**optional**)
+        :type key: str
+        :param post_id: Id of the post or thread that the call edits, which is only
+            sent with its author if the pool created it (**optional**)
+        :type post_id: str
+        :rtype: Account
+        """
+
+        with self._lock:
+            now = time.monotonic()
+            author = self._authors.get(post_id) if post_id is not None else None
+            accounts = self.accounts if author is None else [author]
+            available = [
+                account for account in accounts if self._available(account, now)
+            ]
+
+            if not available:
+                return None
+
+            account = self._choose(available, key)
+            account.in_flight += 1
+            account.requests += 1
+
+            # The send times are only needed to enforce the rate limit.
+            if self.max_requests is not None:
+                account.sent_at.append(now)
+
+            return account
+
+    def route(self, method_name, args):
+        """Returns the account that a call of a pool method should be sent with, or
+        None if every account is resting or rate limited.
+
+        :param method_name: Name of the method, one of :data:`ROUTES`
+        :type method_name: str
+        :param args: Arguments of the call
+        :type args: tuple
+        :rtype: Account
+        """
+
+        key, post_id = (
+            None if index is None else args[index] for index in ROUTES[method_name]
+        )
+
+        return self.acquire(key, post_id)
+
+    def release(self, account, response):
+        """Records the response of a call, None if the call raised an exception.
+
+        The account is remembered as the author of posts and threads it created.
+
+        :param account: Account the call was sent with
+        :type account: Account
+        :param response: Response of the call
+        :type response: dict
+        """
+
+        code = response.get("code") if response is not None else None
+
+        with self._lock:
+            account.in_flight -= 1
+
+            if code == 429:
+                account.rate_limited += 1
+                account.available_at = time.monotonic() + self.cooldown
+            elif code is None or code >= 500 or code == 401:
+                account.errors += 1
+                account.failures += 1
+
+                if account.failures >= self.max_failures:
+                    account.failures = 0
+                    account.available_at = time.monotonic() + self.cooldown
+            else:
+                account.failures = 0
+
+            if code == 201:
+                self._remember_author(account, response.get("data"))
+
+    def stats(self):
+        """Returns the stats of every account and of the whole pool.
+
+        :rtype: dict
+        """
+
+        with self._lock:
+            now = time.monotonic()
+            accounts = [account.stats(now) for account in self.accounts]
+
+        totals = {
+            name: sum(account[name] for account in accounts)
+            for name in ("in_flight", "requests", "errors", "rate_limited", "healthy")
+        }
+
+        return {**totals, "accounts": accounts}
+
+    def _remember_author(self, account, data):
+        post_id = data.get("id") if isinstance(data, dict) else None
+
+        if post_id is None:
+            return
+
+        self._authors[post_id] = account
+        self._authors.move_to_end(post_id)
+
+        if len(self._authors) > self.max_authors:
+            self._authors.popitem(last=False)
+
+    def _available(self, account, now):
+        if account.available_at > now:
+            return False
+
+        if self.max_requests is None:
+            return True
+
+        while account.sent_at and account.sent_at[0] <= now - self.period:
+            account.sent_at.popleft()
+
+        return len(account.sent_at) < self.max_requests
+
+    def _choose(self, available, key):
+        if self.policy == "least_loaded":
+            return min(available, key=lambda account: account.in_flight)
+
+        if self.policy == "sticky" and key is not None:
+            # The next available account takes over while the sticky one rests.
+            start = zlib.crc32(key.encode()) % len(self.accounts)
+            order = self.accounts[start:] + self.accounts[:start]
+
+            return next(account for account in order if account in available)
+
+        while True:
+            account = self.accounts[next(self._turns)]
+
+            if account in available:
+                return account
+
+
+class _Pool:
+    def __init__(self, clients, **options):
+        self.router = AccountRouter(clients, **options)
+
+    def stats(self):
+        """Returns the stats of every account and of the whole pool.
+
+        :rtype: dict
+        """
+
+        return self.router.stats()
+
+
+class AccountPool(_Pool):
+    """Spreads write calls and profile calls over several accounts, so the limits of
+    one account don't cap the throughput.
+
+    :param clients: Clients of the accounts, like
+        ``[LoadingApiClient(email, password) for email, password in accounts]``.
+        The clients log in on their first call.
+    :type clients: list
+    :param options: Options of the :class:`AccountRouter`, like ``policy``
+    """
+
+    def create_post(self, thread_id, message):
+        """Creates a post with one of the accounts, see
+        :meth:`loading_sdk.LoadingApiClient.create_post`
+
+        :rtype: dict
+        """
+
+        return self._call("create_post", thread_id, message)
+
+    def edit_post(self, post_id, message):
+        """Edits a post with one of the accounts, see
+        :meth:`loading_sdk.LoadingApiClient.edit_post`
+
+        :rtype: dict
+        """
+
+        return self._call("edit_post", post_id, message)
+
+    def create_thread(self, title, message, category_name, post_type=None):
+        """Creates a thread with one of the accounts, see
+        :meth:`loading_sdk.LoadingApiClient.create_thread`
+
+        :rtype: dict
+        """
+
+        return self._call("create_thread", title, message, category_name, post_type)
+
+    def edit_thread(self, thread_id, message):
+        """Edits a thread with one of the accounts, see
+        :meth:`loading_sdk.LoadingApiClient.edit_thread`
+
+        :rtype: dict
+        """
+
+        return self._call("edit_thread", thread_id, message)
+
+    def get_profile(self):
+        """Returns the profile of one of the accounts
+
+        :rtype: dict
+        """
+
+        return self._call("get_profile")
+
+    def close(self):
+        for account in self.router.accounts:
+            account.client.close()
+
+    def _call(self, method_name, *args):
+        account = self.router.route(method_name, args)
+
+        if account is None:
+            return dict(NO_ACCOUNT)
+
+        response = None
+
+        try:
+            response = getattr(account.client, method_name)(*args)
+        finally:
+            self.router.release(account, response)
+
+        return response
+
+
+class AsyncAccountPool(_Pool):
+    """Spreads write calls and profile calls of async clients over several accounts.
+
+    :param clients: Async clients of the accounts
+    :type clients: list
+    :param options: Options of the :class:`AccountRouter`, like ``policy``
+    """
+
+    async def create_post(self, thread_id, message):
+        """Creates a post with one of the accounts
+
+        :rtype: dict
+        """
+
+        return await self._call("create_post", thread_id, message)
+
+    async def edit_post(self, post_id, message):
+        """Edits a post with one of the accounts
+
+        :rtype: dict
+        """
+
+        return await self._call("edit_post", post_id, message)
+
+    async def create_thread(self, title, message, category_name, post_type=None):
+        """Creates a thread with one of the accounts
+
+        :rtype: dict
+        """
+
+        return await self._call(
+            "create_thread", title, message, category_name, post_type
+        )
+
+    async def edit_thread(self, thread_id, message):
+        """Edits a thread with one of the accounts
+
+        :rtype: dict
+        """
+
+        return await self._call("edit_thread", thread_id, message)
+
+    async def get_profile(self):
+        """Returns the profile of one of the accounts
+
+        :rtype: dict
+        """
+
+        return await self._call("get_profile")
+
+    async def close(self):
+        for account in self.router.accounts:
+            await account.client.close()
+
+    async def _call(self, method_name, *args):
+        account = self.router.route(method_name, args)
+
+        if account is None:
+            return dict(NO_ACCOUNT)
+
+        response = None
+
+        try:
+            response = await getattr(account.client, method_name)(*args)
+        finally:
+            self.router.release(account, response)
+
+        return response
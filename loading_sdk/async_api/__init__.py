@@ -1,5 +1,7 @@
 from loading_sdk.async_api.client import (
     async_loading_api_client as AsyncLoadingApiClient,
 )
+from loading_sdk.async_api.prefetch import PrefetchPolicy
+from loading_sdk.async_api.writer import WriteQueue
 
-__all__ = ["AsyncLoadingApiClient"]
+__all__ = ["AsyncLoadingApiClient", "PrefetchPolicy", "WriteQueue"]
@@ -1,152 +1,380 @@
+import asyncio
+import functools
 import math
 
-import aiohttp
+from loading_sdk import events, protocol
+from loading_sdk import state as session_state
+from loading_sdk import write_through
+from loading_sdk.cache import ResponseCache
+from loading_sdk.search import merge_results, normalize_query
 from loading_sdk.settings import (
-    API_URL,
-    API_VERSION,
     EDITORIAL_POST_TYPES,
-    EDITORIAL_SORT,
     FORUM_CATEGORIES,
     POSTS_PER_PAGE,
-    USER_AGENT,
 )
 from loading_sdk.async_api.extractors import extract_data
+from loading_sdk.async_api.transport import AiohttpTransport
 
 
-async def async_loading_api_client(email=None, password=None):
-    client = AsyncLoadingApiClient()
-    await client._set_cookie(email, password)
+async def async_loading_api_client(email=None, password=None, state=None, **options):
+    if state is not None:
+        return AsyncLoadingApiClient.from_state(
+            state, email=email, password=password, **options
+        )
 
-    return client
+    return AsyncLoadingApiClient(email=email, password=password, **options)
 
 
-class AsyncLoadingApiClient:
+class AsyncLoadingApiClient:  # pylint: disable=too-many-instance-attributes,too-many-public-methods
     """
     An async client that allows python apps to easily communicate with the loading forums web api.
 
     Some methods can be used anonymously, while others require the client to be authenticated
     with user credentials.
 
+    The client logs in on the first call that needs it, not when it's created, and
+    concurrent calls share one login. If the session has expired the client logs in
+    again and replays the call once.
+
     :param email: users email address (**optional**)
     :type email: str
     :param password: users password (**optional**)
     :type password: str
+    :param state: State exported from another client, which is used instead of
+        logging in. The credentials are still used to log in again when the session
+        expires. (**optional**)
+    :type state: dict
+    :param cache: Read through cache for posts, threads and category listings
+        (**optional**)
+    :type cache: loading_sdk.cache.ResponseCache or loading_sdk.store.SQLiteStore
+    :param prefetch: Prefetches the next thread page into the cache (**optional**)
+    :type prefetch: loading_sdk.async_api.prefetch.PrefetchPolicy
+    :param search_index: Local full-text index that fetched posts are added to
+        (**optional**)
+    :type search_index: loading_sdk.search_index.SearchIndex
+    :param search_cache: Cache for search results (**optional**)
+    :type search_cache: loading_sdk.cache.SearchCache
+    :param extractor_cache: Cache for about and socials data (**optional**)
+    :type extractor_cache: loading_sdk.cache.ExtractorCache
+    :param executor: Thread or process pool that the about and socials data is
+        parsed in, the default executor of the event loop is used if it's not given
+        (**optional**)
+    :type executor: concurrent.futures.Executor
+    :param transport: Transport that sends the requests, aiohttp is used by default
+        (**optional**)
+    :type transport: loading_sdk.async_api.transport.AiohttpTransport or
+        loading_sdk.async_api.transport.HttpxTransport
+    :param hooks: Callbacks for the events of each call and of its requests
+        (**optional**)
+    :type hooks: loading_sdk.events.Hooks
     """
 
-    def __init__(self):
-        self._cookies = None
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        *,
+        email=None,
+        password=None,
+        cache=None,
+        prefetch=None,
+        search_index=None,
+        search_cache=None,
+        extractor_cache=None,
+        executor=None,
+        transport=None,
+        hooks=None,
+    ):
+        self._credentials = (email, password) if email and password else None
+        self._session_cookies = None
+        self._session = 0
+        self._auth_lock = None
+        self._cache = cache
+        self._prefetch = prefetch
+        self._search_index = search_index
+        self._search_cache = search_cache
+        self._extractor_cache = extractor_cache
+        self._executor = executor
+        self._hooks = hooks
+        self._transport = transport if transport is not None else AiohttpTransport()
+
+        if prefetch and cache is None:
+            self._cache = ResponseCache()
+
+    async def close(self):
+        """Cancels background work started by the client and closes the connections
+        of the transport."""
+
+        if self._prefetch:
+            self._prefetch.cancel()
+
+        await self._transport.close()
+
+    @classmethod
+    def from_state(cls, state, **options):
+        """Creates a client from the state of another client, without logging in.
+
+        :param state: State returned by :meth:`export_state`
+        :type state: dict
+        :param options: Options that replace the options in the state, like
+            ``transport``
+        :rtype: AsyncLoadingApiClient
+        """
+
+        cookies, state_options = session_state.restore_state(state)
+        client = cls(**{**state_options, **options})
+
+        # A state exported before logging in has no session, so the client logs in
+        # with its credentials when it needs to.
+        if cookies:
+            client._cookies = cookies
+
+        return client
+
+    @classmethod
+    def load_state(cls, path, **options):
+        """Creates a client from a state saved with :meth:`save_state`.
+
+        :param path: Path to the state file
+        :type path: str
+        :rtype: AsyncLoadingApiClient
+        """
+
+        return cls.from_state(session_state.load_state(path), **options)
+
+    def export_state(self):
+        """Returns the auth cookies and the options of the client as json
+        serializable data, so other processes can create the same client without
+        logging in. Call :meth:`login` first, since the client only logs in when it
+        needs to.
+
+        :rtype: dict
+        """
+
+        return session_state.export_state(
+            self._session_cookies,
+            {
+                "cache": self._cache,
+                "search_cache": self._search_cache,
+                "extractor_cache": self._extractor_cache,
+            },
+        )
+
+    def save_state(self, path):
+        """Saves the state of the client to a file.
+
+        :param path: Path to the state file
+        :type path: str
+        """
 
-    async def _set_cookie(self, email, password):
-        if email and password:
-            response = await self._authenticate(email, password)
+        session_state.save_state(self.export_state(), path)
+
+    @property
+    def _cookies(self):
+        return self._session_cookies
+
+    @_cookies.setter
+    def _cookies(self, cookies):
+        self._session_cookies = cookies
+        self._session += 1
+
+    @events.async_traced("login")
+    async def login(self):
+        """Logs in now instead of on the first call that needs it.
+
+        :return: Whether the client has a session
+        :rtype: bool
+        """
+
+        if self._session == 0 and self._credentials is not None:
+            await self._login(0)
+
+        return self._session_cookies is not None
+
+    async def _login(self, session):
+        # Created on the loop that uses it.
+        if self._auth_lock is None:
+            self._auth_lock = asyncio.Lock()
+
+        # Only one task logs in, and tasks that waited for it use its session.
+        async with self._auth_lock:
+            if self._session != session:
+                return
+
+            response = await self._authenticate(*self._credentials)
 
             if response.get("code") == 200:
-                self._cookies = response.get("cookies")
+                self._session_cookies = response.get("cookies")
+            elif protocol.login_rejected(response):
+                self._session_cookies = None
+            else:
+                # The session is left as it is, so the next call logs in again.
+                return
+
+            self._session += 1
 
     async def _authenticate(self, email, password):
-        url = f"{API_URL}/{API_VERSION}/auth/login"
-        headers = {
-            "User-Agent": USER_AGENT,
-            "content-type": "application/x-www-form-urlencoded",
-        }
-        data = {
-            "email": email,
-            "password": password,
-        }
+        response = await self._send(protocol.login(email, password))
+
+        # A successful login only sets the cookies.
+        data = None if response.status == 200 else response.json()
+
+        return protocol.login_response(response.status, data, response.cookies)
+
+    async def _send(self, request):
+        trace = events.request_trace(request)
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, headers=headers, data=data) as response:
-                if response.status == 200:
-                    return {"code": response.status, "cookies": response.cookies}
+        if not request.authenticated:
+            return await self._send_traced(trace, request)
 
-                return await response.json()
+        await self.login()
+        cookies, session = self._session_cookies, self._session
+        response = await self._send_traced(trace, request, cookies)
+
+        # The session has expired.
+        if response.status == 401 and cookies is not None and self._credentials:
+            trace = trace and trace.retry()
+            await self._login(session)
+            response = await self._send_traced(trace, request, self._session_cookies)
+
+        return response
+
+    async def _send_traced(self, trace, request, cookies=None):
+        if trace is None:
+            return await self._transport.send(request, cookies)
+
+        with trace.sending():
+            response = await self._transport.send(request, cookies)
+
+        return trace.received(response)
+
+    async def _fetch(self, request):
+        response = await self._send(request)
+
+        return response.status, response.json(), response.size
+
+    async def _run_cache(self, function, *args, **kwargs):
+        # A store that reads and writes a database is used from the default
+        # executor, so a locked database doesn't stall every task on the loop.
+        if not getattr(self._cache, "blocking", False):
+            return function(*args, **kwargs)
+
+        loop = asyncio.get_running_loop()
+
+        return await loop.run_in_executor(
+            None, functools.partial(function, *args, **kwargs)
+        )
+
+    async def _write_through(self, update, *args):
+        # Successful writes update the cached pages, so they can be read back without
+        # fetching them again.
+        if self._cache is not None:
+            await self._run_cache(update, self._cache, *args)
 
     async def _get_threads_in_forum_category(self, category_name, page):
-        url = f"{API_URL}/{API_VERSION}/posts/"
-        headers = {"User-Agent": USER_AGENT, category_name: category_name}
-
-        # Chooses a specific page instead of the first page which is the default page.
-        if page and page > 1:
-            headers["page"] = str(page)
-
-        # Doing this checks to make sure it only return data from a page that exists.
-        if page and page < 1:
-            return {
-                "code": 404,
-                "message": "Page number too low",
-                "data": {"posts": [], "users": []},
-            }
-
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as response:
-                data = await response.json()
-
-                # Page out of range.
-                if not data["posts"]:
-                    return {
-                        "code": 404,
-                        "message": "Page number too high",
-                        "data": data,
-                    }
-
-                return {
-                    "code": response.status,
-                    "message": "OK",
-                    "data": data,
-                }
+        error = protocol.page_too_low(page)
+
+        if error:
+            return error
 
+        request = protocol.category_page(category_name, page)
+        _, data = await self._get_cached(request.key, lambda: self._fetch(request))
+
+        return protocol.listing_response(data)
+
+    @events.async_traced("get_profile")
     async def get_profile(self):
         """Returns authenticated users profile data
 
         :rtype: dict
         """
 
-        url = f"{API_URL}/{API_VERSION}/users/profile"
-        headers = {"User-Agent": USER_AGENT}
-
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                url, headers=headers, cookies=self._cookies
-            ) as response:
-                data = await response.json()
-
-                if response.status == 200:
-                    return {
-                        "code": response.status,
-                        "message": "OK",
-                        "data": data,
-                    }
+        response = await self._send(protocol.profile())
 
-                return data
+        return protocol.data_response(response.status, response.json())
 
+    @events.async_traced("search")
     async def search(self, query):
         """Returns posts that matches the query
 
+        The query is sent in lower case with runs of whitespace collapsed.
+
         :param query: Search query
         :type query: str
         :rtype: dict
         """
 
-        url = f"{API_URL}/{API_VERSION}/search/"
-        headers = {
-            "User-Agent": USER_AGENT,
-            "Content-Type": "application/x-www-form-urlencoded;charset=UTF-8",
-        }
-        data = {"query": query}
+        query = normalize_query(query)
+        data = None
+
+        if self._search_cache is not None:
+            data = self._search_cache.get(query)
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, headers=headers, data=data) as response:
-                data = await response.json()
+            if data is not None:
+                events.cache_hit()
 
-                if response.status == 200:
-                    return {
-                        "code": response.status,
-                        "message": "OK" if len(data["posts"]) else "No results",
-                        "data": data,
-                    }
+        if data is None:
+            status, data = await self._fetch_search(query)
 
+            if status != 200:
                 return data
 
+            await self._store(None, data, 0)
+
+            if self._search_cache is not None:
+                self._search_cache.set(query, data)
+
+        return protocol.search_response(data)
+
+    async def _fetch_search(self, query):
+        response = await self._send(protocol.search(query))
+
+        return response.status, response.json()
+
+    async def search_many(self, queries, concurrency=4):
+        """Returns posts that matches any of the queries
+
+        Queries that are the same after normalization are only sent once, and up to
+        ``concurrency`` queries are sent at the same time. Posts and users found by
+        several queries are only included once, and the response of each query is
+        in ``data["results"]``.
+
+        :param queries: Search queries
+        :type queries: list
+        :param concurrency: Maximum number of concurrent requests (**optional**)
+        :type concurrency: int
+        :rtype: dict
+        """
+
+        queries = list(queries)
+        unique_queries = list(dict.fromkeys(map(normalize_query, queries)))
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def search(query):
+            async with semaphore:
+                return await self.search(query)
+
+        responses = await asyncio.gather(*map(search, unique_queries))
+
+        return merge_results(queries, dict(zip(unique_queries, responses)))
+
+    async def search_local(self, query, limit=POSTS_PER_PAGE):
+        """Returns posts that matches the query from the local search index
+
+        Only posts that the client has fetched are searched. The response has the
+        same shape as the response of :meth:`search`.
+
+        :param query: Search query
+        :type query: str
+        :param limit: Maximum number of posts (**optional**)
+        :type limit: int
+        :rtype: dict
+        """
+
+        if self._search_index is None:
+            return {"code": 400, "message": "No local search index"}
+
+        return self._search_index.search(query, limit)
+
+    @events.async_traced("get_post")
     async def get_post(self, post_id):
         """Returns a specific post
 
@@ -158,22 +386,12 @@ class AsyncLoadingApiClient:
         if not post_id:
             return {"code": 404, "message": '"post_id" is not allowed to be empty'}
 
-        url = f"{API_URL}/{API_VERSION}/posts/{post_id}"
-        headers = {"User-Agent": USER_AGENT}
-
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as response:
-                data = await response.json()
-
-                if response.status == 200:
-                    return {
-                        "code": response.status,
-                        "message": "OK",
-                        "data": data,
-                    }
+        request = protocol.post(post_id)
+        status, data = await self._get_cached(request.key, lambda: self._fetch(request))
 
-                return data
+        return protocol.data_response(status, data)
 
+    @events.async_traced("get_thread")
     async def get_thread(self, thread_id, page=None):
         """Returns all posts on a specific page from a specific thread
 
@@ -187,58 +405,78 @@ class AsyncLoadingApiClient:
         if not thread_id:
             return {"code": 404, "message": '"thread_id" is not allowed to be empty'}
 
-        url = f"{API_URL}/{API_VERSION}/posts/{thread_id}"
-        headers = {"User-Agent": USER_AGENT}
-
-        # Chooses a specific page instead of the first page which is the default page.
-        if page and page > 1:
-            headers["page"] = str(page)
-
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as response:
-                data = await response.json()
-
-                if response.status != 200:
-                    return data
-
-                if "title" not in data["posts"][-1]:
-                    return {
-                        "code": response.status,
-                        "message": "Exists, but was not a thread id",
-                    }
-
-                # Doing this checks to make sure it only return data from a page that exists.
-                if page:
-                    replies = data["posts"][-1]["replies"]
-                    pages = math.ceil(replies / 30)
-
-                    # There is always atleast one page.
-                    if pages == 0:
-                        pages = 1
-
-                    # Page is out of range.
-                    if page < 1:
-                        return {
-                            "code": response.status,
-                            "message": "Page number too low",
-                            "data": {"posts": [], "users": []},
-                        }
-
-                    if page > pages:
-                        return {
-                            "code": response.status,
-                            "message": "Page number too high",
-                            "data": {"posts": [], "users": []},
-                        }
-
-                successful_response = {
-                    "code": response.status,
-                    "message": "OK",
-                    "data": data,
-                }
-
-                return successful_response
+        key = protocol.thread_page(thread_id, page).key
+        page_number = key[2]
+        status, data = await self._get_cached(
+            key, lambda: self._fetch_thread_page(thread_id, page_number)
+        )
+        response = protocol.thread_response(status, data, page)
+
+        if (
+            self._prefetch
+            and response.get("message") == "OK"
+            and page_number < protocol.thread_pages(data)
+        ):
+            self._prefetch.schedule(
+                protocol.thread_page(thread_id, page_number + 1).key,
+                lambda: self._prefetch_thread_page(thread_id, page_number + 1),
+                self._cache,
+            )
+
+        return response
+
+    async def _get_cached(self, key, fetch):
+        if self._cache is not None:
+            if self._prefetch:
+                await self._prefetch.wait_for(key)
 
+            data = await self._run_cache(self._cache.get, key)
+
+            if data is not None:
+                if self._prefetch:
+                    self._prefetch.claim(key)
+
+                events.cache_hit()
+
+                return 200, data
+
+        status, data, size = await fetch()
+
+        if status == 200:
+            await self._store(key, data, size)
+
+        return status, data
+
+    async def _store(self, key, data, size):
+        if not data.get("posts"):
+            return
+
+        if self._cache is not None and key is not None:
+            await self._run_cache(self._cache.set, key, data, size=size)
+
+        if self._search_index is not None:
+            self._search_index.add(data["posts"], data["users"])
+
+    async def _fetch_thread_page(self, thread_id, page):
+        return await self._fetch(protocol.thread_page(thread_id, page))
+
+    @events.async_traced("prefetch_thread_page", root=True)
+    async def _prefetch_thread_page(self, thread_id, page):
+        # Prefetching is best effort, so any error of the transport just means
+        # that the page isn't prefetched.
+        try:
+            status, data, size = await self._fetch_thread_page(thread_id, page)
+        except Exception:  # pylint: disable=broad-except
+            return None
+
+        if status != 200:
+            return None
+
+        await self._store(("thread", thread_id, page), data, size)
+
+        return size
+
+    @events.async_traced("get_games")
     async def get_games(self, page=None):
         """Retruns threads from a specific page in the game category
 
@@ -252,6 +490,7 @@ class AsyncLoadingApiClient:
 
         return thread_data
 
+    @events.async_traced("get_other")
     async def get_other(self, page=None):
         """Retruns threads from a specific page in the other category
 
@@ -265,6 +504,7 @@ class AsyncLoadingApiClient:
 
         return thread_data
 
+    @events.async_traced("get_editorials")
     async def get_editorials(self, page=None, post_type=None, sort=None):
         """Retruns threads from a specific page in the texts category
 
@@ -279,49 +519,17 @@ class AsyncLoadingApiClient:
         :rtype: dict
         """
 
-        url = f"{API_URL}/{API_VERSION}/posts/"
-        headers = {
-            "User-Agent": USER_AGENT,
-            "texts": "texts",
-            "post-type": "neRegular",
-        }
+        error = protocol.page_too_low(page)
 
-        if post_type and post_type in EDITORIAL_POST_TYPES:
-            headers["post-type"] = post_type
-
-        if sort and sort in EDITORIAL_SORT:
-            headers["sort"] = sort
-
-        # Chooses a specific page instead of the first page which is the default page.
-        if page and page > 1:
-            headers["page"] = str(page)
-
-        # Doing this checks to make sure it only return data from a page that exists.
-        if page and page < 1:
-            return {
-                "code": 404,
-                "message": "Page number too low",
-                "data": {"posts": [], "users": []},
-            }
-
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as response:
-                data = await response.json()
-
-                # Page out of range.
-                if not data["posts"]:
-                    return {
-                        "code": 404,
-                        "message": "Page number too high",
-                        "data": data,
-                    }
-
-                return {
-                    "code": response.status,
-                    "message": "OK",
-                    "data": data,
-                }
+        if error:
+            return error
 
+        request = protocol.editorials_page(page, post_type, sort)
+        _, data = await self._get_cached(request.key, lambda: self._fetch(request))
+
+        return protocol.listing_response(data)
+
+    @events.async_traced("create_post")
     async def create_post(self, thread_id, message):
         """Create new post in a thread
 
@@ -335,40 +543,20 @@ class AsyncLoadingApiClient:
         if not thread_id:
             return {"code": 400, "message": '"thread_id" is not allowed to be empty'}
 
-        url = f"{API_URL}/{API_VERSION}/posts/{thread_id}"
-        headers = {
-            "User-Agent": USER_AGENT,
-            "content-type": "application/x-www-form-urlencoded",
-        }
-        data = {"body": message}
-
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                url,
-                headers=headers,
-                data=data,
-                cookies=self._cookies,
-            ) as response:
-                data = await response.json()
-
-                # Has no auth token.
-                if response.status == 401:
-                    return data
-
-                # Post id doesn't exist.
-                if response.status == 404:
-                    return data
-
-                if response.status == 201:
-                    return {
-                        "code": response.status,
-                        "message": "Post created",
-                        "data": data,
-                    }
-
-                # Handle any other unknown status code.
-                return data
+        response = await self._send(protocol.create_post(thread_id, message))
 
+        # Errors like a missing auth token or a post id that doesn't exist are
+        # returned as they are.
+        data = protocol.data_response(
+            response.status, response.json(), 201, "Post created"
+        )
+
+        if data.get("code") == 201:
+            await self._write_through(write_through.add_post, thread_id, data["data"])
+
+        return data
+
+    @events.async_traced("edit_post")
     async def edit_post(self, post_id, message):
         """Edit existing post in a thread
 
@@ -382,40 +570,17 @@ class AsyncLoadingApiClient:
         if not message:
             return {"code": 400, "message": '"message" is not allowed to be empty'}
 
-        url = f"{API_URL}/{API_VERSION}/posts/{post_id}"
-        headers = {
-            "User-Agent": USER_AGENT,
-            "content-type": "application/x-www-form-urlencoded",
-        }
-        data = {"body": message}
-
-        async with aiohttp.ClientSession() as session:
-            async with session.patch(
-                url,
-                headers=headers,
-                data=data,
-                cookies=self._cookies,
-            ) as response:
-                data = await response.json()
-
-                # Has no auth token.
-                if response.status == 401:
-                    return data
-
-                # Post id doesn't exist.
-                if response.status == 404:
-                    return data
-
-                if response.status == 200:
-                    return {
-                        "code": response.status,
-                        "message": "Post updated",
-                        "data": data,
-                    }
-
-                # Handle any other unknown status code.
-                return data
+        response = await self._send(protocol.edit_post(post_id, message))
+        data = protocol.data_response(
+            response.status, response.json(), 200, "Post updated"
+        )
+
+        if data.get("code") == 200:
+            await self._write_through(write_through.replace_post, data["data"])
 
+        return data
+
+    @events.async_traced("create_thread")
     async def create_thread(self, title, message, category_name, post_type=None):
         """Create new thread in one of the forum categories
 
@@ -437,45 +602,21 @@ class AsyncLoadingApiClient:
         if not post_type:
             post_type = "regular"
 
-        url = f"{API_URL}/{API_VERSION}/posts/"
-        headers = {
-            "User-Agent": USER_AGENT,
-            "content-type": "application/x-www-form-urlencoded",
-        }
-        data = {
-            "category": category_name,
-            "postType": post_type,
-            "title": title,
-            "body": message,
-        }
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                url,
-                headers=headers,
-                data=data,
-                cookies=self._cookies,
-            ) as response:
-                data = await response.json()
-
-                # Validation errors. Happens when title or message is empty.
-                # Possibly in other cases too.
-                if response.status == 400:
-                    return data
-
-                # No auth token.
-                if response.status == 401:
-                    return data
-
-                if response.status == 201:
-                    return {
-                        "code": response.status,
-                        "message": "Thread created",
-                        "data": data,
-                    }
-
-                # Handle any other unknown status code.
-                return data
+        request = protocol.create_thread(title, message, category_name, post_type)
+        response = await self._send(request)
+
+        # Validation errors, which happens when title or message is empty, and a
+        # missing auth token are returned as they are.
+        data = protocol.data_response(
+            response.status, response.json(), 201, "Thread created"
+        )
+
+        if data.get("code") == 201:
+            await self._write_through(write_through.delete_listings, category_name)
 
+        return data
+
+    @events.async_traced("edit_thread")
     async def edit_thread(self, thread_id, message):
         """Edit existing thread
 
@@ -494,32 +635,52 @@ class AsyncLoadingApiClient:
 
         return thread_data
 
+    @events.async_traced("get_about")
     async def get_about(self):
         """Get about page data
 
         :rtype dict
         """
 
-        data = await extract_data("about")
+        data = await extract_data("about", self._extractor_cache, self._executor)
 
         if not data:
             return {"code": 404, "message": "No data found", "data": None}
 
         return {"code": 200, "message": "OK", "data": data}
 
+    @events.async_traced("get_socials")
     async def get_socials(self):
         """Get social media links
 
         :rtype dict
         """
 
-        data = await extract_data("socials")
+        data = await extract_data("socials", self._extractor_cache, self._executor)
 
         if not data:
             return {"code": 404, "message": "No results found", "data": None}
 
         return {"code": 200, "message": "OK", "data": data}
 
+    @events.async_traced("get_site_metadata")
+    async def get_site_metadata(self):
+        """Get about page data and social media links together
+
+        The site is only downloaded once for both, so this is faster than calling
+        :meth:`get_about` and :meth:`get_socials`.
+
+        :rtype dict
+        """
+
+        data = await extract_data("site", self._extractor_cache, self._executor)
+
+        if not data:
+            return {"code": 404, "message": "No data found", "data": None}
+
+        return {"code": 200, "message": "OK", "data": data}
+
+    @events.async_traced("get_total_thread_pages")
     async def get_total_thread_pages(self, thread_id):
         """Returns total pages of a thread.
 
@@ -533,12 +694,9 @@ class AsyncLoadingApiClient:
         if response["code"] != 200:
             return response
 
-        thread_start = response["data"]["posts"][-1]
-        replies = max(thread_start["replies"], 1)
-        pages = math.ceil(replies / POSTS_PER_PAGE)
-
-        return pages
+        return protocol.thread_pages(response["data"])
 
+    @events.async_traced("get_total_category_pages")
     async def get_total_category_pages(self, category):
         """Returns total pages of a forum category.
 
@@ -552,44 +710,29 @@ class AsyncLoadingApiClient:
 
         working_page = None
         current_page = 1
-        url = f"{API_URL}/{API_VERSION}/posts/"
-        headers = {
-            "User-Agent": USER_AGENT,
-            "page": str(current_page),
-            category: category,
-        }
-
-        if category == "texts":
-            headers["post-type"] = "neRegular"
-
-        async with aiohttp.ClientSession() as session:
-            # Double current page until no results are returned
-            # then we know all pages after that won't work either.
-            while True:
-                headers["page"] = str(current_page)
-                async with session.get(url, headers=headers) as response:
-                    data = await response.json()
 
-                    if not data["posts"]:
-                        break
+        # Double current page until no results are returned
+        # then we know all pages after that won't work either.
+        while True:
+            response = await self._send(protocol.listing_page(category, current_page))
 
-                    working_page = current_page
-                    current_page *= 2
+            if not response.json()["posts"]:
+                break
 
-            while True:
-                page = working_page + math.floor((current_page - working_page) / 2)
-                headers["page"] = str(page)
+            working_page = current_page
+            current_page *= 2
 
-                async with session.get(url, headers=headers) as response:
-                    data = await response.json()
+        while True:
+            page = working_page + math.floor((current_page - working_page) / 2)
+            response = await self._send(protocol.listing_page(category, page))
 
-                    if data["posts"]:
-                        working_page = page
-                    else:
-                        current_page = page
+            if response.json()["posts"]:
+                working_page = page
+            else:
+                current_page = page
 
-                    if current_page - 1 == working_page:
-                        break
+            if current_page - 1 == working_page:
+                break
 
         total_pages = working_page
 
@@ -1,24 +1,135 @@
-import json
+import asyncio
+import codecs
+import contextlib
 import re
 from abc import ABC, abstractmethod
+from urllib.parse import urlparse
 
 import aiohttp
-from bs4 import BeautifulSoup
+from loading_sdk import events, protocol
+from loading_sdk.parsing import find_main_script, iter_js_literals, parse_js_literal
 from loading_sdk.settings import BASE_URL, USER_AGENT
 
+# Array literals that are assigned to a variable.
+ARRAY_PATTERN = re.compile(r"[A-Za-z_$][\w$]*\s*=\s*\[")
+# Props of the links to the social media accounts in the footer.
+LINK_PATTERN = re.compile(r"\{(?=\s*href\s*:)")
+FOOTER_LINK_CLASSES = ("Footer-icon", "Footer-patreon")
+# An array of people assigned to a variable, which only the about chunk has.
+ABOUT_SIGNATURE = re.compile(r"=\s*\[\s*\{\s*name\s*:")
+STREAM_CHUNK_SIZE = 64 * 1024
+# Characters kept between streamed pieces so a signature split by them is found.
+SIGNATURE_OVERLAP = 256
+
 
 class Extractor(ABC):
+    name = None
+    page_url = BASE_URL
+    # Sources the extractor parses, "main_script" and/or "chunks".
+    sources = ("main_script",)
+    # Pattern that only the chunk the extractor parses matches.
+    signature = None
+    # Maximum number of chunks downloaded at the same time while searching for the
+    # chunk that matches the signature.
+    max_chunk_downloads = 4
+
     async def get_source(self, url: str) -> str:
+        return "".join([piece async for piece in self.stream_source(url)])
+
+    async def stream_source(self, url: str):
+        """Yields the source of url in decoded pieces as it's downloaded."""
+
         headers = {"User-Agent": USER_AGENT}
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as response:
-                return await response.text()
+        trace = events.request_trace(protocol.Request("get", url, headers))
+
+        with trace.sending() if trace else contextlib.nullcontext():
+            async with aiohttp.ClientSession() as session:
+                async with session.get(url, headers=headers) as response:
+                    async for piece in _decode(response, trace):
+                        yield piece
+
+    async def scan_source(self, url: str):
+        """Returns the source of url if it matches the signature, otherwise None."""
+
+        pieces = []
+        window = ""
+        found = False
+        stream = self.stream_source(url)
+
+        try:
+            async for piece in stream:
+                pieces.append(piece)
+
+                if not found:
+                    window = window[-SIGNATURE_OVERLAP:] + piece
+                    found = self.signature.search(window) is not None
+        finally:
+            await stream.aclose()
+
+        return "".join(pieces) if found else None
+
+    async def find_chunks(self, chunk_urls: list, cache=None, bundle_hash=None):
+        """Fetches the chunks the extractor needs.
+
+        Extractors with a signature tries the chunk that matched it in the latest
+        bundle first. If it doesn't match, the chunks are downloaded concurrently,
+        starting with the ones from :meth:`select_chunks`, until one matches and the
+        remaining downloads are cancelled.
+
+        :return: Sources of the chunks by url
+        :rtype: dict
+        """
+
+        if self.signature is None:
+            urls = self.select_chunks(chunk_urls)
+            chunk_sources = await asyncio.gather(*map(self.get_source, urls))
+
+            return dict(zip(urls, chunk_sources))
+
+        chunk_id = cache.get_chunk_id(self.name) if cache is not None else None
+        remembered = [url for url in chunk_urls if _chunk_id(url) == chunk_id]
+        candidates = list(dict.fromkeys(self.select_chunks(chunk_urls) + chunk_urls))
+
+        for urls in (remembered, [url for url in candidates if url not in remembered]):
+            url, source = await self._find_chunk(urls)
+
+            if url is not None:
+                if cache is not None:
+                    cache.set_chunk_id(self.name, bundle_hash, _chunk_id(url))
+
+                return {url: source}
+
+        return {}
+
+    async def _find_chunk(self, urls: list):
+        semaphore = asyncio.Semaphore(self.max_chunk_downloads)
+
+        async def scan(url):
+            async with semaphore:
+                try:
+                    return url, await self.scan_source(url)
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    return url, None
+
+        tasks = [asyncio.ensure_future(scan(url)) for url in urls]
+
+        try:
+            for task in asyncio.as_completed(tasks):
+                url, source = await task
+
+                if source is not None:
+                    return url, source
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        return None, None
 
     def get_script(self, source: str) -> str:
-        soup = BeautifulSoup(source, "html.parser")
-        main_script = soup.find(src=re.compile(r"/static/js/main\.[0-9a-zA-Z]+\.js"))
+        return find_main_script(source)
 
-        return main_script["src"][1:]
+    def get_bundle_hash(self, script_url: str) -> str:
+        return re.search(r"main\.([0-9a-zA-Z]+)\.js", script_url).group(1)
 
     def get_chunks(self, source: str) -> list:
         chunk_urls = []
@@ -27,9 +138,7 @@ class Extractor(ABC):
         match = re.search(r"(static/js/).+?(?=\{)(.+?(?=\[)).+(.chunk.js)", source)
 
         if match:
-            # Transform the code into valid JSON so the chunk ids can be stored in a python dict.
-            file_name_values = re.sub(r"([0-9]+?(?=:))", r'"\1"', match.group(2))
-            chunk_ids = json.loads(file_name_values)
+            chunk_ids, _ = parse_js_literal(source, match.start(2))
 
             for key, value in chunk_ids.items():
                 chunk_url = f"{BASE_URL}/{match.group(1)}{key}.{value}{match.group(3)}"
@@ -37,65 +146,182 @@ class Extractor(ABC):
 
         return chunk_urls
 
+    def select_chunks(self, chunk_urls: list) -> list:
+        """Returns the urls of the chunks the extractor needs."""
+
+        del chunk_urls
+
+        return []
+
+    async def get_sources(
+        self, main_script_url: str, cache=None, executor=None
+    ) -> dict:
+        """Fetches each source the extractor needs once."""
+
+        sources = {"main_script": "", "chunk_urls": [], "chunks": {}}
+        sources["main_script"] = await self.get_source(f"{BASE_URL}/{main_script_url}")
+
+        if "chunks" in self.sources:
+            sources["chunk_urls"] = await _run(
+                executor, self.get_chunks, sources["main_script"]
+            )
+            sources["chunks"] = await self.find_chunks(
+                sources["chunk_urls"], cache, self.get_bundle_hash(main_script_url)
+            )
+
+        return sources
+
+    async def get_data(self, cache=None, executor=None):
+        """Extracts the data from the site.
+
+        Parsing the bundle is CPU-bound, so it runs in executor instead of on the
+        event loop. The default executor of the loop is used if it's None.
+
+        :param cache: Cache for the extracted data (**optional**)
+        :type cache: loading_sdk.cache.ExtractorCache
+        :param executor: Thread or process pool to parse in (**optional**)
+        :type executor: concurrent.futures.Executor
+        """
+
+        if cache is not None:
+            data = cache.get_fresh(self.name)
+
+            if data is not None:
+                return data
+
+        page_source = await self.get_source(self.page_url)
+        main_script_url = await _run(executor, self.get_script, page_source)
+
+        if main_script_url is None:
+            return None
+
+        bundle_hash = self.get_bundle_hash(main_script_url)
+
+        # The html page is all that has to be fetched to see if the bundle changed.
+        if cache is not None:
+            data = cache.get(self.name, bundle_hash)
+
+            if data is not None:
+                return data
+
+        sources = await self.get_sources(main_script_url, cache, executor)
+        data = await _run(executor, self.parse, sources)
+
+        if cache is not None and data is not None:
+            cache.set(self.name, bundle_hash, data)
+
+        return data
+
     @abstractmethod
-    async def get_data(self):
+    def parse(self, sources: dict):
         pass
 
 
 class AboutExtractor(Extractor):
-    async def get_data(self):
-        about_page_source = await self.get_source(f"{BASE_URL}/om")
-        main_script_url = self.get_script(about_page_source)
-        main_script_source = await self.get_source(f"{BASE_URL}/{main_script_url}")
-        chunk_urls = self.get_chunks(main_script_source)
-        about_script_url = chunk_urls[-1]
-        about_script_source = await self.get_source(about_script_url)
-
-        match = re.search(
-            r"var.e=(.+?)(?=\.map).+a=(.+?)(?=\.map)", about_script_source
-        )
-
-        if not match:
+    name = "about"
+    page_url = f"{BASE_URL}/om"
+    sources = ("main_script", "chunks")
+    signature = ABOUT_SIGNATURE
+
+    def select_chunks(self, chunk_urls: list) -> list:
+        return chunk_urls[-1:]
+
+    def parse(self, sources: dict):
+        about_script_sources = [
+            source
+            for source in sources["chunks"].values()
+            if self.signature.search(source)
+        ]
+
+        if not about_script_sources:
             return None
 
-        people = re.sub(r"(\{|\,)([a-z]+)(\:)", r'\1"\2"\3', match.group(1))
-        people = re.sub(r"(.+)(')(.+)(')(.+)", r'\1"\3"\5', people)
-        people = people.replace('slags "vuxen p', "slags 'vuxen p")
-        people = people.replace('riktigt"-framtid', "riktigt'-framtid")
-        people = people.replace("\\n", "")
-        people = people.encode("utf-8").decode("unicode_escape")
+        about_script_source = about_script_sources[0]
+
+        # The people and the moderators are the arrays of objects that are mapped
+        # to elements on the page, in that order.
+        lists = [
+            value
+            for _, value, end in iter_js_literals(about_script_source, ARRAY_PATTERN)
+            if about_script_source.startswith(".map", end)
+            and value
+            and all(isinstance(item, dict) for item in value)
+        ]
 
-        moderators = re.sub(r"(\{|\,)([a-z]+)(\:)", r'\1"\2"\3', match.group(2))
-        moderators = re.sub(r"(.+)(')(.+)(')(.+)", r'\1"\3"\5', moderators)
-        moderators = moderators.replace("\\n", "")
-        moderators = moderators.encode("utf-8").decode("unicode_escape")
+        if len(lists) < 2:
+            return None
 
         data = {
-            "people": json.loads(people),
-            "moderators": json.loads(moderators),
+            "people": lists[0],
+            "moderators": lists[1],
         }
 
         return data
 
 
 class SocialsExtractor(Extractor):
-    async def get_data(self):
-        page_source = await self.get_source(BASE_URL)
-        main_script_url = self.get_script(page_source)
-        main_script_source = await self.get_source(f"{BASE_URL}/{main_script_url}")
-
-        match = re.findall(
-            r"(?:href:\")"
-            + r"(https:\/\/|https:\/\/www.(.*?)\..*?\/.*?)"
-            + r"(?:\",target:\"_blank\",rel:\"noreferrer noopener\",className:)"
-            + r"(?:\"Footer-(?:icon|patreon)\")",
-            main_script_source,
-        )
+    name = "socials"
+    page_url = BASE_URL
+
+    def parse(self, sources: dict):
+        main_script_source = sources["main_script"]
+
+        data = []
+
+        for _, props, _ in iter_js_literals(main_script_source, LINK_PATTERN):
+            link = props.get("href")
+
+            if props.get("className") not in FOOTER_LINK_CLASSES or not link:
+                continue
 
-        if not match:
+            host = urlparse(link).hostname or ""
+            name = host[4:] if host.startswith("www.") else host
+            data.append({"name": name.split(".")[0], "link": link})
+
+        if not data:
             return None
 
-        data = [{"name": social[1], "link": social[0]} for social in match]
+        return data
+
+
+class SiteMetadataExtractor(Extractor):
+    """Runs several extractors over sources that are only fetched once."""
+
+    name = "site"
+
+    def __init__(self, extractors: list):
+        self.extractors = extractors
+        self.sources = tuple(
+            dict.fromkeys(source for e in extractors for source in e.sources)
+        )
+
+    def select_chunks(self, chunk_urls: list) -> list:
+        return list(
+            dict.fromkeys(
+                url for e in self.extractors for url in e.select_chunks(chunk_urls)
+            )
+        )
+
+    async def find_chunks(self, chunk_urls: list, cache=None, bundle_hash=None):
+        chunks = {}
+        results = await asyncio.gather(
+            *(
+                e.find_chunks(chunk_urls, cache, bundle_hash)
+                for e in self.extractors
+                if "chunks" in e.sources
+            )
+        )
+
+        for result in results:
+            chunks.update(result)
+
+        return chunks
+
+    def parse(self, sources: dict):
+        data = {e.name: e.parse(sources) for e in self.extractors}
+
+        if not any(data.values()):
+            return None
 
         return data
 
@@ -116,16 +342,62 @@ class SocialsExtractorFactory(ExtractorFactory):
         return SocialsExtractor()
 
 
-async def extract_data(extractor_name):
-    factories = {
-        "about": AboutExtractorFactory(),
-        "socials": SocialsExtractorFactory(),
-    }
+class SiteMetadataExtractorFactory(ExtractorFactory):
+    def get_extractor(self) -> Extractor:
+        extractors = [
+            factory.get_extractor()
+            for name, factory in EXTRACTOR_FACTORIES.items()
+            if name != "site"
+        ]
+
+        return SiteMetadataExtractor(extractors)
+
+
+# Extractors that are run by get_site_metadata, by name.
+EXTRACTOR_FACTORIES = {
+    "about": AboutExtractorFactory(),
+    "socials": SocialsExtractorFactory(),
+    "site": SiteMetadataExtractorFactory(),
+}
+
+
+async def _decode(response, trace):
+    decoder = codecs.getincrementaldecoder(response.charset or "utf-8")(
+        errors="replace"
+    )
+    size = 0
+
+    if trace is not None:
+        trace.headers(response.status)
+
+    async for data in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+        size += len(data)
+        yield decoder.decode(data)
+
+    if trace is not None:
+        trace.body(size)
+
+    yield decoder.decode(b"", final=True)
+
+    if trace is not None:
+        trace.decoded()
+
+
+async def _run(executor, function, *args):
+    loop = asyncio.get_running_loop()
+
+    return await loop.run_in_executor(executor, function, *args)
+
+
+def _chunk_id(chunk_url):
+    return chunk_url.rsplit("/", 1)[-1].split(".")[0]
+
 
-    if extractor_name in factories:
-        factory = factories[extractor_name]
+async def extract_data(extractor_name, cache=None, executor=None):
+    if extractor_name in EXTRACTOR_FACTORIES:
+        factory = EXTRACTOR_FACTORIES[extractor_name]
         extractor = factory.get_extractor()
-        data = await extractor.get_data()
+        data = await extractor.get_data(cache, executor)
 
         return data
 
@@ -0,0 +1,134 @@
+import asyncio
+
+
+class PrefetchPolicy:
+    """Opt-in policy that speculatively fetches the next page of a thread.
+
+    After the client has served page n of a thread, page n + 1 is fetched in the
+    background and stored in the client's response cache, so a reader that moves on
+    to the next page gets it without waiting for the network. Prefetches are
+    dropped rather than queued when the limits are reached.
+
+    :param max_concurrency: Maximum number of prefetches running at the same time
+        (**optional**)
+    :type max_concurrency: int
+    :param max_pending: Maximum number of prefetched pages that hasn't been read yet
+        (**optional**)
+    :type max_pending: int
+    :param max_size: Maximum total size in bytes of prefetched pages that hasn't been
+        read yet (**optional**)
+    :type max_size: int
+    """
+
+    def __init__(self, max_concurrency=2, max_pending=16, max_size=4 * 1024 * 1024):
+        self.max_concurrency = max_concurrency
+        self.max_pending = max_pending
+        self.max_size = max_size
+        self._tasks = {}
+        self._pending = {}
+        self._counters = {
+            "issued": 0,
+            "completed": 0,
+            "failed": 0,
+            "skipped": 0,
+            "hits": 0,
+            "wasted": 0,
+        }
+
+    def schedule(self, key, fetch, cache):
+        """Runs ``fetch()`` in the background unless key is already prefetched.
+
+        :param key: Response cache key of the page
+        :param fetch: Coroutine function that stores the page in the cache and returns
+            its size in bytes, or None if nothing was stored
+        :param cache: The response cache the page is stored in
+        :rtype: bool
+        """
+
+        if key in self._tasks or key in self._pending or key in cache:
+            return False
+
+        self._prune(cache)
+
+        if (
+            len(self._tasks) >= self.max_concurrency
+            or len(self._pending) >= self.max_pending
+            or sum(self._pending.values()) >= self.max_size
+        ):
+            self._counters["skipped"] += 1
+            return False
+
+        task = asyncio.ensure_future(fetch())
+        task.add_done_callback(lambda task: self._done(key, task))
+        self._tasks[key] = task
+        self._counters["issued"] += 1
+
+        return True
+
+    async def wait_for(self, key):
+        """Waits for an in-flight prefetch of key to finish, if there is one."""
+
+        task = self._tasks.get(key)
+
+        if task is not None:
+            await asyncio.wait([task])
+
+    def claim(self, key):
+        """Marks a prefetched page as read.
+
+        :rtype: bool
+        """
+
+        if self._pending.pop(key, None) is None:
+            return False
+
+        self._counters["hits"] += 1
+
+        return True
+
+    def cancel(self):
+        """Cancels all running prefetches."""
+
+        for task in self._tasks.values():
+            task.cancel()
+
+        self._tasks.clear()
+
+    def stats(self):
+        """Returns counters that shows whether prefetching pays off.
+
+        ``hit_rate`` is the share of completed prefetches that were read.
+
+        :rtype: dict
+        """
+
+        stats = dict(self._counters)
+        stats["in_flight"] = len(self._tasks)
+        stats["pending"] = len(self._pending)
+        stats["pending_size"] = sum(self._pending.values())
+        completed = stats["completed"]
+        stats["hit_rate"] = stats["hits"] / completed if completed else 0.0
+
+        return stats
+
+    def _done(self, key, task):
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+
+        if task.cancelled():
+            return
+
+        size = None if task.exception() else task.result()
+
+        if size is None:
+            self._counters["failed"] += 1
+            return
+
+        self._counters["completed"] += 1
+        self._pending[key] = size
+
+    def _prune(self, cache):
+        # Pages that were evicted or expired before anyone read them.
+        for key in [key for key in self._pending if key not in cache]:
+            del self._pending[key]
+            self._counters["wasted"] += 1
@@ -0,0 +1,171 @@
+import time
+
+import aiohttp
+from loading_sdk import events, protocol
+
+
+class AiohttpTransport:
+    """Sends requests with aiohttp, one connection per concurrent request.
+
+    :param session: Session to send the requests with, a new session is opened for
+        each request if it's not given (**optional**)
+    :type session: aiohttp.ClientSession
+    """
+
+    def __init__(self, session=None):
+        self.session = session
+
+    async def send(self, request, cookies=None):
+        """Sends a request and returns the response.
+
+        :param request: Request to send
+        :type request: loading_sdk.protocol.Request
+        :param cookies: Cookies to send with the request (**optional**)
+        :rtype: loading_sdk.protocol.Response
+        """
+
+        if self.session is None:
+            async with aiohttp.ClientSession(
+                trace_configs=[_trace_config()]
+            ) as session:
+                return await self._send(session, request, cookies)
+
+        return await self._send(self.session, request, cookies)
+
+    async def _send(self, session, request, cookies):
+        options = {"headers": request.headers}
+
+        if request.data is not None:
+            options["data"] = request.data
+
+        if cookies is not None:
+            options["cookies"] = cookies
+
+        trace = events.current_request()
+
+        async with session.request(request.method, request.url, **options) as response:
+            if trace is not None:
+                trace.headers(response.status)
+
+            body = await response.read()
+
+            if trace is not None:
+                trace.body(len(body))
+
+            return protocol.Response(response.status, body, response.cookies)
+
+    async def close(self):
+        pass
+
+
+class HttpxTransport:
+    """Sends requests with httpx over HTTP/2, so concurrent requests are multiplexed
+    over a few connections.
+
+    Requires the ``http2`` extra to be installed.
+
+    :param http2: Whether to use HTTP/2 (**optional**)
+    :type http2: bool
+    :param timeout: Seconds to wait for a response (**optional**)
+    :type timeout: float
+    :param limits: Connection pool limits (**optional**)
+    :type limits: httpx.Limits
+    :param transport: httpx transport to send the requests with instead of the
+        network, like ``httpx.MockTransport`` (**optional**)
+    :type transport: httpx.AsyncBaseTransport
+    """
+
+    def __init__(self, http2=True, timeout=10, limits=None, transport=None):
+        # httpx is an optional dependency.
+        import httpx  # pylint: disable=import-outside-toplevel
+
+        options = {"http2": http2, "timeout": timeout}
+
+        if limits is not None:
+            options["limits"] = limits
+
+        if transport is not None:
+            options["transport"] = transport
+
+        self.client = httpx.AsyncClient(**options)
+
+    async def send(self, request, cookies=None):
+        trace = events.current_request()
+        headers = protocol.cookie_headers(request.headers, cookies)
+
+        if trace is None:
+            response = await self.client.request(
+                request.method, request.url, headers=headers, data=request.data
+            )
+
+            return protocol.Response(
+                response.status_code, response.content, response.cookies
+            )
+
+        record = events.connect_timer(trace)
+
+        async def on_event(name, info):
+            del info
+            record(name)
+
+        async with self.client.stream(
+            request.method,
+            request.url,
+            headers=headers,
+            data=request.data,
+            extensions={"trace": on_event},
+        ) as response:
+            trace.headers(response.status_code)
+            body = await response.aread()
+            trace.body(len(body))
+
+        return protocol.Response(response.status_code, body, response.cookies)
+
+    async def close(self):
+        await self.client.aclose()
+
+
+class FakeTransport:
+    """An in-process transport that answers requests without any network traffic,
+    for tests and benchmarks.
+
+    :param handler: Function that gets a :class:`loading_sdk.protocol.Request` and
+        returns the status code and the json data of the response
+    :type handler: callable
+    """
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.requests = []
+
+    async def send(self, request, cookies=None):
+        del cookies
+        self.requests.append(request)
+        status, data = self.handler(request)
+
+        return protocol.Response.from_data(status, data)
+
+    async def close(self):
+        pass
+
+
+def _trace_config():
+    # Records the time spent connecting in the trace of the request, for the
+    # sessions the transport opens itself.
+    config = aiohttp.TraceConfig()
+
+    async def on_start(session, context, params):
+        del session, params
+        context.start = time.perf_counter()
+
+    async def on_end(session, context, params):
+        del session, params
+        trace = events.current_request()
+
+        if trace is not None:
+            trace.connected(time.perf_counter() - context.start)
+
+    config.on_connection_create_start.append(on_start)
+    config.on_connection_create_end.append(on_end)
+
+    return config
@@ -0,0 +1,350 @@
+import asyncio
+import collections
+import sys
+
+import aiohttp
+
+# Responses that are worth sending an edit again for.
+RETRY_STATUSES = (429, 502, 503, 504)
+
+# Responses that mean the write wasn't applied, so new posts and threads can be
+# sent again. A gateway error can come after the api created the post.
+NOT_APPLIED_STATUSES = (429, 503)
+
+# Writes that can be sent twice without creating a second post.
+IDEMPOTENT_METHODS = ("edit_post", "edit_thread")
+
+
+class RateLimiter:
+    """Spaces out calls so at most ``rate`` calls start per second.
+
+    :param rate: Maximum number of calls per second
+    :type rate: float
+    """
+
+    def __init__(self, rate):
+        self.interval = 1 / rate
+        self._next = 0.0
+
+    async def wait(self):
+        """Waits until the next call may start."""
+
+        now = asyncio.get_running_loop().time()
+        start = max(now, self._next)
+        self._next = start + self.interval
+
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+class Job:
+    """A queued write.
+
+    :param method_name: Name of the write method of the client
+    :type method_name: str
+    :param args: Arguments of the write method
+    :type args: tuple
+    :param key: Thread or post id that orders the writes (**optional**)
+    :type key: str
+    :param idempotency_key: Key that identifies the write (**optional**)
+    :type idempotency_key: str
+    """
+
+    def __init__(self, method_name, args, key=None, idempotency_key=None):
+        self.method_name = method_name
+        self.args = args
+        self.key = key
+        self.idempotency_key = idempotency_key
+        self.future = asyncio.get_running_loop().create_future()
+        self.previous = None
+
+
+class WriteQueue:  # pylint: disable=too-many-instance-attributes
+    """Queues posts, edits and new threads and sends them with a client at a limited
+    rate.
+
+    Writes to the same thread, or edits of the same post, are sent one at a time in
+    the order they were queued, while other writes are sent concurrently. Edits
+    that the api rejects with 429 or 502-504, or that fail with a network error, are
+    retried with exponential backoff. New posts and threads are only retried after
+    a 429 or 503, or when the connection couldn't be opened, since the first
+    attempt may have been created otherwise.
+
+    A write queued with an ``idempotency_key`` that is already queued or was sent
+    successfully isn't sent again, and the response of the first write is returned
+    instead.
+
+    When ``max_size`` writes are queued, queuing waits until there is room.
+
+    :param client: Client to send the writes with
+    :type client: loading_sdk.async_api.client.AsyncLoadingApiClient
+    :param max_size: Maximum number of queued writes (**optional**)
+    :type max_size: int
+    :param concurrency: Maximum number of writes sent at the same time (**optional**)
+    :type concurrency: int
+    :param rate: Maximum number of writes sent per second (**optional**)
+    :type rate: float
+    :param retries: Maximum number of retries of each write (**optional**)
+    :type retries: int
+    :param backoff: Seconds before the first retry, doubled for each retry
+        (**optional**)
+    :type backoff: float
+    :param max_keys: Number of idempotency keys of sent writes that are remembered
+        (**optional**)
+    :type max_keys: int
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        client,
+        *,
+        max_size=100,
+        concurrency=4,
+        rate=1,
+        retries=3,
+        backoff=1,
+        max_keys=10000,
+    ):
+        self.client = client
+        self.max_size = max_size
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.max_keys = max_keys
+        self.pending = 0
+        self._limiter = RateLimiter(rate)
+        self._queue = None
+        self._workers = []
+        self._tails = {}
+        self._in_flight = {}
+        self._completed = collections.OrderedDict()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def create_post(self, thread_id, message, idempotency_key=None):
+        """Queues a new post in a thread.
+
+        :return: Future of the response of ``create_post``
+        :rtype: asyncio.Future
+        """
+
+        job = Job("create_post", (thread_id, message), thread_id, idempotency_key)
+
+        return await self.submit(job)
+
+    async def edit_post(self, post_id, message, idempotency_key=None):
+        """Queues an edit of a post.
+
+        :return: Future of the response of ``edit_post``
+        :rtype: asyncio.Future
+        """
+
+        job = Job("edit_post", (post_id, message), post_id, idempotency_key)
+
+        return await self.submit(job)
+
+    async def create_thread(  # pylint: disable=too-many-arguments
+        self, title, message, category_name, post_type=None, idempotency_key=None
+    ):
+        """Queues a new thread.
+
+        :return: Future of the response of ``create_thread``
+        :rtype: asyncio.Future
+        """
+
+        args = (title, message, category_name, post_type)
+        job = Job("create_thread", args, None, idempotency_key)
+
+        return await self.submit(job)
+
+    async def edit_thread(self, thread_id, message, idempotency_key=None):
+        """Queues an edit of the first post of a thread.
+
+        :return: Future of the response of ``edit_thread``
+        :rtype: asyncio.Future
+        """
+
+        job = Job("edit_thread", (thread_id, message), thread_id, idempotency_key)
+
+        return await self.submit(job)
+
+    async def submit(self, job):
+        """Queues a write, waiting for room in the queue if it's full.
+
+        :param job: The write
+        :type job: Job
+        :return: Future of the response of the write
+        :rtype: asyncio.Future
+        """
+
+        future = self._deduplicate(job)
+
+        if future is not None:
+            return future
+
+        self._start()
+
+        # Writes with the same idempotency key are deduplicated while this one
+        # waits for room.
+        if job.idempotency_key is not None:
+            self._in_flight[job.idempotency_key] = job.future
+
+        try:
+            await self._queue.put(job)
+        except BaseException:
+            self._in_flight.pop(job.idempotency_key, None)
+            raise
+
+        self._enqueued(job)
+
+        return job.future
+
+    def submit_nowait(self, job):
+        """Queues a write without waiting.
+
+        :raises asyncio.QueueFull: If the queue is full
+        :rtype: asyncio.Future
+        """
+
+        future = self._deduplicate(job)
+
+        if future is not None:
+            return future
+
+        self._start()
+        self._queue.put_nowait(job)
+        self._enqueued(job)
+
+        if job.idempotency_key is not None:
+            self._in_flight[job.idempotency_key] = job.future
+
+        return job.future
+
+    async def join(self):
+        """Waits until every queued write has been sent."""
+
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def close(self):
+        """Waits for the queued writes and stops the workers."""
+
+        await self.join()
+
+        for worker in self._workers:
+            worker.cancel()
+
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def _start(self):
+        # The queue and the workers are created on the loop that uses them.
+        if self._queue is None:
+            self._queue = asyncio.Queue(self.max_size)
+
+        if not self._workers:
+            self._workers = [
+                asyncio.ensure_future(self._work()) for _ in range(self.concurrency)
+            ]
+
+    def _deduplicate(self, job):
+        key = job.idempotency_key
+
+        if key is None:
+            return None
+
+        if key in self._in_flight:
+            return self._in_flight[key]
+
+        if key in self._completed:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(self._completed[key])
+
+            return future
+
+        return None
+
+    def _enqueued(self, job):
+        self.pending += 1
+
+        # Writes with the same key wait for the write queued before them. This runs
+        # right after the job is put in the queue, so no worker has taken it yet.
+        if job.key is not None:
+            job.previous = self._tails.get(job.key)
+            self._tails[job.key] = job.future
+
+    async def _work(self):
+        while True:
+            job = await self._queue.get()
+
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job):
+        if job.previous is not None:
+            await asyncio.wait([job.previous])
+
+        try:
+            response = await self._send(job)
+        except Exception as error:  # pylint: disable=broad-except
+            job.future.set_exception(error)
+        else:
+            job.future.set_result(response)
+            self._remember(job, response)
+        finally:
+            self.pending -= 1
+            self._in_flight.pop(job.idempotency_key, None)
+
+            if self._tails.get(job.key) is job.future:
+                del self._tails[job.key]
+
+    async def _send(self, job):
+        method = getattr(self.client, job.method_name)
+        idempotent = job.method_name in IDEMPOTENT_METHODS
+        statuses = RETRY_STATUSES if idempotent else NOT_APPLIED_STATUSES
+        attempt = 0
+
+        while True:
+            await self._limiter.wait()
+            last_attempt = attempt >= self.retries
+
+            try:
+                response = await method(*job.args)
+            except Exception as error:  # pylint: disable=broad-except
+                if last_attempt or not (idempotent or _not_sent(error)):
+                    raise
+            else:
+                if last_attempt or response.get("code") not in statuses:
+                    return response
+
+            await asyncio.sleep(self.backoff * 2**attempt)
+            attempt += 1
+
+    def _remember(self, job, response):
+        if job.idempotency_key is None or response.get("code") not in (200, 201):
+            return
+
+        self._completed[job.idempotency_key] = response
+
+        if len(self._completed) > self.max_keys:
+            self._completed.popitem(last=False)
+
+
+def _not_sent(error):
+    """Whether a write failed because the connection couldn't be opened, so the
+    request never reached the api."""
+
+    if isinstance(error, (ConnectionRefusedError, aiohttp.ClientConnectorError)):
+        return True
+
+    # httpx is an optional dependency, and its errors can't be raised unless it's
+    # imported.
+    httpx = sys.modules.get("httpx")
+
+    return httpx is not None and isinstance(error, httpx.ConnectError)
@@ -0,0 +1,159 @@
+import asyncio
+import collections
+import functools
+import itertools
+import threading
+
+from loading_sdk import protocol
+from loading_sdk.async_api.client import async_loading_api_client
+
+
+class BackgroundLoadingApiClient:
+    """A blocking client that runs an async client on a background event loop.
+
+    Every coroutine method of :class:`loading_sdk.async_api.client.AsyncLoadingApiClient`
+    can be called as a blocking method, and the bulk methods run their requests
+    concurrently on the loop, so threaded code gets the throughput of the async
+    client without being rewritten.
+
+    :param email: users email address (**optional**)
+    :type email: str
+    :param password: users password (**optional**)
+    :type password: str
+    :param concurrency: Maximum number of requests the bulk methods run at the same
+        time (**optional**)
+    :type concurrency: int
+    :param options: Options of the async client, like ``cache`` or ``transport``
+    """
+
+    def __init__(self, email=None, password=None, *, concurrency=8, **options):
+        self.concurrency = concurrency
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="loading-sdk-loop", daemon=True
+        )
+        self._thread.start()
+        self._semaphore = self._run(_semaphore(concurrency))
+        self._client = self._run(async_loading_api_client(email, password, **options))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __getattr__(self, name):
+        # Private attributes aren't looked up on the async client, which also keeps
+        # a client that failed to start from recursing here.
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        attribute = getattr(self._client, name)
+
+        if not asyncio.iscoroutinefunction(attribute):
+            return attribute
+
+        @functools.wraps(attribute)
+        def method(*args, **kwargs):
+            return self._run(attribute(*args, **kwargs))
+
+        return method
+
+    def close(self):
+        """Closes the async client and stops the background loop."""
+
+        if not self._loop.is_running():
+            return
+
+        self._run(self._client.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def map(self, method_name, args):
+        """Calls a method of the client once for each item in args, concurrently.
+
+        :param method_name: Name of the method, like "get_post"
+        :type method_name: str
+        :param args: Arguments of each call. Tuples are passed as several arguments.
+        :type args: iterable
+        :return: The responses in the same order as args
+        :rtype: list
+        """
+
+        return list(self._results(method_name, args))
+
+    def get_posts(self, post_ids):
+        """Returns several posts, fetched concurrently
+
+        :param post_ids: Unique post ids
+        :type post_ids: iterable
+        :rtype: list
+        """
+
+        return self.map("get_post", post_ids)
+
+    def iter_thread(self, thread_id):
+        """Yields the response of each page of a thread in order
+
+        All pages after the first are fetched concurrently, so the next page is
+        usually ready when it's reached.
+
+        :param thread_id: unique thread_id
+        :type thread_id: str
+        :rtype: iterator
+        """
+
+        response = self._run(self._client.get_thread(thread_id))
+        yield response
+
+        if response["code"] != 200 or "data" not in response:
+            return
+
+        pages = range(2, protocol.thread_pages(response["data"]) + 1)
+
+        yield from self._results("get_thread", ((thread_id, page) for page in pages))
+
+    def _run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def _results(self, method_name, args):
+        """Yields the responses of the calls in the order of args.
+
+        At most ``concurrency`` calls are submitted to the loop at a time, and the
+        next call is submitted as the oldest one is done, so large iterables don't
+        create a future for each item.
+        """
+
+        method = getattr(self._client, method_name)
+
+        async def call(arg):
+            async with self._semaphore:
+                return (
+                    await method(*arg) if isinstance(arg, tuple) else await method(arg)
+                )
+
+        def submit(arg):
+            return asyncio.run_coroutine_threadsafe(call(arg), self._loop)
+
+        args = iter(args)
+        futures = collections.deque(
+            submit(arg) for arg in itertools.islice(args, self.concurrency)
+        )
+
+        try:
+            while futures:
+                response = futures.popleft().result()
+
+                for arg in itertools.islice(args, 1):
+                    futures.append(submit(arg))
+
+                yield response
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+async def _semaphore(value):
+    # Created on the loop it's used by.
+    return asyncio.Semaphore(value)
@@ -0,0 +1,262 @@
+import json
+import os
+import time
+from collections import OrderedDict
+
+
+class ResponseCache:
+    """A bounded in-memory cache for api responses.
+
+    Entries expire ``ttl`` seconds after they were stored, and the least recently
+    used entries are evicted when the cache holds more than ``max_entries`` entries
+    or more than ``max_size`` bytes.
+
+    :param ttl: Seconds an entry stays fresh (**optional**)
+    :type ttl: float
+    :param max_entries: Maximum number of entries (**optional**)
+    :type max_entries: int
+    :param max_size: Maximum total size in bytes of all entries (**optional**)
+    :type max_size: int
+    """
+
+    def __init__(self, ttl=60, max_entries=1024, max_size=None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        entry = self._entries.get(key)
+
+        return entry is not None and entry[0] > time.monotonic()
+
+    def get(self, key, default=None):
+        """Returns the cached value of key, or default if it's missing or expired."""
+
+        entry = self._entries.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return default
+
+        if entry[0] <= time.monotonic():
+            self.delete(key)
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+
+        return entry[1]
+
+    def peek(self, key):
+        """Returns the cached value of key, the seconds it stays fresh and its size,
+        or None if it's missing or expired.
+
+        Unlike :meth:`get`, the lookup isn't counted in the stats and doesn't make
+        the entry recently used.
+
+        :rtype: tuple
+        """
+
+        entry = self._entries.get(key)
+
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+
+        return entry[1], entry[0] - time.monotonic(), entry[2]
+
+    def set(self, key, value, size=0, ttl=None):
+        """Stores value under key.
+
+        :param size: Size of the value in bytes, used to enforce ``max_size``
+        :param ttl: Overrides the default ttl for this entry
+        """
+
+        self.delete(key)
+
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._entries[key] = (expires, value, size)
+        self.size += size
+
+        while self._entries and (
+            len(self._entries) > self.max_entries
+            or (self.max_size is not None and self.size > self.max_size)
+        ):
+            _, (_, _, evicted_size) = self._entries.popitem(last=False)
+            self.size -= evicted_size
+
+    def delete(self, key):
+        entry = self._entries.pop(key, None)
+
+        if entry is not None:
+            self.size -= entry[2]
+
+    def delete_prefix(self, prefix):
+        """Removes every entry whose key is a tuple that starts with prefix.
+
+        :param prefix: Leading items of the keys, like ``("thread", thread_id)``
+        :type prefix: tuple
+        """
+
+        for key in list(self._entries):
+            if isinstance(key, tuple) and key[: len(prefix)] == prefix:
+                self.delete(key)
+
+    def clear(self):
+        self._entries.clear()
+        self.size = 0
+
+    def stats(self):
+        """Returns hit and miss counters of the cache.
+
+        :rtype: dict
+        """
+
+        lookups = self.hits + self.misses
+
+        return {
+            "entries": len(self._entries),
+            "size": self.size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class SearchCache(ResponseCache):
+    """A short lived cache for search results.
+
+    Searches that didn't find anything are cached for ``negative_ttl`` seconds
+    instead, since new posts can make them find something.
+
+    :param ttl: Seconds a search result stays fresh (**optional**)
+    :type ttl: float
+    :param negative_ttl: Seconds a search without results stays fresh (**optional**)
+    :type negative_ttl: float
+    :param max_entries: Maximum number of entries (**optional**)
+    :type max_entries: int
+    """
+
+    def __init__(self, ttl=30, negative_ttl=10, max_entries=1024):
+        super().__init__(ttl=ttl, max_entries=max_entries)
+        self.negative_ttl = negative_ttl
+
+    def set(self, key, value, size=0, ttl=None):
+        if ttl is None and not value.get("posts"):
+            ttl = self.negative_ttl
+
+        super().set(key, value, size=size, ttl=ttl)
+
+
+class ExtractorCache:
+    """Caches extracted site data by the hash of the main.js bundle it came from.
+
+    The data that the extractors finds only changes when the site is deployed with
+    a new bundle, so a cached result is valid as long as the html page still points
+    to the same ``main.<hash>.js``. Results are kept in memory and, if a directory
+    is given, on disk so they survive restarts.
+
+    It also remembers which chunk of a bundle an extractor found its data in, since
+    the chunk ids usually stays the same when a new bundle is deployed.
+
+    :param path: Directory to store results in (**optional**)
+    :type path: str
+    :param max_age: Seconds a result is returned without checking whether the bundle
+        has changed (**optional**)
+    :type max_age: float
+    """
+
+    def __init__(self, path=None, max_age=0):
+        self.path = path
+        self.max_age = max_age
+        self._entries = {}
+        self._chunk_ids = {}
+
+        if path:
+            os.makedirs(path, exist_ok=True)
+
+    def get_fresh(self, name):
+        """Returns the result of an extractor if it was validated within max_age."""
+
+        entry = self._entries.get(name)
+
+        if entry is None or time.monotonic() - entry[2] >= self.max_age:
+            return None
+
+        return entry[1]
+
+    def get(self, name, bundle_hash):
+        """Returns the result of an extractor for a bundle, or None if it's missing."""
+
+        entry = self._entries.get(name)
+
+        if entry is not None and entry[0] == bundle_hash:
+            self._entries[name] = (bundle_hash, entry[1], time.monotonic())
+
+            return entry[1]
+
+        if not self.path:
+            return None
+
+        try:
+            with open(self._file(name, bundle_hash), encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return None
+
+        self._entries[name] = (bundle_hash, data, time.monotonic())
+
+        return data
+
+    def set(self, name, bundle_hash, data):
+        self._entries[name] = (bundle_hash, data, time.monotonic())
+
+        if self.path:
+            self._write(self._file(name, bundle_hash), data)
+
+    def get_chunk_id(self, name):
+        """Returns the id of the chunk an extractor found its data in the latest time,
+        or None if it's unknown."""
+
+        entry = self._chunk_ids.get(name)
+
+        if entry is None and self.path:
+            try:
+                with open(self._file(name, "chunk"), encoding="utf-8") as file:
+                    entry = json.load(file)
+            except (OSError, ValueError):
+                return None
+
+            self._chunk_ids[name] = entry
+
+        return entry["chunk_id"] if entry else None
+
+    def set_chunk_id(self, name, bundle_hash, chunk_id):
+        entry = {"bundle_hash": bundle_hash, "chunk_id": chunk_id}
+
+        if self._chunk_ids.get(name) == entry:
+            return
+
+        self._chunk_ids[name] = entry
+
+        if self.path:
+            self._write(self._file(name, "chunk"), entry)
+
+    def _write(self, file_name, data):
+        # Written to a temporary file first so readers never see a partial file.
+        temporary_file_name = f"{file_name}.{os.getpid()}.tmp"
+
+        with open(temporary_file_name, "w", encoding="utf-8") as file:
+            json.dump(data, file)
+
+        os.replace(temporary_file_name, file_name)
+
+    def _file(self, name, bundle_hash):
+        return os.path.join(self.path, f"{name}.{bundle_hash}.json")
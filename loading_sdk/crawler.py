@@ -0,0 +1,279 @@
+import collections
+import multiprocessing
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from loading_sdk import protocol
+from loading_sdk.settings import FORUM_CATEGORIES
+from loading_sdk.store import SQLiteStore
+from loading_sdk.sync_api.client import LoadingApiClient
+
+LISTING_METHODS = {
+    "games": "get_games",
+    "other": "get_other",
+    "texts": "get_editorials",
+}
+
+# The client and the store of a worker process.
+_WORKER = {}
+
+
+class Crawler:  # pylint: disable=too-many-instance-attributes
+    """Crawls forum categories and their threads with a pool of processes.
+
+    The category pages and thread pages are split into shards of ``shard_size``
+    pages, and each worker process crawls one shard at a time with its own client
+    and connections. When a worker is idle and no shards are left, the shard with
+    the most pages left is split and the worker takes the second half of it, so a
+    slow shard doesn't hold up the crawl.
+
+    Every worker writes what it fetches to the same :class:`loading_sdk.store.SQLiteStore`,
+    and pages that are fresh in the store aren't fetched again.
+
+    :param path: Path to the database file of the store
+    :type path: str
+    :param workers: Number of worker processes, the number of CPUs by default
+        (**optional**)
+    :type workers: int
+    :param shard_size: Number of pages in each shard (**optional**)
+    :type shard_size: int
+    :param client_options: Options of the client of each worker, like ``email`` and
+        ``password``. They have to be picklable. The crawler logs in once and the
+        workers reuse its session.
+    :raises ValueError: If the client options have a ``cache``, since the store is
+        the cache of the workers
+    """
+
+    def __init__(self, path, *, workers=None, shard_size=50, **client_options):
+        if "cache" in client_options:
+            raise ValueError("The crawler uses the store at path as the cache")
+
+        self.path = path
+        self.workers = workers or multiprocessing.cpu_count()
+        self.shard_size = shard_size
+        self.client_options = client_options
+        self._pending = collections.deque()
+        self._running = {}
+        self._shards = {}
+        self._threads = set()
+        self._stats = {}
+
+    def run(self, categories=None):
+        """Crawls every page of the categories and of the threads in them.
+
+        :param categories: Category names, all categories by default (**optional**)
+        :type categories: list
+        :return: The number of shards, splits, fetched pages and threads
+        :rtype: dict
+        """
+
+        self._stats = {"shards": 0, "splits": 0, "pages": 0, "threads": 0}
+        self._threads = set()
+        client = LoadingApiClient(**self.client_options)
+        self._add_shards(_category_pages(client, categories or FORUM_CATEGORIES))
+        state = client.export_state()
+        client.close()
+        options = {
+            name: value
+            for name, value in self.client_options.items()
+            if name not in ("email", "password")
+        }
+
+        with multiprocessing.Manager() as manager, ProcessPoolExecutor(
+            self.workers,
+            initializer=_init_worker,
+            initargs=(self.path, state, options),
+        ) as executor:
+            shared = (manager.Lock(), manager.dict(), manager.dict())
+
+            while self._pending or self._running:
+                while len(self._running) < self.workers and (
+                    self._pending or self._split(*shared)
+                ):
+                    self._submit(executor, *shared)
+
+                done, _ = wait(self._running, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    self._finish(self._running.pop(future), *future.result())
+
+        return dict(self._stats)
+
+    def _add_shards(self, pages):
+        for start in range(0, len(pages), self.shard_size):
+            end = start + self.shard_size
+            self._pending.append(pages[start:end])
+
+    def _submit(self, executor, lock, limits, progress):
+        shard_id = self._stats["shards"]
+        pages = self._pending.popleft()
+        self._stats["shards"] += 1
+        self._shards[shard_id] = [pages, len(pages)]
+        limits[shard_id] = len(pages)
+        future = executor.submit(_crawl_shard, shard_id, pages, lock, limits, progress)
+        self._running[future] = shard_id
+
+    def _split(self, lock, limits, progress):
+        if not self._running:
+            return False
+
+        # Workers claim their pages under the lock, so no page that is split off has
+        # been claimed.
+        with lock:
+            claimed = dict(progress)
+
+            def pages_left(shard_id):
+                return self._shards[shard_id][1] - claimed.get(shard_id, -1) - 1
+
+            shard_id = max(self._running.values(), key=pages_left)
+            left = pages_left(shard_id)
+
+            # The page that is being fetched stays in the shard.
+            if left < 2:
+                return False
+
+            pages, end = self._shards[shard_id]
+            middle = end - left // 2
+            self._shards[shard_id][1] = middle
+            limits[shard_id] = middle
+
+        self._pending.append(pages[middle:end])
+        self._stats["splits"] += 1
+
+        return True
+
+    def _finish(self, shard_id, fetched, threads):
+        del self._shards[shard_id]
+        self._stats["pages"] += fetched
+        pages = []
+
+        for thread_id, total_pages in threads:
+            if thread_id not in self._threads:
+                self._threads.add(thread_id)
+                pages.extend(_thread_pages(thread_id, total_pages))
+
+        self._stats["threads"] = len(self._threads)
+        self._add_shards(pages)
+
+
+def seed_queue(queue, client, categories=None):
+    """Adds every page of the categories to a lease queue.
+
+    Pages that are already in the queue are ignored, so every crawler process can
+    seed the queue when it starts.
+
+    :param queue: Queue to add the pages to
+    :type queue: loading_sdk.lease_queue.LeaseQueue
+    :param client: Client to count the pages with
+    :type client: loading_sdk.LoadingApiClient
+    :param categories: Category names, all categories by default (**optional**)
+    :type categories: list
+    """
+
+    queue.put(_category_pages(client, categories or FORUM_CATEGORIES))
+
+
+def crawl_queue(queue, client, batch_size=10, poll_interval=1):
+    """Crawls pages claimed from a lease queue until no work is left.
+
+    The threads on each category page are added to the queue, and each page is
+    completed as soon as it has been fetched. While other owners hold leases this
+    waits for their work, in case they add more pages or their leases expire.
+
+    :param queue: Queue to claim pages from
+    :type queue: loading_sdk.lease_queue.LeaseQueue
+    :param client: Client to fetch the pages with, with a store as its ``cache``
+    :type client: loading_sdk.LoadingApiClient
+    :param batch_size: Number of pages claimed at a time (**optional**)
+    :type batch_size: int
+    :param poll_interval: Seconds between claims while others hold leases
+        (**optional**)
+    :type poll_interval: float
+    :return: The number of fetched pages
+    :rtype: int
+    """
+
+    fetched = 0
+
+    while True:
+        pages = queue.claim(batch_size)
+
+        if not pages:
+            if not queue.stats()["leased"]:
+                return fetched
+
+            time.sleep(poll_interval)
+            continue
+
+        for page in pages:
+            for thread_id, total_pages in _crawl_page(client, *page):
+                queue.put(_thread_pages(thread_id, total_pages))
+
+            queue.complete(page)
+            queue.heartbeat()
+            fetched += 1
+
+
+def _category_pages(client, categories):
+    pages = []
+
+    for category in categories:
+        response = client.get_total_category_pages(category)
+
+        if response["code"] == 200:
+            total_pages = response["data"]["total_pages"]
+            pages.extend(
+                ("category", category, page) for page in range(1, total_pages + 1)
+            )
+
+    return pages
+
+
+def _thread_pages(thread_id, total_pages):
+    return [("thread", thread_id, page) for page in range(1, total_pages + 1)]
+
+
+def _crawl_page(client, kind, key, page):
+    if kind != "category":
+        client.get_thread(key, page)
+        return []
+
+    response = getattr(client, LISTING_METHODS[key])(page)
+
+    if response["code"] != 200:
+        return []
+
+    return [
+        (post["id"], protocol.reply_pages(post.get("replies", 0)))
+        for post in response["data"]["posts"]
+    ]
+
+
+def _init_worker(path, state, client_options):
+    store = SQLiteStore(path)
+    _WORKER["store"] = store
+    _WORKER["client"] = LoadingApiClient.from_state(
+        state, cache=store, **client_options
+    )
+
+
+def _crawl_shard(shard_id, pages, lock, limits, progress):
+    client = _WORKER["client"]
+    threads = []
+    index = 0
+
+    while True:
+        # The limit is lowered when the rest of the shard is split off, so each
+        # page is claimed before it's fetched.
+        with lock:
+            if index >= limits[shard_id]:
+                break
+
+            progress[shard_id] = index
+
+        threads.extend(_crawl_page(client, *pages[index]))
+        index += 1
+
+    _WORKER["store"].flush()
+
+    return index, threads
@@ -0,0 +1,436 @@
+import contextlib
+import contextvars
+import functools
+import time
+from collections import namedtuple
+
+from loading_sdk import protocol
+
+# The events of a call of a client method. Every request the call sends gets
+# request_start, response_headers, body_received and decode_done, or error if the
+# transport fails, and retry when it's sent again. done is sent when the call
+# returns.
+EVENTS = (
+    "request_start",
+    "response_headers",
+    "body_received",
+    "decode_done",
+    "retry",
+    "cache_hit",
+    "error",
+    "done",
+)
+
+# The phases of a request, in seconds. connect is only measured by transports that
+# can see their connections, and is None for requests on reused connections.
+PHASES = ("queue_wait", "connect", "ttfb", "download", "decode", "post_processing")
+
+# endpoint is the name of the client method, and timings holds the phases that are
+# known when the event is sent. The done event has the sum of the phases of every
+# request of the call, and the total time of the call.
+Event = namedtuple(
+    "Event",
+    [
+        "name",
+        "endpoint",
+        "url_template",
+        "method",
+        "status",
+        "size",
+        "timings",
+        "error",
+    ],
+    defaults=(None, None, None, None, None, None),
+)
+
+_call = contextvars.ContextVar("loading_sdk_call", default=None)
+_request = contextvars.ContextVar("loading_sdk_request", default=None)
+
+
+class Hooks:
+    """Callbacks that are called with an :class:`Event` as the calls of a client
+    progress.
+
+    Callbacks run in the thread or task that sends the request, so they should be
+    fast, and errors they raise are raised by the call.
+
+    .. code-block:: python
+
+        hooks = Hooks()
+        hooks.on("done", lambda event: print(event.endpoint, event.timings))
+        client = LoadingApiClient(hooks=hooks)
+    """
+
+    def __init__(self):
+        self._callbacks = {name: [] for name in EVENTS}
+
+    def on(self, name, callback=None):
+        """Adds a callback for an event. Can be used as a decorator.
+
+        :param name: Name of the event, one of :data:`EVENTS`
+        :type name: str
+        :param callback: Function that gets the :class:`Event`
+        :type callback: callable
+        :raises ValueError: If there is no event with the name
+        """
+
+        if name not in self._callbacks:
+            raise ValueError(f"Unknown event: {name}")
+
+        if callback is None:
+            return functools.partial(self.on, name)
+
+        self._callbacks[name].append(callback)
+
+        return callback
+
+    def remove(self, name, callback):
+        """Removes a callback that was added with :meth:`on`."""
+
+        self._callbacks[name].remove(callback)
+
+    def emit(self, event):
+        for callback in self._callbacks[event.name]:
+            callback(event)
+
+
+class CallTrace:  # pylint: disable=too-many-instance-attributes
+    """Timings of one call of a client method and of the requests it sends.
+
+    :param hooks: Hooks that the events are sent to
+    :type hooks: Hooks
+    :param endpoint: Name of the client method
+    :type endpoint: str
+    """
+
+    def __init__(self, hooks, endpoint):
+        self.hooks = hooks
+        self.endpoint = endpoint
+        self.start = time.perf_counter()
+        self.requests = []
+        self.cache_hits = 0
+        self.status = None
+        self.finished = False
+
+    def emit(self, name, **fields):
+        self.hooks.emit(Event(name, self.endpoint, **fields))
+
+    def cache_hit(self):
+        self.cache_hits += 1
+        self.emit("cache_hit", status=200)
+
+    def finish(self, response=None, error=None):
+        """Sends the done event of the call."""
+
+        self.finished = True
+        total = time.perf_counter() - self.start
+        timings = dict.fromkeys(PHASES, 0.0)
+        connect = None
+
+        for request in self.requests:
+            for phase, seconds in request.timings().items():
+                if phase == "connect" and seconds is not None:
+                    connect = (connect or 0.0) + seconds
+                elif seconds is not None:
+                    timings[phase] += seconds
+
+        # Everything that isn't spent on a request, like cache lookups and
+        # building the response.
+        spent = sum(timings.values()) + (connect or 0.0)
+        timings["connect"] = connect
+        timings["post_processing"] = max(total - spent, 0.0)
+        timings["total"] = total
+
+        if isinstance(response, dict):
+            self.status = response.get("code", self.status)
+        elif error is None and self.status is None:
+            self.status = 200
+
+        self.emit(
+            "done",
+            status=self.status,
+            size=sum(request.size or 0 for request in self.requests),
+            timings=timings,
+            error=error,
+        )
+
+
+class RequestTrace:  # pylint: disable=too-many-instance-attributes
+    """Timings of one request of a call.
+
+    Transports report when the headers and the body are received with
+    :meth:`headers` and :meth:`body`, and the time spent connecting with
+    :meth:`connected`. For transports that don't, both are recorded when the
+    transport returns the response.
+
+    :param call: Trace of the call that sends the request
+    :type call: CallTrace
+    :param request: The request
+    :type request: loading_sdk.protocol.Request
+    """
+
+    def __init__(self, call, request):
+        self.call = call
+        self.request = request
+        self.url_template = protocol.url_template(request.url)
+        self.status = None
+        self.size = None
+        self.connect = None
+        self._marks = {"created": time.perf_counter()}
+        call.requests.append(self)
+
+    def emit(self, name, error=None):
+        self.call.emit(
+            name,
+            url_template=self.url_template,
+            method=self.request.method.upper(),
+            status=self.status,
+            size=self.size,
+            timings=self.timings(),
+            error=error,
+        )
+
+    @contextlib.contextmanager
+    def sending(self):
+        """Makes the request the current request of the transport while it's
+        sent."""
+
+        self._marks["sent"] = time.perf_counter()
+        self.emit("request_start")
+        token = _request.set(self)
+
+        try:
+            yield self
+        except BaseException as error:
+            # Requests that are cancelled also end without their body.
+            self.emit("error", error)
+            raise
+        finally:
+            _request.reset(token)
+
+    def connected(self, seconds):
+        self.connect = (self.connect or 0.0) + seconds
+
+    def headers(self, status):
+        self._marks["headers"] = time.perf_counter()
+        self.status = status
+        self.call.status = status
+        self.emit("response_headers")
+
+    def body(self, size):
+        self._marks["body"] = time.perf_counter()
+        self.size = size
+        self.emit("body_received")
+
+    def received(self, response):
+        """Records the phases the transport didn't report and returns the response
+        wrapped so decoding it is timed.
+
+        :rtype: TracedResponse
+        """
+
+        if "headers" not in self._marks:
+            self.headers(response.status)
+
+        if "body" not in self._marks:
+            self.body(response.size)
+
+        return TracedResponse(response, self)
+
+    def decoded(self):
+        if "decoded" not in self._marks:
+            self._marks["decoded"] = time.perf_counter()
+            self.emit("decode_done")
+
+    def retry(self):
+        """Sends the retry event and returns the trace of the next attempt.
+
+        :rtype: RequestTrace
+        """
+
+        self.emit("retry")
+
+        return RequestTrace(self.call, self.request)
+
+    def timings(self):
+        marks = self._marks
+        timings = {}
+
+        if "sent" in marks:
+            timings["queue_wait"] = marks["sent"] - marks["created"]
+
+        if "headers" in marks:
+            timings["connect"] = self.connect
+            waited = marks["headers"] - marks["sent"]
+            timings["ttfb"] = max(waited - (self.connect or 0.0), 0.0)
+
+        if "body" in marks:
+            timings["download"] = marks["body"] - marks["headers"]
+
+        if "decoded" in marks:
+            timings["decode"] = marks["decoded"] - marks["body"]
+
+        return timings
+
+
+class TracedResponse:
+    """A response that records when its body is decoded."""
+
+    def __init__(self, response, trace):
+        self._response = response
+        self._trace = trace
+
+    @property
+    def status(self):
+        return self._response.status
+
+    @property
+    def size(self):
+        return self._response.size
+
+    @property
+    def cookies(self):
+        return self._response.cookies
+
+    def json(self):
+        data = self._response.json()
+        self._trace.decoded()
+
+        return data
+
+
+def current_request():
+    """Returns the trace of the request that is being sent, or None if it isn't
+    traced.
+
+    :rtype: RequestTrace
+    """
+
+    return _request.get()
+
+
+def connect_timer(trace):
+    """Returns a function that records the time a request spends connecting from
+    the names of the trace events of httpcore, which httpx sends to the ``trace``
+    extension of a request.
+
+    :param trace: Trace of the request
+    :type trace: RequestTrace
+    :rtype: callable
+    """
+
+    started = []
+
+    def record(name):
+        if name.endswith((".connect_tcp.started", ".start_tls.started")):
+            started.append(time.perf_counter())
+        elif name.endswith((".connect_tcp.complete", ".start_tls.complete")):
+            if started:
+                trace.connected(time.perf_counter() - started.pop())
+
+    return record
+
+
+def request_trace(request):
+    """Starts the trace of a request of the current call, if the call is traced.
+
+    :rtype: RequestTrace
+    """
+
+    call = _call.get()
+
+    if call is None or call.finished:
+        return None
+
+    return RequestTrace(call, request)
+
+
+def cache_hit():
+    """Sends a cache_hit event for the current call, if it's traced."""
+
+    call = _call.get()
+
+    if call is not None and not call.finished:
+        call.cache_hit()
+
+
+def _start(client, endpoint, root):
+    hooks = client._hooks
+
+    if hooks is None:
+        return None
+
+    # Methods called by other methods are part of the call of the outer method.
+    call = _call.get()
+
+    if not root and call is not None and not call.finished:
+        return None
+
+    return CallTrace(hooks, endpoint)
+
+
+def traced(endpoint, root=False):
+    """Sends the events of the calls of a client method to the hooks of the client.
+
+    :param endpoint: Name of the method in the events
+    :type endpoint: str
+    :param root: Whether calls from other methods get their own events, for
+        background work (**optional**)
+    :type root: bool
+    """
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            call = _start(self, endpoint, root)
+
+            if call is None:
+                return method(self, *args, **kwargs)
+
+            token = _call.set(call)
+
+            try:
+                response = method(self, *args, **kwargs)
+            except Exception as error:
+                call.finish(error=error)
+                raise
+            finally:
+                _call.reset(token)
+
+            call.finish(response)
+
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def async_traced(endpoint, root=False):
+    """The same as :func:`traced`, for coroutine methods."""
+
+    def decorator(method):
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            call = _start(self, endpoint, root)
+
+            if call is None:
+                return await method(self, *args, **kwargs)
+
+            token = _call.set(call)
+
+            try:
+                response = await method(self, *args, **kwargs)
+            except Exception as error:
+                call.finish(error=error)
+                raise
+            finally:
+                _call.reset(token)
+
+            call.finish(response)
+
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,173 @@
+import contextlib
+import json
+import os
+import socket
+import sqlite3
+import time
+import uuid
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    key TEXT PRIMARY KEY,
+    state TEXT NOT NULL DEFAULT 'pending',
+    owner TEXT,
+    expires_at REAL,
+    attempts INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS items_state ON items (state, expires_at);
+"""
+
+CLAIM = """
+SELECT key FROM items
+WHERE state = 'pending' OR (state = 'leased' AND expires_at <= ?)
+LIMIT ?
+"""
+
+
+class LeaseQueue:
+    """A work queue in a SQLite database file that several processes, on one or
+    several hosts with a shared filesystem, take work items from.
+
+    An item is leased to one owner at a time. The lease expires ``lease_time``
+    seconds after it was claimed or after the last :meth:`heartbeat`, and then the
+    item can be claimed by another owner, so the work of a crashed process isn't
+    lost. Completed items stay in the queue, so putting them again doesn't make them
+    fetched again.
+
+    The database doesn't use WAL mode, since WAL doesn't work on network
+    filesystems.
+
+    :param path: Path to the database file
+    :type path: str
+    :param lease_time: Seconds a lease lasts without a heartbeat (**optional**)
+    :type lease_time: float
+    :param owner: Unique name of this worker, the host name, process id and a random
+        suffix by default (**optional**)
+    :type owner: str
+    """
+
+    def __init__(self, path, lease_time=60, owner=None):
+        self.path = path
+        self.lease_time = lease_time
+        self.owner = (
+            owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        )
+        self._connection = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self._connection.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def put(self, items):
+        """Adds work items to the queue. Items that are already in it are ignored.
+
+        :param items: Json serializable work items, like ``("thread", "1", 2)``
+        :type items: iterable
+        """
+
+        with self._transaction():
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO items (key) VALUES (?)",
+                ((_key(item),) for item in items),
+            )
+
+    def claim(self, count=1):
+        """Leases up to count pending items, or items whose lease has expired.
+
+        :param count: Maximum number of items (**optional**)
+        :type count: int
+        :return: The claimed items, empty if there is no work left to claim
+        :rtype: list
+        """
+
+        now = time.time()
+
+        with self._transaction():
+            keys = [row[0] for row in self._connection.execute(CLAIM, (now, count))]
+            self._connection.executemany(
+                "UPDATE items SET state = 'leased', owner = ?, expires_at = ?, "
+                "attempts = attempts + 1 WHERE key = ?",
+                ((self.owner, now + self.lease_time, key) for key in keys),
+            )
+
+        return [_item(key) for key in keys]
+
+    def heartbeat(self):
+        """Renews the leases of every item claimed by this owner.
+
+        :return: The number of renewed leases
+        :rtype: int
+        """
+
+        with self._transaction():
+            cursor = self._connection.execute(
+                "UPDATE items SET expires_at = ? "
+                "WHERE state = 'leased' AND owner = ?",
+                (time.time() + self.lease_time, self.owner),
+            )
+
+        return cursor.rowcount
+
+    def complete(self, item):
+        """Marks an item as done, so it's never claimed again."""
+
+        with self._transaction():
+            self._connection.execute(
+                "UPDATE items SET state = 'done', owner = NULL, expires_at = NULL "
+                "WHERE key = ?",
+                (_key(item),),
+            )
+
+    def release(self, item):
+        """Gives up the lease of an item, so it can be claimed again right away."""
+
+        with self._transaction():
+            self._connection.execute(
+                "UPDATE items SET state = 'pending', owner = NULL, expires_at = NULL "
+                "WHERE key = ? AND state = 'leased' AND owner = ?",
+                (_key(item), self.owner),
+            )
+
+    def stats(self):
+        """Returns the number of pending, leased and done items.
+
+        :rtype: dict
+        """
+
+        counts = {"pending": 0, "leased": 0, "done": 0}
+        rows = self._connection.execute(
+            "SELECT state, COUNT(*) FROM items GROUP BY state"
+        ).fetchall()
+        counts.update(rows)
+
+        return counts
+
+    def close(self):
+        self._connection.close()
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        # The write lock is taken before reading, so two processes can't claim the
+        # same items.
+        self._connection.execute("BEGIN IMMEDIATE")
+
+        try:
+            yield
+        except BaseException:
+            self._connection.execute("ROLLBACK")
+            raise
+
+        self._connection.execute("COMMIT")
+
+
+def _key(item):
+    return json.dumps(item if isinstance(item, str) else list(item))
+
+
+def _item(key):
+    item = json.loads(key)
+
+    return tuple(item) if isinstance(item, list) else item
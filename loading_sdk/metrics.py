@@ -0,0 +1,350 @@
+import collections
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+# Counters of each method, in the order they are exported.
+COUNTERS = {
+    "calls": "Calls of the method",
+    "requests": "Requests sent by the calls",
+    "response_bytes": "Bytes of the bodies of the responses",
+    "errors": "Calls that failed or returned an error status",
+    "retries": "Requests sent again after logging in",
+    "cache_hits": "Calls answered from a cache",
+}
+
+
+class Histogram:
+    """Counts values in buckets that are wider for larger values, like an HDR
+    histogram, so percentiles have the same relative error for fast and slow calls.
+
+    :param precision: Number of buckets for each power of two, the relative error
+        is about ``1 / precision`` (**optional**)
+    :type precision: int
+    """
+
+    def __init__(self, precision=128):
+        self.precision = precision
+        self.counts = collections.Counter()
+        self.count = 0
+        self.max = 0.0
+
+    def record(self, value):
+        mantissa, exponent = math.frexp(max(value, 1e-9))
+        sub_bucket = int((mantissa - 0.5) * 2 * self.precision)
+        self.counts[exponent * self.precision + sub_bucket] += 1
+        self.count += 1
+        self.max = max(self.max, value)
+
+    def merge(self, other):
+        self.counts.update(other.counts)
+        self.count += other.count
+        self.max = max(self.max, other.max)
+
+    def percentile(self, quantile):
+        """Returns the value that a share of the values are at or below.
+
+        :param quantile: Share of the values, between 0 and 1
+        :type quantile: float
+        :return: The upper bound of the bucket of the value, or None if there are no
+            values
+        :rtype: float
+        """
+
+        if not self.count:
+            return None
+
+        rank = max(math.ceil(quantile * self.count), 1)
+        seen = 0
+
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+
+            if seen >= rank:
+                exponent, sub_bucket = divmod(index, self.precision)
+                upper = 0.5 + (sub_bucket + 1) / (2 * self.precision)
+
+                return min(math.ldexp(upper, exponent), self.max)
+
+        return self.max
+
+
+class RollingHistogram:
+    """A histogram of the values of the last ``window`` seconds.
+
+    The window is split in slices, and the oldest slice is dropped as a new one
+    starts, so old values leave the window a slice at a time.
+
+    :param window: Seconds of values that are kept (**optional**)
+    :type window: float
+    :param slices: Number of slices of the window (**optional**)
+    :type slices: int
+    :param precision: Precision of the histograms (**optional**)
+    :type precision: int
+    """
+
+    def __init__(self, window=60, slices=6, precision=128):
+        self.window = window
+        self.interval = window / slices
+        self.precision = precision
+        self._slices = collections.deque(maxlen=slices)
+
+    def record(self, value, now=None):
+        now = time.monotonic() if now is None else now
+        start = now - now % self.interval
+
+        if not self._slices or self._slices[-1][0] != start:
+            self._slices.append((start, Histogram(self.precision)))
+
+        self._slices[-1][1].record(value)
+
+    def snapshot(self, now=None):
+        """Returns the values of the window merged in one histogram.
+
+        :rtype: Histogram
+        """
+
+        now = time.monotonic() if now is None else now
+        histogram = Histogram(self.precision)
+
+        for start, values in self._slices:
+            if start > now - self.window:
+                histogram.merge(values)
+
+        return histogram
+
+
+class Metrics:
+    """Rolling metrics of the calls of clients, per client method.
+
+    The metrics are collected from the events of the hooks of the clients: the
+    latency of the calls over the last ``window`` seconds, the number of calls,
+    requests, response bytes, errors, retries and cache hits since the metrics were
+    created, and the number of requests in flight. A call is an error if it raised
+    or returned a status of 400 or more.
+
+    .. code-block:: python
+
+        hooks = Hooks()
+        metrics = Metrics(hooks)
+        client = LoadingApiClient(hooks=hooks)
+
+    :param hooks: Hooks of the clients to collect metrics from (**optional**)
+    :type hooks: loading_sdk.events.Hooks
+    :param window: Seconds of calls that the latency percentiles are computed from
+        (**optional**)
+    :type window: float
+    :param slices: Number of slices of the window (**optional**)
+    :type slices: int
+    """
+
+    def __init__(self, hooks=None, *, window=60, slices=6):
+        self.window = window
+        self.slices = slices
+        self._lock = threading.Lock()
+        self._counters = collections.defaultdict(collections.Counter)
+        self._durations = {}
+        self._duration_sums = collections.Counter()
+
+        if hooks is not None:
+            self.attach(hooks)
+
+    def attach(self, hooks):
+        """Collects metrics from the events of more hooks.
+
+        :param hooks: Hooks of clients
+        :type hooks: loading_sdk.events.Hooks
+        """
+
+        hooks.on("request_start", self._on_request_start)
+        hooks.on("body_received", self._on_body_received)
+        hooks.on("error", self._on_error)
+        hooks.on("retry", self._on_retry)
+        hooks.on("cache_hit", self._on_cache_hit)
+        hooks.on("done", self._on_done)
+
+    def snapshot(self):
+        """Returns the metrics of each method.
+
+        ``p50``, ``p90`` and ``p99`` are the latency percentiles in seconds, or None
+        if the method wasn't called during the window, and ``cache_hit_ratio`` is
+        the share of the calls that were answered from a cache.
+
+        :rtype: dict
+        """
+
+        now = time.monotonic()
+
+        with self._lock:
+            methods = {}
+
+            for method, counters in self._counters.items():
+                metrics = {name: counters[name] for name in COUNTERS}
+                metrics["in_flight"] = counters["in_flight"]
+                metrics["cache_hit_ratio"] = (
+                    counters["cache_hits"] / counters["calls"]
+                    if counters["calls"]
+                    else 0.0
+                )
+                metrics["duration_sum"] = self._duration_sums[method]
+                durations = self._durations.get(method)
+                histogram = durations.snapshot(now) if durations else Histogram()
+
+                for quantile in QUANTILES:
+                    name = f"p{round(quantile * 100)}"
+                    metrics[name] = histogram.percentile(quantile)
+
+                methods[method] = metrics
+
+        return methods
+
+    def prometheus_text(self):
+        """Returns the metrics in the Prometheus text format.
+
+        :rtype: str
+        """
+
+        return prometheus_text(self.snapshot())
+
+    def serve(self, port=9464, host="127.0.0.1"):
+        """Serves the metrics in the Prometheus text format at ``/metrics`` from a
+        background thread.
+
+        :param port: Port to listen on, 0 picks a free port (**optional**)
+        :type port: int
+        :param host: Address to listen on (**optional**)
+        :type host: str
+        :return: The server, call ``shutdown()`` on it to stop it
+        :rtype: http.server.ThreadingHTTPServer
+        """
+
+        server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        server.daemon_threads = True
+        server.metrics = self
+        thread = threading.Thread(
+            target=server.serve_forever, name="loading-sdk-metrics", daemon=True
+        )
+        thread.start()
+
+        return server
+
+    def _count(self, event, name, value=1):
+        with self._lock:
+            self._counters[event.endpoint][name] += value
+
+    def _on_request_start(self, event):
+        with self._lock:
+            counters = self._counters[event.endpoint]
+            counters["requests"] += 1
+            counters["in_flight"] += 1
+
+    def _on_body_received(self, event):
+        with self._lock:
+            counters = self._counters[event.endpoint]
+            counters["response_bytes"] += event.size or 0
+            counters["in_flight"] -= 1
+
+    def _on_error(self, event):
+        # Requests that failed before their body was received.
+        if "download" not in event.timings:
+            self._count(event, "in_flight", -1)
+
+    def _on_retry(self, event):
+        self._count(event, "retries")
+
+    def _on_cache_hit(self, event):
+        self._count(event, "cache_hits")
+
+    def _on_done(self, event):
+        duration = event.timings["total"]
+
+        with self._lock:
+            counters = self._counters[event.endpoint]
+            counters["calls"] += 1
+
+            if event.error is not None or (event.status or 0) >= 400:
+                counters["errors"] += 1
+
+            if event.endpoint not in self._durations:
+                self._durations[event.endpoint] = RollingHistogram(
+                    self.window, self.slices
+                )
+
+            self._durations[event.endpoint].record(duration)
+            self._duration_sums[event.endpoint] += duration
+
+
+def prometheus_text(methods):
+    """Formats the metrics returned by :meth:`Metrics.snapshot` in the Prometheus
+    text format.
+
+    :param methods: Metrics of each method
+    :type methods: dict
+    :rtype: str
+    """
+
+    lines = [
+        "# HELP loading_sdk_call_duration_seconds Duration of the calls of the method",
+        "# TYPE loading_sdk_call_duration_seconds summary",
+    ]
+
+    for method, metrics in sorted(methods.items()):
+        for quantile in QUANTILES:
+            value = metrics[f"p{round(quantile * 100)}"]
+            lines.append(
+                f'loading_sdk_call_duration_seconds{{method="{method}",'
+                f'quantile="{quantile}"}} {_number(value)}'
+            )
+
+        labels = f'{{method="{method}"}}'
+        lines.append(
+            f"loading_sdk_call_duration_seconds_sum{labels} "
+            f"{_number(metrics['duration_sum'])}"
+        )
+        lines.append(
+            f"loading_sdk_call_duration_seconds_count{labels} {metrics['calls']}"
+        )
+
+    gauges = {
+        "in_flight": "Requests of the method in flight",
+        "cache_hit_ratio": "Share of the calls answered from a cache",
+    }
+
+    for name, description in [*COUNTERS.items(), *gauges.items()]:
+        metric = (
+            f"loading_sdk_{name}_total" if name in COUNTERS else f"loading_sdk_{name}"
+        )
+        lines.append(f"# HELP {metric} {description}")
+        lines.append(f"# TYPE {metric} {'counter' if name in COUNTERS else 'gauge'}")
+
+        for method, metrics in sorted(methods.items()):
+            lines.append(f'{metric}{{method="{method}"}} {_number(metrics[name])}')
+
+    return "\n".join(lines) + "\n"
+
+
+def _number(value):
+    if value is None:
+        return "NaN"
+
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):  # pylint: disable=invalid-name
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+
+        body = self.server.metrics.prometheus_text().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
@@ -0,0 +1,312 @@
+import re
+
+MAIN_SCRIPT_PATTERN = re.compile(r"/static/js/main\.[0-9a-zA-Z]+\.js")
+# Matches the src attribute of the first tag that loads the main bundle, without
+# parsing the rest of the page.
+MAIN_SCRIPT_TAG_PATTERN = re.compile(
+    r"<[a-z]+\b[^>]*?\bsrc\s*=\s*[\"']?/(static/js/main\.[0-9a-zA-Z]+\.js)",
+    re.IGNORECASE,
+)
+
+
+def find_main_script(source):
+    """Returns the path of the main javascript bundle that a html page loads.
+
+    The page is scanned for the first tag with a matching ``src`` attribute. Pages
+    that the scanner can't handle falls back to BeautifulSoup if it's installed.
+
+    :param source: Html page source
+    :type source: str
+    :rtype: str
+    """
+
+    match = MAIN_SCRIPT_TAG_PATTERN.search(source)
+
+    if match:
+        return match.group(1)
+
+    return _find_main_script_with_soup(source)
+
+
+def _find_main_script_with_soup(source):
+    try:
+        from bs4 import (  # pylint: disable=import-outside-toplevel
+            BeautifulSoup,
+        )
+    except ImportError:
+        return None
+
+    soup = BeautifulSoup(source, "html.parser")
+    main_script = soup.find(src=MAIN_SCRIPT_PATTERN)
+
+    if main_script is None:
+        return None
+
+    return main_script["src"][1:]
+
+
+WHITESPACE_PATTERN = re.compile(r"\s*")
+IDENTIFIER_PATTERN = re.compile(r"[A-Za-z_$][\w$]*")
+NUMBER_PATTERN = re.compile(
+    r"-?(?:0[xX][0-9a-fA-F]+|(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)"
+)
+STRING_PATTERNS = {
+    '"': re.compile(r'"((?:[^"\\\n]|\\.)*)"', re.DOTALL),
+    "'": re.compile(r"'((?:[^'\\\n]|\\.)*)'", re.DOTALL),
+    "`": re.compile(r"`((?:[^`\\]|\\.)*)`", re.DOTALL),
+}
+ESCAPE_PATTERN = re.compile(
+    r"\\(u\{[0-9a-fA-F]+\}|u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|\r\n|.)", re.DOTALL
+)
+ESCAPES = {"b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t", "v": "\v"}
+KEYWORDS = {"true": True, "false": False, "null": None, "undefined": None}
+# Skips everything in an expression that can't open or close a nested part of it.
+EXPRESSION_PATTERN = re.compile(r"[^\"'`()\[\]{},;]+")
+OPENING_BRACKETS = "([{"
+CLOSING_BRACKETS = ")]}"
+
+
+def parse_js_literal(source, position=0):
+    """Parses a javascript literal, like the ones in minified bundles, into python.
+
+    Arrays, objects with unquoted or quoted keys, strings in any quotes with
+    escapes, numbers, ``true``, ``false``, ``null``, ``undefined`` and the minified
+    ``!0`` and ``!1`` are supported. Values that aren't literals, like function
+    calls, are skipped and parsed as None. The source is read once from position,
+    so parsing takes linear time.
+
+    :param source: Javascript source
+    :type source: str
+    :param position: Index of the first character of the literal (**optional**)
+    :type position: int
+    :return: The parsed value and the index after the literal
+    :rtype: tuple
+    :raises ValueError: If there isn't a complete literal at position, or if it's
+        nested too deeply to parse
+    """
+
+    try:
+        return _JavascriptParser(source).value(position)
+    except RecursionError:
+        raise ValueError(
+            f"Literal at position {position} is nested too deeply"
+        ) from None
+
+
+def iter_js_literals(source, pattern):
+    """Yields every literal that starts at the last character of a pattern match.
+
+    Matches where the literal can't be parsed are skipped, and the search goes on
+    right after the match, so literals inside a malformed one are still found. This
+    means that malformed input can be scanned more than once.
+
+    :param source: Javascript source
+    :type source: str
+    :param pattern: Compiled pattern that ends with the opening bracket of a literal
+    :type pattern: re.Pattern
+    :return: Tuples of the match, the parsed value and the index after the literal
+    :rtype: iterator
+    """
+
+    parser = _JavascriptParser(source)
+    match = pattern.search(source)
+
+    while match:
+        try:
+            value, end = parser.value(match.end() - 1)
+        except (ValueError, RecursionError):
+            match = pattern.search(source, match.end())
+            continue
+
+        yield match, value, end
+
+        # Literals doesn't overlap, so the search goes on after the literal.
+        match = pattern.search(source, end)
+
+
+class _JavascriptParser:
+    def __init__(self, source):
+        self.source = source
+
+    def value(self, position):
+        position = self._skip_whitespace(position)
+        char = self._char(position)
+
+        if char == "[":
+            return self._array(position + 1)
+
+        if char == "{":
+            return self._object(position + 1)
+
+        if char in STRING_PATTERNS:
+            return self._string(position)
+
+        return self._scalar(position)
+
+    def _scalar(self, position):
+        if self.source.startswith(("!0", "!1"), position):
+            return self.source[position + 1] == "0", position + 2
+
+        match = NUMBER_PATTERN.match(self.source, position)
+
+        if match:
+            return _number(match.group()), match.end()
+
+        match = IDENTIFIER_PATTERN.match(self.source, position)
+
+        if match and match.group() in KEYWORDS:
+            end = self._skip_whitespace(match.end())
+
+            if self._char(end) in (",", "]", "}", ")", ";", ""):
+                return KEYWORDS[match.group()], match.end()
+
+        return None, self._skip_expression(position)
+
+    def _array(self, position):
+        values = []
+        position = self._skip_whitespace(position)
+
+        while not self.source.startswith("]", position):
+            # Holes in arrays, like [1,,2].
+            if self.source.startswith(",", position):
+                values.append(None)
+                position = self._skip_whitespace(position + 1)
+                continue
+
+            value, position = self.value(position)
+            values.append(value)
+            position = self._separator(position, "]")
+
+        return values, position + 1
+
+    def _object(self, position):
+        values = {}
+        position = self._skip_whitespace(position)
+
+        while not self.source.startswith("}", position):
+            key, position = self._key(position)
+            position = self._skip_whitespace(position)
+
+            if not self.source.startswith(":", position):
+                raise ValueError(f"Expected ':' at position {position}")
+
+            values[key], position = self.value(position + 1)
+            position = self._separator(position, "}")
+
+        return values, position + 1
+
+    def _key(self, position):
+        char = self._char(position)
+
+        if char in ('"', "'"):
+            return self._string(position)
+
+        match = IDENTIFIER_PATTERN.match(self.source, position) or NUMBER_PATTERN.match(
+            self.source, position
+        )
+
+        if not match:
+            raise ValueError(f"Expected object key at position {position}")
+
+        return match.group(), match.end()
+
+    def _string(self, position):
+        match = STRING_PATTERNS[self.source[position]].match(self.source, position)
+
+        if not match:
+            raise ValueError(f"Unterminated string at position {position}")
+
+        # Template literals with expressions aren't literals.
+        if self.source[position] == "`" and "${" in match.group(1):
+            return None, match.end()
+
+        return _unescape(match.group(1)), match.end()
+
+    def _separator(self, position, closing):
+        position = self._skip_whitespace(position)
+        char = self._char(position)
+
+        if char == ",":
+            return self._skip_whitespace(position + 1)
+
+        if char == closing:
+            return position
+
+        raise ValueError(f"Expected ',' or '{closing}' at position {position}")
+
+    def _char(self, position):
+        # An empty string at the end of the source.
+        end = position + 1
+
+        return self.source[position:end]
+
+    def _skip_whitespace(self, position):
+        return WHITESPACE_PATTERN.match(self.source, position).end()
+
+    def _skip_expression(self, position):
+        depth = 0
+        start = position
+
+        while position < len(self.source):
+            match = EXPRESSION_PATTERN.match(self.source, position)
+
+            if match:
+                position = match.end()
+                continue
+
+            char = self.source[position]
+
+            if char in STRING_PATTERNS:
+                _, position = self._string(position)
+                continue
+
+            if depth == 0 and char in ",;" + CLOSING_BRACKETS:
+                break
+
+            if char in OPENING_BRACKETS:
+                depth += 1
+            elif char in CLOSING_BRACKETS:
+                depth -= 1
+
+            position += 1
+
+        if position == start:
+            raise ValueError(f"Expected a value at position {position}")
+
+        return position
+
+
+def _number(number):
+    if "x" in number or "X" in number:
+        return int(number, 16)
+
+    if "." in number or "e" in number or "E" in number:
+        return float(number)
+
+    return int(number)
+
+
+def _unescape(string):
+    if "\\" not in string:
+        return string
+
+    string = ESCAPE_PATTERN.sub(_replace_escape, string)
+
+    # Characters outside the basic plane are escaped as surrogate pairs.
+    return string.encode("utf-16", "surrogatepass").decode("utf-16")
+
+
+def _replace_escape(match):
+    escape = match.group(1)
+
+    if escape[0] == "u" and len(escape) > 1:
+        return chr(int(escape.strip("u{}"), 16))
+
+    if escape[0] == "x" and len(escape) == 3:
+        return chr(int(escape[1:], 16))
+
+    # Line continuations.
+    if escape in ("\n", "\r\n"):
+        return ""
+
+    return ESCAPES.get(escape, escape)
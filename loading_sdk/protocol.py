@@ -0,0 +1,299 @@
+import functools
+import json
+import math
+from collections import namedtuple
+
+from loading_sdk.settings import (
+    API_URL,
+    API_VERSION,
+    EDITORIAL_POST_TYPES,
+    EDITORIAL_SORT,
+    POSTS_PER_PAGE,
+    USER_AGENT,
+)
+
+# The requests the clients send are prepared here and the responses they get back
+# are interpreted here, without doing any I/O, so the clients only differ in how
+# they send a Request. Headers are built once per distinct set of arguments and
+# shared between calls, so they must not be modified.
+POSTS_URL = f"{API_URL}/{API_VERSION}/posts/"
+LOGIN_URL = f"{API_URL}/{API_VERSION}/auth/login"
+PROFILE_URL = f"{API_URL}/{API_VERSION}/users/profile"
+SEARCH_URL = f"{API_URL}/{API_VERSION}/search/"
+
+HEADERS = {"User-Agent": USER_AGENT}
+FORM_HEADERS = {
+    "User-Agent": USER_AGENT,
+    "content-type": "application/x-www-form-urlencoded",
+}
+SEARCH_HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Content-Type": "application/x-www-form-urlencoded;charset=UTF-8",
+}
+
+# method is the lower case http method, key is the response cache key of requests
+# that can be cached and authenticated tells whether the cookies should be sent.
+Request = namedtuple(
+    "Request",
+    ["method", "url", "headers", "data", "key", "authenticated"],
+    defaults=(None, None, False),
+)
+
+
+class Response(namedtuple("Response", ["status", "body", "cookies"])):
+    """A response with the body read into memory."""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_data(cls, status, data, cookies=None):
+        return cls(status, json.dumps(data).encode(), cookies)
+
+    @property
+    def size(self):
+        return len(self.body)
+
+    def json(self):
+        return json.loads(self.body)
+
+
+def url_template(url):
+    """Returns the url with the post or thread id replaced by a placeholder, so the
+    requests of an endpoint have the same url."""
+
+    if url.startswith(POSTS_URL) and len(url) > len(POSTS_URL):
+        return f"{POSTS_URL}{{id}}"
+
+    return url
+
+
+def cookie_headers(headers, cookies):
+    """Returns headers with a Cookie header for cookies added."""
+
+    if not cookies:
+        return headers
+
+    # The values of a SimpleCookie are morsels.
+    values = (f"{k}={getattr(v, 'value', v)}" for k, v in cookies.items())
+
+    return {**headers, "Cookie": "; ".join(values)}
+
+
+def login(email, password):
+    return Request(
+        "post", LOGIN_URL, FORM_HEADERS, {"email": email, "password": password}
+    )
+
+
+def profile():
+    return Request("get", PROFILE_URL, HEADERS, authenticated=True)
+
+
+def search(query):
+    return Request("post", SEARCH_URL, SEARCH_HEADERS, {"query": query})
+
+
+def post(post_id):
+    return Request("get", f"{POSTS_URL}{post_id}", HEADERS, key=("post", post_id))
+
+
+def thread_page(thread_id, page=None):
+    page = _page_number(page)
+
+    return Request(
+        "get",
+        f"{POSTS_URL}{thread_id}",
+        _page_headers(page),
+        key=("thread", thread_id, page),
+    )
+
+
+def category_page(category_name, page=None):
+    page = _page_number(page)
+
+    return Request(
+        "get",
+        POSTS_URL,
+        _category_headers(category_name, page),
+        key=("category", category_name, page),
+    )
+
+
+def editorials_page(page=None, post_type=None, sort=None):
+    page = _page_number(page)
+    post_type = post_type if post_type in EDITORIAL_POST_TYPES else "neRegular"
+    sort = sort if sort in EDITORIAL_SORT else None
+
+    return Request(
+        "get",
+        POSTS_URL,
+        _editorials_headers(post_type, sort, page),
+        key=("editorials", post_type, sort, page),
+    )
+
+
+def listing_page(category_name, page):
+    """Returns the request of a page in a forum category, including texts."""
+
+    if category_name == "texts":
+        return editorials_page(page)
+
+    return category_page(category_name, page)
+
+
+def create_post(thread_id, message):
+    return Request(
+        "post", f"{POSTS_URL}{thread_id}", FORM_HEADERS, {"body": message}, None, True
+    )
+
+
+def edit_post(post_id, message):
+    return Request(
+        "patch", f"{POSTS_URL}{post_id}", FORM_HEADERS, {"body": message}, None, True
+    )
+
+
+def create_thread(title, message, category_name, post_type):
+    data = {
+        "category": category_name,
+        "postType": post_type,
+        "title": title,
+        "body": message,
+    }
+
+    return Request("post", POSTS_URL, FORM_HEADERS, data, None, True)
+
+
+def login_response(status, data, cookies):
+    if status == 200:
+        return {"code": 200, "cookies": cookies}
+
+    return data
+
+
+def login_rejected(response):
+    """Whether a failed login was refused by the api, so logging in again with the
+    same credentials won't help. Client errors are refused logins, except for too
+    many requests, and server errors can be retried.
+
+    :param response: Response returned by :func:`login_response`
+    :type response: dict
+    :rtype: bool
+    """
+
+    code = response.get("code")
+
+    return isinstance(code, int) and 400 <= code < 500 and code != 429
+
+
+def data_response(status, data, expected_status=200, message="OK"):
+    """Wraps data in a response if the status is the expected one, otherwise the
+    error from the api is returned as it is."""
+
+    if status == expected_status:
+        return {"code": status, "message": message, "data": data}
+
+    return data
+
+
+def search_response(data):
+    return {
+        "code": 200,
+        "message": "OK" if len(data["posts"]) else "No results",
+        "data": data,
+    }
+
+
+def page_too_low(page, code=404):
+    """Returns an error response if page is below the first page, otherwise None."""
+
+    # Doing this checks to make sure it only return data from a page that exists.
+    if page and page < 1:
+        return {"code": code, "message": "Page number too low", "data": _no_posts()}
+
+    return None
+
+
+def listing_response(data):
+    # Page out of range.
+    if not data["posts"]:
+        return {"code": 404, "message": "Page number too high", "data": data}
+
+    return {"code": 200, "message": "OK", "data": data}
+
+
+def thread_response(status, data, page=None):
+    if status != 200:
+        return data
+
+    if "title" not in data["posts"][-1]:
+        return {
+            "code": status,
+            "message": "Exists, but was not a thread id",
+        }
+
+    if page:
+        error = page_too_low(page, status)
+
+        if error:
+            return error
+
+        if page > thread_pages(data):
+            return {
+                "code": status,
+                "message": "Page number too high",
+                "data": _no_posts(),
+            }
+
+    return {"code": status, "message": "OK", "data": data}
+
+
+def thread_pages(data):
+    """Returns the number of pages of the thread that data is a page of."""
+
+    return reply_pages(data["posts"][-1]["replies"])
+
+
+def reply_pages(replies):
+    """Returns the number of pages of a thread with a number of replies."""
+
+    # There is always atleast one page.
+    return max(math.ceil(replies / POSTS_PER_PAGE), 1)
+
+
+def _no_posts():
+    return {"posts": [], "users": []}
+
+
+def _page_number(page):
+    return page if page and page > 1 else 1
+
+
+@functools.lru_cache(maxsize=256)
+def _page_headers(page):
+    headers = dict(HEADERS)
+
+    # Chooses a specific page instead of the first page which is the default page.
+    if page > 1:
+        headers["page"] = str(page)
+
+    return headers
+
+
+@functools.lru_cache(maxsize=256)
+def _category_headers(category_name, page):
+    headers = dict(_page_headers(page))
+    headers[category_name] = category_name
+
+    return headers
+
+
+@functools.lru_cache(maxsize=256)
+def _editorials_headers(post_type, sort, page):
+    headers = dict(_category_headers("texts", page))
+    headers["post-type"] = post_type
+
+    if sort:
+        headers["sort"] = sort
+
+    return headers
@@ -0,0 +1,207 @@
+import bisect
+import math
+from datetime import timezone
+
+from loading_sdk.settings import POSTS_PER_PAGE
+
+
+class PostIndex:
+    """An indexed snapshot of posts and users that can be queried without the api.
+
+    The posts are kept sorted by ``createdAt``, with lookup tables from
+    ``userId``, ``category``, ``postType`` and ``parentId`` to positions in that
+    order. A query intersects the smallest matching lookup tables and narrows them
+    to a date range with a binary search, so it never scans every post.
+
+    Replies doesn't have a category of their own, so they are indexed under the
+    category of their thread when the thread is part of the snapshot.
+
+    :param posts: Posts as returned by the api
+    :type posts: iterable
+    :param users: Users as returned by the api (**optional**)
+    :type users: iterable
+    """
+
+    def __init__(self, posts, users=()):
+        unique_posts = {post["id"]: post for post in posts}
+        self._posts = sorted(
+            unique_posts.values(), key=lambda post: post.get("createdAt", "")
+        )
+        self._dates = [post.get("createdAt", "") for post in self._posts]
+        self._users = {user["id"]: user for user in users}
+        self._indexes = {
+            "userId": {},
+            "category": {},
+            "postType": {},
+            "parentId": {},
+        }
+        categories = {
+            post["id"]: post["category"]
+            for post in self._posts
+            if post.get("category") is not None
+        }
+
+        for position, post in enumerate(self._posts):
+            values = {
+                "userId": post.get("userId"),
+                "category": post.get("category", categories.get(post.get("parentId"))),
+                "postType": post.get("postType"),
+                "parentId": post.get("parentId"),
+            }
+
+            for field, value in values.items():
+                if value is not None:
+                    self._indexes[field].setdefault(value, []).append(position)
+
+    def __len__(self):
+        return len(self._posts)
+
+    @classmethod
+    def from_store(cls, store):
+        """Builds a snapshot of everything in a store.
+
+        :param store: Store to read posts and users from
+        :type store: loading_sdk.store.SQLiteStore
+        :rtype: PostIndex
+        """
+
+        return cls(store.iter_posts(), store.iter_users())
+
+    def query(  # pylint: disable=too-many-arguments
+        self,
+        *,
+        user_id=None,
+        category=None,
+        post_type=None,
+        thread_id=None,
+        since=None,
+        until=None,
+        sort=None,
+        page=None,
+        per_page=POSTS_PER_PAGE,
+    ):
+        """Returns the posts that matches all the given filters
+
+        The response has the same shape as the category listings of the clients.
+
+        :param user_id: Only posts written by this user (**optional**)
+        :type user_id: str
+        :param category: Only posts in "games", "other" or "texts" (**optional**)
+        :type category: str
+        :param post_type: Only posts of this post type (**optional**)
+        :type post_type: str
+        :param thread_id: Only replies to this thread (**optional**)
+        :type thread_id: str
+        :param since: Only posts created at or after this time (**optional**)
+        :type since: datetime or str
+        :param until: Only posts created before this time (**optional**)
+        :type until: datetime or str
+        :param sort: Posts are sorted by date with the newest first by default, but
+            "title" sorts them by title and "replies" by most replies (**optional**)
+        :type sort: str
+        :param page: Result page (**optional**)
+        :type page: int
+        :param per_page: Posts per page (**optional**)
+        :type per_page: int
+        :rtype: dict
+        """
+
+        # Doing this checks to make sure it only return data from a page that exists.
+        if page and page < 1:
+            return {
+                "code": 404,
+                "message": "Page number too low",
+                "data": {"posts": [], "users": []},
+            }
+
+        filters = {
+            "userId": user_id,
+            "category": category,
+            "postType": post_type,
+            "parentId": thread_id,
+        }
+        positions = self._sort(self._match(filters, since, until), sort)
+
+        if not positions:
+            return {
+                "code": 200,
+                "message": "No results",
+                "data": {"posts": [], "users": []},
+            }
+
+        page = page or 1
+
+        if page > math.ceil(len(positions) / per_page):
+            return {
+                "code": 404,
+                "message": "Page number too high",
+                "data": {"posts": [], "users": []},
+            }
+
+        first = (page - 1) * per_page
+        last = first + per_page
+        posts = [self._posts[position] for position in positions[first:last]]
+
+        return {
+            "code": 200,
+            "message": "OK",
+            "data": {"posts": posts, "users": self._users_of(posts)},
+        }
+
+    def _match(self, filters, since, until):
+        start = bisect.bisect_left(self._dates, _timestamp(since)) if since else 0
+        end = (
+            bisect.bisect_left(self._dates, _timestamp(until))
+            if until
+            else len(self._dates)
+        )
+        candidates = [
+            self._indexes[field].get(value, [])
+            for field, value in filters.items()
+            if value is not None
+        ]
+
+        if not candidates:
+            return range(start, end)
+
+        candidates.sort(key=len)
+        matches = set(candidates[0]).intersection(*candidates[1:])
+
+        # Positions are in date order, so sorting them sorts the posts by date.
+        return sorted(position for position in matches if start <= position < end)
+
+    def _users_of(self, posts):
+        user_ids = dict.fromkeys(post.get("userId") for post in posts)
+
+        return [self._users[i] for i in user_ids if i in self._users]
+
+    def _sort(self, positions, sort):
+        # Replies doesn't have a title and are sorted after the threads.
+        if sort == "title":
+            return sorted(
+                positions,
+                key=lambda i: (
+                    "title" not in self._posts[i],
+                    self._posts[i].get("title"),
+                ),
+            )
+
+        if sort == "replies":
+            return sorted(
+                positions, key=lambda i: self._posts[i].get("replies", 0), reverse=True
+            )
+
+        # Newest first.
+        return positions[::-1]
+
+
+def _timestamp(value):
+    """Formats a datetime the same way as the api, so it compares with createdAt."""
+
+    if isinstance(value, str):
+        return value
+
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+
+    return value.strftime("%Y-%m-%dT%H:%M:%S.") + f"{value.microsecond // 1000:03d}Z"
@@ -0,0 +1,49 @@
+def normalize_query(query):
+    """Returns query in lower case with runs of whitespace collapsed.
+
+    Queries that only differs in case or whitespace finds the same posts, so they
+    are sent and cached in one form.
+
+    :param query: Search query
+    :type query: str
+    :rtype: str
+    """
+
+    return " ".join(query.lower().split())
+
+
+def merge_results(queries, responses):
+    """Merges the responses of several search queries into one response.
+
+    Posts and users that are found by more than one query are only included once.
+    The response of each query is kept in ``data["results"]``.
+
+    :param queries: The original search queries
+    :type queries: list
+    :param responses: Responses of the normalized queries
+    :type responses: dict
+    :rtype: dict
+    """
+
+    posts = {}
+    users = {}
+
+    for response in responses.values():
+        if response.get("code") != 200:
+            continue
+
+        for post in response["data"]["posts"]:
+            posts.setdefault(post["id"], post)
+
+        for user in response["data"]["users"]:
+            users.setdefault(user["id"], user)
+
+    return {
+        "code": 200,
+        "message": "OK" if posts else "No results",
+        "data": {
+            "posts": list(posts.values()),
+            "users": list(users.values()),
+            "results": {query: responses[normalize_query(query)] for query in queries},
+        },
+    }
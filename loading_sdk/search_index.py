@@ -0,0 +1,219 @@
+import heapq
+import math
+import re
+import unicodedata
+from array import array
+
+from loading_sdk.settings import POSTS_PER_PAGE
+
+WORD_PATTERN = re.compile(r"\w+")
+SWEDISH_STOPWORDS = frozenset("""
+    alla allt att av blev bli blir blivit de dem den denna deras dess dessa det
+    detta dig din dina ditt du där då efter ej eller en er era ert ett från för
+    ha hade han hans har henne hennes hon honom hur här i icke ingen inom inte
+    jag ju kan kunde man med mellan men mig min mina mitt mot mycket ni nu när
+    någon något några och om oss på samma sedan sig sin sina sitta själv skulle
+    som så sådan sådana sådant till under upp ut utan vad var vara varför varit
+    varje vars vart vem vi vid vilka vilkas vilken vilket vår våra vårt än är åt
+    över
+    """.split())
+# Longest suffixes first, so "arna" is stripped instead of just "a".
+SWEDISH_SUFFIXES = sorted(
+    """
+    heterna hetens arnas ernas ornas heten heter andes andet arens arna erna orna
+    ande ades aste ens ets het ast ade are ad ar at er or en et es as na a e
+    """.split(),
+    key=len,
+    reverse=True,
+)
+
+
+def tokenize(text):
+    """Splits Swedish text into normalized search terms.
+
+    Words are case folded, stopwords are dropped and common inflection suffixes
+    are stripped, so "spelen", "spelet" and "spel" gives the same term.
+
+    :param text: Text to tokenize
+    :type text: str
+    :rtype: list
+    """
+
+    words = WORD_PATTERN.findall(unicodedata.normalize("NFC", text).casefold())
+
+    return [_stem(word) for word in words if word not in SWEDISH_STOPWORDS]
+
+
+def _stem(word):
+    # Short words are left alone, "spel" shouldn't become "sp".
+    for suffix in SWEDISH_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[: -len(suffix)]
+
+    return word
+
+
+class SearchIndex:  # pylint: disable=too-many-instance-attributes
+    """An in-memory full-text index of posts ranked with BM25.
+
+    Posts are added incrementally as they are fetched. Each term maps to a posting
+    list of document number gaps and term frequencies, varint encoded into a
+    bytearray. Posts that are added again replace their old version, and the index
+    is compacted when too many replaced versions has piled up.
+
+    :param k1: BM25 term frequency saturation (**optional**)
+    :type k1: float
+    :param b: BM25 document length normalization (**optional**)
+    :type b: float
+    """
+
+    def __init__(self, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self._reset()
+
+    def __len__(self):
+        return len(self._doc_numbers)
+
+    def _reset(self):
+        self._docs = []
+        self._doc_numbers = {}
+        self._lengths = array("I")
+        self._total_length = 0
+        self._postings = {}
+        self._last_doc = {}
+        self._users = {}
+
+    def add(self, posts, users=()):
+        """Adds posts to the index, replacing earlier versions of the same posts.
+
+        :param posts: Posts as returned by the api
+        :type posts: iterable
+        :param users: Users as returned by the api (**optional**)
+        :type users: iterable
+        """
+
+        for user in users:
+            self._users[user["id"]] = user
+
+        for post in posts:
+            self._remove(post["id"])
+            terms = tokenize(f"{post.get('title', '')} {post.get('body', '')}")
+            doc = len(self._docs)
+            frequencies = {}
+
+            for term in terms:
+                frequencies[term] = frequencies.get(term, 0) + 1
+
+            for term, frequency in frequencies.items():
+                postings = self._postings.setdefault(term, bytearray())
+                _encode(postings, doc - self._last_doc.get(term, 0))
+                _encode(postings, frequency)
+                self._last_doc[term] = doc
+
+            self._docs.append(post)
+            self._doc_numbers[post["id"]] = doc
+            self._lengths.append(len(terms))
+            self._total_length += len(terms)
+
+        if len(self._docs) > 2 * len(self._doc_numbers) + 1000:
+            self.compact()
+
+    def remove(self, post_id):
+        """Removes a post from the index."""
+
+        self._remove(post_id)
+
+    def compact(self):
+        """Rebuilds the posting lists without removed posts."""
+
+        posts = [post for post in self._docs if post is not None]
+        users = self._users
+        self._reset()
+        self.add(posts, users.values())
+
+    def search(self, query, limit=POSTS_PER_PAGE):
+        """Returns the posts that best matches the query
+
+        :param query: Search query
+        :type query: str
+        :param limit: Maximum number of posts (**optional**)
+        :type limit: int
+        :rtype: dict
+        """
+
+        scores = self._score(set(tokenize(query)))
+        best = heapq.nlargest(limit, scores, key=scores.get)
+        posts = [self._docs[doc] for doc in best]
+        user_ids = dict.fromkeys(post.get("userId") for post in posts)
+        users = [self._users[i] for i in user_ids if i in self._users]
+
+        return {
+            "code": 200,
+            "message": "OK" if posts else "No results",
+            "data": {"posts": posts, "users": users},
+        }
+
+    def _score(self, terms):
+        scores = {}
+        live_docs = len(self._doc_numbers)
+
+        if not live_docs:
+            return scores
+
+        average_length = self._total_length / live_docs
+
+        for term in terms:
+            postings = self._postings.get(term)
+
+            if postings is None:
+                continue
+
+            values = _decode(postings)
+            pairs = list(zip(values, values))
+            idf = math.log(1 + (live_docs - len(pairs) + 0.5) / (len(pairs) + 0.5))
+            doc = 0
+
+            for gap, frequency in pairs:
+                doc += gap
+
+                # Removed or replaced post.
+                if self._docs[doc] is None:
+                    continue
+
+                norm = 1 - self.b + self.b * self._lengths[doc] / average_length
+                scores[doc] = scores.get(doc, 0.0) + idf * frequency * (self.k1 + 1) / (
+                    frequency + self.k1 * norm
+                )
+
+        return scores
+
+    def _remove(self, post_id):
+        doc = self._doc_numbers.pop(post_id, None)
+
+        if doc is not None:
+            self._docs[doc] = None
+            self._total_length -= self._lengths[doc]
+
+
+def _encode(buffer, value):
+    while value >= 0x80:
+        buffer.append(value & 0x7F | 0x80)
+        value >>= 7
+
+    buffer.append(value)
+
+
+def _decode(buffer):
+    value = 0
+    shift = 0
+
+    for byte in buffer:
+        value |= (byte & 0x7F) << shift
+
+        if byte & 0x80:
+            shift += 7
+        else:
+            yield value
+            value = 0
+            shift = 0
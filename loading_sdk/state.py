@@ -0,0 +1,115 @@
+import json
+import os
+import tempfile
+
+from loading_sdk.cache import ExtractorCache, ResponseCache, SearchCache
+from loading_sdk.store import SQLiteStore
+
+STATE_VERSION = 1
+
+# The options each kind of cache is created with.
+CACHE_OPTIONS = {
+    "ResponseCache": (ResponseCache, ("ttl", "max_entries", "max_size")),
+    "SearchCache": (SearchCache, ("ttl", "negative_ttl", "max_entries")),
+    "ExtractorCache": (ExtractorCache, ("path", "max_age")),
+    "SQLiteStore": (SQLiteStore, ("path", "ttl", "batch_size")),
+}
+
+
+def export_state(cookies, options):
+    """Returns the session state of a client as json serializable data.
+
+    The contents of in-memory caches aren't included, only the options they were
+    created with.
+
+    :param cookies: Auth cookies of the client
+    :param options: Options of the client. Caches are replaced by their options.
+    :type options: dict
+    :rtype: dict
+    """
+
+    return {
+        "version": STATE_VERSION,
+        "cookies": _cookie_values(cookies),
+        "options": {
+            name: _cache_options(value) if name.endswith("cache") else value
+            for name, value in options.items()
+        },
+    }
+
+
+def restore_state(state):
+    """Returns the cookies and the client options of a state from
+    :func:`export_state`, with new caches created from their options.
+
+    :rtype: tuple
+    """
+
+    if state.get("version") != STATE_VERSION:
+        raise ValueError(f"Unsupported client state version: {state.get('version')}")
+
+    options = {
+        name: _create_cache(value) if name.endswith("cache") else value
+        for name, value in state["options"].items()
+    }
+
+    return state["cookies"], options
+
+
+def save_state(state, path):
+    """Writes a state to a file that only the current user can read, since it holds
+    the auth cookies."""
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(state, file)
+
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def load_state(path):
+    """Reads a state written by :func:`save_state`.
+
+    :rtype: dict
+    """
+
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def _cookie_values(cookies):
+    if not cookies:
+        return None
+
+    # The cookies of aiohttp are morsels.
+    return {name: getattr(value, "value", value) for name, value in cookies.items()}
+
+
+def _cache_options(cache):
+    if cache is None:
+        return None
+
+    name = type(cache).__name__
+
+    if name not in CACHE_OPTIONS:
+        raise TypeError(f"Can't export the options of a {name}")
+
+    _, option_names = CACHE_OPTIONS[name]
+
+    return {"type": name, **{option: getattr(cache, option) for option in option_names}}
+
+
+def _create_cache(options):
+    if options is None:
+        return None
+
+    options = dict(options)
+    cache_class, _ = CACHE_OPTIONS[options.pop("type")]
+
+    return cache_class(**options)
@@ -0,0 +1,342 @@
+import json
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    id TEXT PRIMARY KEY,
+    parent_id TEXT,
+    user_id TEXT,
+    category TEXT,
+    post_type TEXT,
+    created_at TEXT,
+    data TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS posts_parent_id ON posts (parent_id);
+CREATE INDEX IF NOT EXISTS posts_user_id ON posts (user_id);
+CREATE INDEX IF NOT EXISTS posts_category ON posts (category);
+CREATE INDEX IF NOT EXISTS posts_created_at ON posts (created_at);
+CREATE TABLE IF NOT EXISTS users (
+    id TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    post_ids TEXT NOT NULL,
+    user_ids TEXT NOT NULL,
+    meta TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+# Replies doesn't have a category of their own, so they inherit it from their thread.
+INSERT_POST = """
+INSERT OR REPLACE INTO posts
+    (id, parent_id, user_id, category, post_type, created_at, data, fetched_at)
+VALUES (
+    ?, ?, ?, COALESCE(?, (SELECT category FROM posts WHERE id = ?)), ?, ?, ?, ?
+)
+"""
+INSERT_USER = "INSERT OR REPLACE INTO users (id, data, fetched_at) VALUES (?, ?, ?)"
+INSERT_RESPONSE = """
+INSERT OR REPLACE INTO responses (key, post_ids, user_ids, meta, expires_at)
+VALUES (?, ?, ?, ?, ?)
+"""
+
+
+class SQLiteStore:  # pylint: disable=too-many-instance-attributes
+    """A persistent store for posts, threads and users backed by a SQLite database.
+
+    The store can be used as the ``cache`` of both clients. Responses from
+    ``get_post``, ``get_thread`` and the category listings are read through and
+    written through the store, and the posts and users in them are stored once in
+    indexed tables. The database runs in WAL mode, so several processes on the same
+    host can share it as a cache while they read concurrently.
+
+    Writes are batched and committed in one transaction when ``batch_size`` rows are
+    pending, before the next read, or when :meth:`flush` is called.
+
+    The async client reads and writes the store in the default executor of its
+    loop, so a database that is locked by another process doesn't block the loop.
+    :class:`loading_sdk.async_api.prefetch.PrefetchPolicy` still checks which pages
+    are stored from the loop, so prefetching is best used with an in-memory cache.
+
+    :param path: Path to the database file
+    :type path: str
+    :param ttl: Seconds a stored response stays fresh (**optional**)
+    :type ttl: float
+    :param batch_size: Number of pending rows that triggers a commit (**optional**)
+    :type batch_size: int
+    """
+
+    # Reads and writes block on the database, so the async client runs them in an
+    # executor.
+    blocking = True
+
+    def __init__(self, path, ttl=300, batch_size=500):
+        self.path = path
+        self.ttl = ttl
+        self.batch_size = batch_size
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+        self._pending = {"posts": [], "users": [], "responses": []}
+        self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __contains__(self, key):
+        with self._lock:
+            self.flush()
+            row = self._connection.execute(
+                "SELECT expires_at FROM responses WHERE key = ?", (_key(key),)
+            ).fetchone()
+
+        return row is not None and row[0] > time.time()
+
+    def get(self, key, default=None):
+        """Returns the stored response of key, or default if it's missing or stale."""
+
+        with self._lock:
+            entry = self._load(key)
+
+            if entry is None:
+                self.misses += 1
+                return default
+
+            self.hits += 1
+
+            return entry[0]
+
+    def peek(self, key):
+        """Returns the stored response of key, the seconds it stays fresh and its
+        size, which is always 0, or None if it's missing or stale.
+
+        Unlike :meth:`get`, the lookup isn't counted in the stats.
+
+        :rtype: tuple
+        """
+
+        with self._lock:
+            entry = self._load(key)
+
+        if entry is None:
+            return None
+
+        return entry[0], entry[1] - time.time(), 0
+
+    def set(self, key, value, size=0, ttl=None):
+        """Stores a response and the posts and users in it.
+
+        :param size: Ignored, the size of the store is bounded by the ttl
+        :param ttl: Overrides the default ttl for this response
+        """
+
+        del size
+        posts = value.get("posts", [])
+        users = value.get("users", [])
+        meta = {k: v for k, v in value.items() if k not in ("posts", "users")}
+        expires = time.time() + (self.ttl if ttl is None else ttl)
+
+        with self._lock:
+            self._pending["responses"].append(
+                (
+                    _key(key),
+                    json.dumps([post["id"] for post in posts]),
+                    json.dumps([user["id"] for user in users]),
+                    json.dumps(meta),
+                    expires,
+                )
+            )
+            self.add(posts, users)
+
+    def add(self, posts, users=()):
+        """Stores posts and users without storing a response.
+
+        :param posts: Posts as returned by the api
+        :type posts: list
+        :param users: Users as returned by the api (**optional**)
+        :type users: list
+        """
+
+        now = time.time()
+        categories = {
+            post["id"]: post["category"] for post in posts if "category" in post
+        }
+
+        with self._lock:
+            for post in posts:
+                category = post.get("category", categories.get(post.get("parentId")))
+                self._pending["posts"].append(
+                    (
+                        post["id"],
+                        post.get("parentId"),
+                        post.get("userId"),
+                        category,
+                        post.get("parentId"),
+                        post.get("postType"),
+                        post.get("createdAt"),
+                        json.dumps(post),
+                        now,
+                    )
+                )
+
+            for user in users:
+                self._pending["users"].append((user["id"], json.dumps(user), now))
+
+            if sum(len(rows) for rows in self._pending.values()) >= self.batch_size:
+                self.flush()
+
+    def delete(self, key):
+        with self._lock:
+            self.flush()
+            self._connection.execute(
+                "DELETE FROM responses WHERE key = ?", (_key(key),)
+            )
+            self._connection.commit()
+
+    def delete_prefix(self, prefix):
+        """Removes every stored response whose key starts with the items of prefix.
+
+        :param prefix: Leading items of the keys, like ``("thread", thread_id)``
+        :type prefix: tuple
+        """
+
+        # The keys are json lists, so the prefix is the list without its "]".
+        start = _key(prefix)[:-1]
+
+        with self._lock:
+            self.flush()
+            self._connection.execute(
+                "DELETE FROM responses WHERE substr(key, 1, ?) IN (?, ?)",
+                (len(start) + 1, start + ",", start + "]"),
+            )
+            self._connection.commit()
+
+    def clear(self):
+        with self._lock:
+            self.flush()
+            self._connection.executescript(
+                "DELETE FROM responses; DELETE FROM posts; DELETE FROM users;"
+            )
+
+    def flush(self):
+        """Commits all pending writes in one transaction."""
+
+        with self._lock:
+            if not any(self._pending.values()):
+                return
+
+            with self._connection:
+                # Threads are inserted before their replies so the category lookup
+                # of a reply can see the thread.
+                self._connection.executemany(
+                    INSERT_POST,
+                    sorted(self._pending["posts"], key=lambda row: row[1] is not None),
+                )
+                self._connection.executemany(INSERT_USER, self._pending["users"])
+                self._connection.executemany(
+                    INSERT_RESPONSE, self._pending["responses"]
+                )
+
+            self._pending = {"posts": [], "users": [], "responses": []}
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            self._connection.close()
+
+    def get_user(self, user_id):
+        """Returns a stored user, or None if the user hasn't been seen.
+
+        :rtype: dict
+        """
+
+        with self._lock:
+            self.flush()
+            users = self._select("users", [user_id])
+
+        return users[0] if users else None
+
+    def iter_posts(self):
+        """Yields every stored post."""
+
+        with self._lock:
+            self.flush()
+            rows = self._connection.execute("SELECT data FROM posts").fetchall()
+
+        for row in rows:
+            yield json.loads(row[0])
+
+    def iter_users(self):
+        """Yields every stored user."""
+
+        with self._lock:
+            self.flush()
+            rows = self._connection.execute("SELECT data FROM users").fetchall()
+
+        for row in rows:
+            yield json.loads(row[0])
+
+    def stats(self):
+        """Returns hit and miss counters of the store.
+
+        :rtype: dict
+        """
+
+        lookups = self.hits + self.misses
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _load(self, key):
+        self.flush()
+        row = self._connection.execute(
+            "SELECT post_ids, user_ids, meta, expires_at FROM responses WHERE key = ?",
+            (_key(key),),
+        ).fetchone()
+
+        if row is None or row[3] <= time.time():
+            return None
+
+        post_ids = json.loads(row[0])
+        posts = self._select("posts", post_ids)
+
+        # One of the posts has been removed since the response was stored.
+        if len(posts) != len(post_ids):
+            return None
+
+        data = json.loads(row[2])
+        data["posts"] = posts
+        data["users"] = self._select("users", json.loads(row[1]))
+
+        return data, row[3]
+
+    def _select(self, table, ids):
+        if not ids:
+            return []
+
+        placeholders = ",".join("?" * len(ids))
+        rows = self._connection.execute(
+            f"SELECT id, data FROM {table} WHERE id IN ({placeholders})", ids
+        ).fetchall()
+        found = {row[0]: row[1] for row in rows}
+
+        return [json.loads(found[i]) for i in ids if i in found]
+
+
+def _key(key):
+    return json.dumps(key if isinstance(key, str) else list(key))
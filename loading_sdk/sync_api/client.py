@@ -1,132 +1,421 @@
+import collections
+import itertools
 import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
+from loading_sdk import events, protocol
+from loading_sdk import state as session_state
+from loading_sdk import write_through
+from loading_sdk.search import merge_results, normalize_query
 from loading_sdk.settings import (
-    API_URL,
-    API_VERSION,
     EDITORIAL_POST_TYPES,
-    EDITORIAL_SORT,
     FORUM_CATEGORIES,
     POSTS_PER_PAGE,
-    USER_AGENT,
 )
 from loading_sdk.sync_api.extractors import extract_data
+from loading_sdk.sync_api.transport import RequestsTransport, SessionPoolTransport
 
 
-class LoadingApiClient:
+class LoadingApiClient:  # pylint: disable=too-many-instance-attributes,too-many-public-methods
     """A client that allows python apps to easily communicate with the loading forums web api.
 
     Some methods can be used anonymously, while others require the client to be authenticated
     with user credentials.
 
+    The client logs in on the first call that needs it, not when it's created, and
+    logs in again and replays the call once if the session has expired.
+
+    By default a client should only be used by one thread at a time. With
+    ``thread_safe=True`` one client can be shared by many threads: each thread sends
+    its requests with its own pooled session, and the auth cookies are shared by all
+    of them. The caches and the search index are always updated under a lock, since
+    :meth:`search_many` and :meth:`map` spread calls over a pool of threads.
+
     :param email: users email address (**optional**)
     :type email: str
     :param password: users password (**optional**)
     :type password: str
+    :param cache: Read through cache for posts, threads and category listings
+        (**optional**)
+    :type cache: loading_sdk.cache.ResponseCache or loading_sdk.store.SQLiteStore
+    :param search_index: Local full-text index that fetched posts are added to
+        (**optional**)
+    :type search_index: loading_sdk.search_index.SearchIndex
+    :param search_cache: Cache for search results (**optional**)
+    :type search_cache: loading_sdk.cache.SearchCache
+    :param extractor_cache: Cache for about and socials data (**optional**)
+    :type extractor_cache: loading_sdk.cache.ExtractorCache
+    :param transport: Transport that sends the requests, requests is used by default
+        (**optional**)
+    :type transport: loading_sdk.sync_api.transport.RequestsTransport or
+        loading_sdk.sync_api.transport.HttpxTransport
+    :param thread_safe: Whether the client is shared by several threads, a
+        :class:`loading_sdk.sync_api.transport.SessionPoolTransport` is used by
+        default if it is (**optional**)
+    :type thread_safe: bool
+    :param hooks: Callbacks for the events of each call and of its requests
+        (**optional**)
+    :type hooks: loading_sdk.events.Hooks
     """
 
-    def __init__(self, email=None, password=None):
-        self._cookies = None
-
-        if email and password:
-            response = self._authenticate(email, password)
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        email=None,
+        password=None,
+        *,
+        cache=None,
+        search_index=None,
+        search_cache=None,
+        extractor_cache=None,
+        transport=None,
+        thread_safe=False,
+        hooks=None,
+    ):
+        self._credentials = (email, password) if email and password else None
+        self._session_cookies = None
+        self._session = 0
+        self._auth_lock = threading.Lock()
+        self._thread_safe = thread_safe
+        self._lock = threading.RLock()
+        self._cache = cache
+        self._search_index = search_index
+        self._search_cache = search_cache
+        self._extractor_cache = extractor_cache
+        self._hooks = hooks
+
+        if transport is not None:
+            self._transport = transport
+        elif thread_safe:
+            self._transport = SessionPoolTransport()
+        else:
+            self._transport = RequestsTransport(requests)
+
+    @property
+    def _cookies(self):
+        if self._session == 0 and self._credentials is not None:
+            self._login(0)
+
+        return self._session_cookies
+
+    @_cookies.setter
+    def _cookies(self, cookies):
+        with self._auth_lock:
+            self._session_cookies = cookies
+            self._session += 1
+
+    def _login(self, session):
+        # Only one thread logs in, and threads that waited for it use its session.
+        with self._auth_lock:
+            if self._session != session:
+                return
+
+            response = self._authenticate(*self._credentials)
 
             if response.get("code") == 200:
-                self._cookies = response.get("cookies")
+                self._session_cookies = response.get("cookies")
+            elif protocol.login_rejected(response):
+                self._session_cookies = None
+            else:
+                # The session is left as it is, so the next call logs in again.
+                return
+
+            self._session += 1
 
     def _authenticate(self, email, password):
-        url = f"{API_URL}/{API_VERSION}/auth/login"
-        headers = {
-            "User-Agent": USER_AGENT,
-            "content-type": "application/x-www-form-urlencoded",
-        }
-        data = {
-            "email": email,
-            "password": password,
-        }
-        response = requests.post(url, headers=headers, data=data, timeout=10)
+        response = self._send(protocol.login(email, password))
 
-        if response.status_code == 200:
-            return {"code": 200, "cookies": response.cookies}
+        # A successful login only sets the cookies.
+        data = None if response.status == 200 else response.json()
 
-        return response.json()
+        return protocol.login_response(response.status, data, response.cookies)
 
-    def _get_threads_in_forum_category(self, category_name, page):
-        url = f"{API_URL}/{API_VERSION}/posts/"
-        headers = {"User-Agent": USER_AGENT, category_name: category_name}
-
-        # Chooses a specific page instead of the first page which is the default page.
-        if page and page > 1:
-            headers["page"] = str(page)
-
-        # Doing this checks to make sure it only return data from a page that exists.
-        if page and page < 1:
-            return {
-                "code": 404,
-                "message": "Page number too low",
-                "data": {"posts": [], "users": []},
-            }
-
-        response = requests.get(url, headers=headers, timeout=10)
+    def _send(self, request):
+        trace = events.request_trace(request)
+
+        if not request.authenticated:
+            return self._send_traced(trace, request)
+
+        self.login()
+
+        with self._auth_lock:
+            cookies, session = self._session_cookies, self._session
+
+        response = self._send_traced(trace, request, cookies)
+
+        # The session has expired.
+        if response.status == 401 and cookies is not None and self._credentials:
+            trace = trace and trace.retry()
+            self._login(session)
+            response = self._send_traced(trace, request, self._cookies)
+
+        return response
+
+    def _send_traced(self, trace, request, cookies=None):
+        if trace is None:
+            return self._transport.send(request, cookies)
+
+        with trace.sending():
+            response = self._transport.send(request, cookies)
+
+        return trace.received(response)
+
+    @events.traced("login")
+    def login(self):
+        """Logs in now instead of on the first call that needs it.
+
+        :return: Whether the client has a session
+        :rtype: bool
+        """
+
+        return self._cookies is not None
+
+    def close(self):
+        """Closes the connections of the transport."""
+
+        self._transport.close()
+
+    @classmethod
+    def from_state(cls, state, **options):
+        """Creates a client from the state of another client, without logging in.
+
+        :param state: State returned by :meth:`export_state`
+        :type state: dict
+        :param options: Options that replace the options in the state, like
+            ``transport``
+        :rtype: LoadingApiClient
+        """
+
+        cookies, state_options = session_state.restore_state(state)
+        client = cls(**{**state_options, **options})
+
+        # A state exported before logging in has no session, so the client logs in
+        # with its credentials when it needs to.
+        if cookies:
+            client._cookies = cookies
+
+        return client
+
+    @classmethod
+    def load_state(cls, path, **options):
+        """Creates a client from a state saved with :meth:`save_state`.
+
+        :param path: Path to the state file
+        :type path: str
+        :rtype: LoadingApiClient
+        """
+
+        return cls.from_state(session_state.load_state(path), **options)
+
+    def export_state(self):
+        """Returns the auth cookies and the options of the client as json
+        serializable data, so other processes can create the same client without
+        logging in.
+
+        :rtype: dict
+        """
+
+        return session_state.export_state(
+            self._cookies,
+            {
+                "cache": self._cache,
+                "search_cache": self._search_cache,
+                "extractor_cache": self._extractor_cache,
+                "thread_safe": self._thread_safe,
+            },
+        )
+
+    def save_state(self, path):
+        """Saves the state of the client to a file.
+
+        :param path: Path to the state file
+        :type path: str
+        """
+
+        session_state.save_state(self.export_state(), path)
+
+    def _get_cached(self, request):
+        if self._cache is not None:
+            with self._lock:
+                data = self._cache.get(request.key)
+
+            if data is not None:
+                events.cache_hit()
+                return 200, data
+
+        response = self._send(request)
         data = response.json()
 
-        # Page out of range.
-        if not data["posts"]:
-            return {"code": 404, "message": "Page number too high", "data": data}
+        if response.status == 200:
+            self._store(request.key, data, response.size)
 
-        return {"code": 200, "message": "OK", "data": data}
+        return response.status, data
+
+    def _store(self, key, data, size):
+        if not data.get("posts"):
+            return
+
+        with self._lock:
+            if self._cache is not None and key is not None:
+                self._cache.set(key, data, size=size)
+
+            if self._search_index is not None:
+                self._search_index.add(data["posts"], data["users"])
+
+    def _write_through(self, update, *args):
+        # Successful writes update the cached pages, so they can be read back without
+        # fetching them again.
+        if self._cache is not None:
+            with self._lock:
+                update(self._cache, *args)
 
+    def _get_threads_in_forum_category(self, category_name, page):
+        error = protocol.page_too_low(page)
+
+        if error:
+            return error
+
+        _, data = self._get_cached(protocol.category_page(category_name, page))
+
+        return protocol.listing_response(data)
+
+    @events.traced("get_profile")
     def get_profile(self):
         """Returns authenticated users profile data
 
         :rtype: dict
         """
 
-        url = f"{API_URL}/{API_VERSION}/users/profile"
-        headers = {
-            "User-Agent": USER_AGENT,
-        }
-        response = requests.get(url, headers=headers, cookies=self._cookies, timeout=10)
-
-        if response.status_code == 200:
-            return {
-                "code": response.status_code,
-                "message": "OK",
-                "data": response.json(),
-            }
+        response = self._send(protocol.profile())
 
-        return response.json()
+        return protocol.data_response(response.status, response.json())
 
+    @events.traced("search")
     def search(self, query):
         """Returns posts that matches the query
 
+        The query is sent in lower case with runs of whitespace collapsed.
+
         :param query: Search query
         :type query: str
         :rtype: dict
         """
 
-        url = f"{API_URL}/{API_VERSION}/search/"
-        headers = {
-            "User-Agent": USER_AGENT,
-            "Content-Type": "application/x-www-form-urlencoded;charset=UTF-8",
-        }
-        response = requests.post(
-            url,
-            headers=headers,
-            data={"query": query},
-            timeout=10,
-        )
-        data = response.json()
+        query = normalize_query(query)
+        data = None
 
-        if response.status_code == 200:
-            return {
-                "code": response.status_code,
-                "message": "OK" if len(data["posts"]) else "No results",
-                "data": data,
-            }
+        if self._search_cache is not None:
+            with self._lock:
+                data = self._search_cache.get(query)
 
-        return data
+            if data is not None:
+                events.cache_hit()
+
+        if data is None:
+            response = self._send(protocol.search(query))
+            data = response.json()
+
+            if response.status != 200:
+                return data
+
+            self._store(None, data, 0)
 
+            if self._search_cache is not None:
+                with self._lock:
+                    self._search_cache.set(query, data)
+
+        return protocol.search_response(data)
+
+    def search_many(self, queries, concurrency=4):
+        """Returns posts that matches any of the queries
+
+        Queries that are the same after normalization are only sent once, and up to
+        ``concurrency`` queries are sent at the same time. Posts and users found by
+        several queries are only included once, and the response of each query is
+        in ``data["results"]``.
+
+        :param queries: Search queries
+        :type queries: list
+        :param concurrency: Maximum number of concurrent requests (**optional**)
+        :type concurrency: int
+        :rtype: dict
+        """
+
+        queries = list(queries)
+        unique_queries = list(dict.fromkeys(map(normalize_query, queries)))
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            responses = executor.map(self.search, unique_queries)
+
+        return merge_results(queries, dict(zip(unique_queries, responses)))
+
+    def search_local(self, query, limit=POSTS_PER_PAGE):
+        """Returns posts that matches the query from the local search index
+
+        Only posts that the client has fetched are searched. The response has the
+        same shape as the response of :meth:`search`.
+
+        :param query: Search query
+        :type query: str
+        :param limit: Maximum number of posts (**optional**)
+        :type limit: int
+        :rtype: dict
+        """
+
+        if self._search_index is None:
+            return {"code": 400, "message": "No local search index"}
+
+        with self._lock:
+            return self._search_index.search(query, limit)
+
+    def map(self, method_name, args, workers=4, queue_size=None):
+        """Calls a method of the client once for each item in args, on a pool of
+        threads
+
+        The responses are yielded in the same order as args. At most ``queue_size``
+        calls are queued at a time, so args can be a long or endless iterator. The
+        caches and the search index are updated under the lock of the client, but a
+        transport that was given to a client without ``thread_safe=True`` must be
+        safe to share between threads.
+
+        :param method_name: Name of the method, like "get_post"
+        :type method_name: str
+        :param args: Arguments of each call. Tuples are passed as several arguments.
+        :type args: iterable
+        :param workers: Number of threads (**optional**)
+        :type workers: int
+        :param queue_size: Maximum number of queued calls, twice the number of
+            threads by default (**optional**)
+        :type queue_size: int
+        :rtype: iterator
+        """
+
+        method = getattr(self, method_name)
+        args = iter(args)
+        queue_size = queue_size or workers * 2
+        futures = collections.deque()
+
+        def submit(executor, count):
+            for arg in itertools.islice(args, count):
+                if isinstance(arg, tuple):
+                    futures.append(executor.submit(method, *arg))
+                else:
+                    futures.append(executor.submit(method, arg))
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            try:
+                submit(executor, queue_size)
+
+                while futures:
+                    response = futures.popleft().result()
+                    submit(executor, 1)
+                    yield response
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    @events.traced("get_post")
     def get_post(self, post_id):
         """Returns a specific post
 
@@ -138,22 +427,11 @@ class LoadingApiClient:
         if not post_id:
             return {"code": 404, "message": '"post_id" is not allowed to be empty'}
 
-        url = f"{API_URL}/{API_VERSION}/posts/{post_id}"
-        headers = {
-            "User-Agent": USER_AGENT,
-        }
-
-        response = requests.get(url, headers=headers, timeout=10)
-
-        if response.status_code == 200:
-            return {
-                "code": response.status_code,
-                "message": "OK",
-                "data": response.json(),
-            }
+        status_code, data = self._get_cached(protocol.post(post_id))
 
-        return response.json()
+        return protocol.data_response(status_code, data)
 
+    @events.traced("get_thread")
     def get_thread(self, thread_id, page=None):
         """Returns all posts on a specific page from a specific thread
 
@@ -167,58 +445,11 @@ class LoadingApiClient:
         if not thread_id:
             return {"code": 404, "message": '"thread_id" is not allowed to be empty'}
 
-        url = f"{API_URL}/{API_VERSION}/posts/{thread_id}"
-        headers = {"User-Agent": USER_AGENT}
+        status_code, data = self._get_cached(protocol.thread_page(thread_id, page))
 
-        # Chooses a specific page instead of the first page which is the default page.
-        if page and page > 1:
-            headers["page"] = str(page)
-
-        response = requests.get(url, headers=headers, timeout=10)
-
-        if response.status_code != 200:
-            return response.json()
-
-        data = response.json()
-
-        if "title" not in data["posts"][-1]:
-            return {
-                "code": response.status_code,
-                "message": "Exists, but was not a thread id",
-            }
-
-        # Doing this checks to make sure it only return data from a page that exists.
-        if page:
-            replies = data["posts"][-1]["replies"]
-            pages = math.ceil(replies / POSTS_PER_PAGE)
-
-            # There is always atleast one page.
-            if pages == 0:
-                pages = 1
-
-            # Page is out of range.
-            if page < 1:
-                return {
-                    "code": response.status_code,
-                    "message": "Page number too low",
-                    "data": {"posts": [], "users": []},
-                }
-
-            if page > pages:
-                return {
-                    "code": response.status_code,
-                    "message": "Page number too high",
-                    "data": {"posts": [], "users": []},
-                }
-
-        successful_response = {
-            "code": response.status_code,
-            "message": "OK",
-            "data": data,
-        }
-
-        return successful_response
+        return protocol.thread_response(status_code, data, page)
 
+    @events.traced("get_games")
     def get_games(self, page=None):
         """Retruns threads from a specific page in the game category
 
@@ -232,6 +463,7 @@ class LoadingApiClient:
 
         return thread_data
 
+    @events.traced("get_other")
     def get_other(self, page=None):
         """Retruns threads from a specific page in the other category
 
@@ -245,6 +477,7 @@ class LoadingApiClient:
 
         return thread_data
 
+    @events.traced("get_editorials")
     def get_editorials(self, page=None, post_type=None, sort=None):
         """Retruns threads from a specific page in the texts category
 
@@ -259,40 +492,16 @@ class LoadingApiClient:
         :rtype: dict
         """
 
-        url = f"{API_URL}/{API_VERSION}/posts/"
-        headers = {
-            "User-Agent": USER_AGENT,
-            "texts": "texts",
-            "post-type": "neRegular",
-        }
-
-        if post_type and post_type in EDITORIAL_POST_TYPES:
-            headers["post-type"] = post_type
+        error = protocol.page_too_low(page)
 
-        if sort and sort in EDITORIAL_SORT:
-            headers["sort"] = sort
+        if error:
+            return error
 
-        # Chooses a specific page instead of the first page which is the default page.
-        if page and page > 1:
-            headers["page"] = str(page)
+        _, data = self._get_cached(protocol.editorials_page(page, post_type, sort))
 
-        # Doing this checks to make sure it only return data from a page that exists.
-        if page and page < 1:
-            return {
-                "code": 404,
-                "message": "Page number too low",
-                "data": {"posts": [], "users": []},
-            }
-
-        response = requests.get(url, headers=headers, timeout=10)
-        data = response.json()
-
-        # Page out of range.
-        if not data["posts"]:
-            return {"code": 404, "message": "Page number too high", "data": data}
-
-        return {"code": 200, "message": "OK", "data": data}
+        return protocol.listing_response(data)
 
+    @events.traced("create_post")
     def create_post(self, thread_id, message):
         """Create new post in a thread
 
@@ -306,38 +515,20 @@ class LoadingApiClient:
         if not thread_id:
             return {"code": 400, "message": '"thread_id" is not allowed to be empty'}
 
-        url = f"{API_URL}/{API_VERSION}/posts/{thread_id}"
-        headers = {
-            "User-Agent": USER_AGENT,
-            "content-type": "application/x-www-form-urlencoded",
-        }
-        data = {"body": message}
-        response = requests.post(
-            url,
-            headers=headers,
-            data=data,
-            cookies=self._cookies,
-            timeout=10,
-        )
+        response = self._send(protocol.create_post(thread_id, message))
 
-        # Has no auth token.
-        if response.status_code == 401:
-            return response.json()
-
-        # Post id doesn't exist.
-        if response.status_code == 404:
-            return response.json()
+        # Errors like a missing auth token or a post id that doesn't exist are
+        # returned as they are.
+        data = protocol.data_response(
+            response.status, response.json(), 201, "Post created"
+        )
 
-        if response.status_code == 201:
-            return {
-                "code": response.status_code,
-                "message": "Post created",
-                "data": response.json(),
-            }
+        if data.get("code") == 201:
+            self._write_through(write_through.add_post, thread_id, data["data"])
 
-        # Handle any other unknown status code.
-        return response.json()
+        return data
 
+    @events.traced("edit_post")
     def edit_post(self, post_id, message):
         """Edit existing post in a thread
 
@@ -351,38 +542,17 @@ class LoadingApiClient:
         if not message:
             return {"code": 400, "message": '"message" is not allowed to be empty'}
 
-        url = f"{API_URL}/{API_VERSION}/posts/{post_id}"
-        headers = {
-            "User-Agent": USER_AGENT,
-            "content-type": "application/x-www-form-urlencoded",
-        }
-        data = {"body": message}
-        response = requests.patch(
-            url,
-            headers=headers,
-            data=data,
-            cookies=self._cookies,
-            timeout=10,
+        response = self._send(protocol.edit_post(post_id, message))
+        data = protocol.data_response(
+            response.status, response.json(), 200, "Post updated"
         )
 
-        # Has no auth token.
-        if response.status_code == 401:
-            return response.json()
+        if data.get("code") == 200:
+            self._write_through(write_through.replace_post, data["data"])
 
-        # Post id doesn't exist.
-        if response.status_code == 404:
-            return response.json()
-
-        if response.status_code == 200:
-            return {
-                "code": response.status_code,
-                "message": "Post updated",
-                "data": response.json(),
-            }
-
-        # Handle any other unknown status code.
-        return response.json()
+        return data
 
+    @events.traced("create_thread")
     def create_thread(self, title, message, category_name, post_type=None):
         """Create new thread in one of the forum categories
 
@@ -404,43 +574,21 @@ class LoadingApiClient:
         if not post_type:
             post_type = "regular"
 
-        url = f"{API_URL}/{API_VERSION}/posts/"
-        headers = {
-            "User-Agent": USER_AGENT,
-            "content-type": "application/x-www-form-urlencoded",
-        }
-        data = {
-            "category": category_name,
-            "postType": post_type,
-            "title": title,
-            "body": message,
-        }
-        response = requests.post(
-            url,
-            headers=headers,
-            data=data,
-            cookies=self._cookies,
-            timeout=10,
-        )
-
-        # Validation errors. Happens when title or message is empty. Possibly in other cases too.
-        if response.status_code == 400:
-            return response.json()
+        request = protocol.create_thread(title, message, category_name, post_type)
+        response = self._send(request)
 
-        # No auth token.
-        if response.status_code == 401:
-            return response.json()
+        # Validation errors, which happens when title or message is empty, and a
+        # missing auth token are returned as they are.
+        data = protocol.data_response(
+            response.status, response.json(), 201, "Thread created"
+        )
 
-        if response.status_code == 201:
-            return {
-                "code": response.status_code,
-                "message": "Thread created",
-                "data": response.json(),
-            }
+        if data.get("code") == 201:
+            self._write_through(write_through.delete_listings, category_name)
 
-        # Handle any other unknown status code.
-        return response.json()
+        return data
 
+    @events.traced("edit_thread")
     def edit_thread(self, thread_id, message):
         """Edit existing thread
 
@@ -459,31 +607,51 @@ class LoadingApiClient:
 
         return thread_data
 
+    @events.traced("get_about")
     def get_about(self):
         """Get about page data
 
         :rtype dict
         """
-        data = extract_data("about")
+        data = extract_data("about", self._extractor_cache)
 
         if not data:
             return {"code": 404, "message": "No data found", "data": None}
 
         return {"code": 200, "message": "OK", "data": data}
 
+    @events.traced("get_socials")
     def get_socials(self):
         """Get social media links
 
         :rtype dict
         """
 
-        data = extract_data("socials")
+        data = extract_data("socials", self._extractor_cache)
 
         if not data:
             return {"code": 404, "message": "No results found", "data": None}
 
         return {"code": 200, "message": "OK", "data": data}
 
+    @events.traced("get_site_metadata")
+    def get_site_metadata(self):
+        """Get about page data and social media links together
+
+        The site is only downloaded once for both, so this is faster than calling
+        :meth:`get_about` and :meth:`get_socials`.
+
+        :rtype dict
+        """
+
+        data = extract_data("site", self._extractor_cache)
+
+        if not data:
+            return {"code": 404, "message": "No data found", "data": None}
+
+        return {"code": 200, "message": "OK", "data": data}
+
+    @events.traced("get_total_thread_pages")
     def get_total_thread_pages(self, thread_id):
         """Returns total pages of a thread.
 
@@ -497,12 +665,9 @@ class LoadingApiClient:
         if response["code"] != 200:
             return response
 
-        thread_start = response["data"]["posts"][-1]
-        replies = max(thread_start["replies"], 1)
-        pages = math.ceil(replies / POSTS_PER_PAGE)
-
-        return pages
+        return protocol.thread_pages(response["data"])
 
+    @events.traced("get_total_category_pages")
     def get_total_category_pages(self, category):
         """Returns total pages of a forum category.
 
@@ -516,21 +681,11 @@ class LoadingApiClient:
 
         working_page = None
         current_page = 1
-        url = f"{API_URL}/{API_VERSION}/posts/"
-        headers = {
-            "User-Agent": USER_AGENT,
-            "page": str(current_page),
-            category: category,
-        }
-
-        if category == "texts":
-            headers["post-type"] = "neRegular"
 
         # Double current page until no results are returned
         # then we know all pages after that won't work either.
         while True:
-            headers["page"] = str(current_page)
-            response = requests.get(url, headers=headers, timeout=10)
+            response = self._send(protocol.listing_page(category, current_page))
             data = response.json()
 
             if not data["posts"]:
@@ -541,9 +696,7 @@ class LoadingApiClient:
 
         while True:
             page = working_page + math.floor((current_page - working_page) / 2)
-            headers["page"] = str(page)
-
-            response = requests.get(url, headers=headers, timeout=10)
+            response = self._send(protocol.listing_page(category, page))
             data = response.json()
 
             if data["posts"]:
@@ -1,24 +1,51 @@
-import json
 import re
 from abc import ABC, abstractmethod
+from urllib.parse import urlparse
 
 import requests
-from bs4 import BeautifulSoup
+from loading_sdk import events, protocol
+from loading_sdk.parsing import find_main_script, iter_js_literals, parse_js_literal
 from loading_sdk.settings import BASE_URL, USER_AGENT
 
+# Array literals that are assigned to a variable.
+ARRAY_PATTERN = re.compile(r"[A-Za-z_$][\w$]*\s*=\s*\[")
+# Props of the links to the social media accounts in the footer.
+LINK_PATTERN = re.compile(r"\{(?=\s*href\s*:)")
+FOOTER_LINK_CLASSES = ("Footer-icon", "Footer-patreon")
+# An array of people assigned to a variable, which only the about chunk has.
+ABOUT_SIGNATURE = re.compile(r"=\s*\[\s*\{\s*name\s*:")
+
 
 class Extractor(ABC):
+    name = None
+    page_url = BASE_URL
+    # Sources the extractor parses, "main_script" and/or "chunks".
+    sources = ("main_script",)
+    # Pattern that only the chunk the extractor parses matches.
+    signature = None
+
     def get_source(self, url: str) -> str:
         headers = {"User-Agent": USER_AGENT}
-        response = requests.get(url, headers=headers, timeout=10)
+        trace = events.request_trace(protocol.Request("get", url, headers))
+
+        if trace is None:
+            return requests.get(url, headers=headers, timeout=10).text
+
+        with trace.sending():
+            response = requests.get(url, headers=headers, timeout=10)
 
-        return response.text
+        trace.headers(response.status_code)
+        trace.body(len(response.content))
+        text = response.text
+        trace.decoded()
+
+        return text
 
     def get_script(self, source: str) -> str:
-        soup = BeautifulSoup(source, "html.parser")
-        main_script = soup.find(src=re.compile(r"/static/js/main\.[0-9a-zA-Z]+\.js"))
+        return find_main_script(source)
 
-        return main_script["src"][1:]
+    def get_bundle_hash(self, script_url: str) -> str:
+        return re.search(r"main\.([0-9a-zA-Z]+)\.js", script_url).group(1)
 
     def get_chunks(self, source: str) -> list:
         chunk_urls = []
@@ -27,9 +54,7 @@ class Extractor(ABC):
         match = re.search(r"(static/js/).+?(?=\{)(.+?(?=\[)).+(.chunk.js)", source)
 
         if match:
-            # Transform the code into valid JSON so the chunk ids can be stored in a python dict.
-            file_name_values = re.sub(r"([0-9]+?(?=:))", r'"\1"', match.group(2))
-            chunk_ids = json.loads(file_name_values)
+            chunk_ids, _ = parse_js_literal(source, match.start(2))
 
             for key, value in chunk_ids.items():
                 chunk_url = f"{BASE_URL}/{match.group(1)}{key}.{value}{match.group(3)}"
@@ -37,65 +62,150 @@ class Extractor(ABC):
 
         return chunk_urls
 
+    def select_chunks(self, chunk_urls: list) -> list:
+        """Returns the urls of the chunks the extractor needs."""
+
+        del chunk_urls
+
+        return []
+
+    def get_sources(self, main_script_url: str) -> dict:
+        """Fetches each source the extractor needs once."""
+
+        sources = {"main_script": "", "chunk_urls": [], "chunks": {}}
+        sources["main_script"] = self.get_source(f"{BASE_URL}/{main_script_url}")
+
+        if "chunks" in self.sources:
+            sources["chunk_urls"] = self.get_chunks(sources["main_script"])
+            urls = self.select_chunks(sources["chunk_urls"])
+            sources["chunks"] = {url: self.get_source(url) for url in urls}
+
+        return sources
+
+    def get_data(self, cache=None):
+        if cache is not None:
+            data = cache.get_fresh(self.name)
+
+            if data is not None:
+                return data
+
+        page_source = self.get_source(self.page_url)
+        main_script_url = self.get_script(page_source)
+
+        if main_script_url is None:
+            return None
+
+        bundle_hash = self.get_bundle_hash(main_script_url)
+
+        # The html page is all that has to be fetched to see if the bundle changed.
+        if cache is not None:
+            data = cache.get(self.name, bundle_hash)
+
+            if data is not None:
+                return data
+
+        data = self.parse(self.get_sources(main_script_url))
+
+        if cache is not None and data is not None:
+            cache.set(self.name, bundle_hash, data)
+
+        return data
+
     @abstractmethod
-    def get_data(self):
+    def parse(self, sources: dict):
         pass
 
 
 class AboutExtractor(Extractor):
-    def get_data(self):
-        about_page_source = self.get_source(f"{BASE_URL}/om")
-        main_script_url = self.get_script(about_page_source)
-        main_script_source = self.get_source(f"{BASE_URL}/{main_script_url}")
-        chunk_urls = self.get_chunks(main_script_source)
-        about_script_url = chunk_urls[-1]
-        about_script_source = self.get_source(about_script_url)
-
-        match = re.search(
-            r"var.e=(.+?)(?=\.map).+a=(.+?)(?=\.map)", about_script_source
-        )
-
-        if not match:
+    name = "about"
+    page_url = f"{BASE_URL}/om"
+    sources = ("main_script", "chunks")
+    signature = ABOUT_SIGNATURE
+
+    def select_chunks(self, chunk_urls: list) -> list:
+        return chunk_urls[-1:]
+
+    def parse(self, sources: dict):
+        about_script_sources = [
+            source
+            for source in sources["chunks"].values()
+            if self.signature.search(source)
+        ]
+
+        if not about_script_sources:
             return None
 
-        people = re.sub(r"(\{|\,)([a-z]+)(\:)", r'\1"\2"\3', match.group(1))
-        people = re.sub(r"(.+)(')(.+)(')(.+)", r'\1"\3"\5', people)
-        people = people.replace('slags "vuxen p', "slags 'vuxen p")
-        people = people.replace('riktigt"-framtid', "riktigt'-framtid")
-        people = people.replace("\\n", "")
-        people = people.encode("utf-8").decode("unicode_escape")
+        about_script_source = about_script_sources[0]
+
+        # The people and the moderators are the arrays of objects that are mapped
+        # to elements on the page, in that order.
+        lists = [
+            value
+            for _, value, end in iter_js_literals(about_script_source, ARRAY_PATTERN)
+            if about_script_source.startswith(".map", end)
+            and value
+            and all(isinstance(item, dict) for item in value)
+        ]
 
-        moderators = re.sub(r"(\{|\,)([a-z]+)(\:)", r'\1"\2"\3', match.group(2))
-        moderators = re.sub(r"(.+)(')(.+)(')(.+)", r'\1"\3"\5', moderators)
-        moderators = moderators.replace("\\n", "")
-        moderators = moderators.encode("utf-8").decode("unicode_escape")
+        if len(lists) < 2:
+            return None
 
         data = {
-            "people": json.loads(people),
-            "moderators": json.loads(moderators),
+            "people": lists[0],
+            "moderators": lists[1],
         }
 
         return data
 
 
 class SocialsExtractor(Extractor):
-    def get_data(self):
-        page_source = self.get_source(BASE_URL)
-        main_script_url = self.get_script(page_source)
-        main_script_source = self.get_source(f"{BASE_URL}/{main_script_url}")
-
-        match = re.findall(
-            r"(?:href:\")"
-            + r"(https:\/\/|https:\/\/www.(.*?)\..*?\/.*?)"
-            + r"(?:\",target:\"_blank\",rel:\"noreferrer noopener\",className:)"
-            + r"(?:\"Footer-(?:icon|patreon)\")",
-            main_script_source,
-        )
+    name = "socials"
+    page_url = BASE_URL
+
+    def parse(self, sources: dict):
+        main_script_source = sources["main_script"]
+
+        data = []
 
-        if not match:
+        for _, props, _ in iter_js_literals(main_script_source, LINK_PATTERN):
+            link = props.get("href")
+
+            if props.get("className") not in FOOTER_LINK_CLASSES or not link:
+                continue
+
+            host = urlparse(link).hostname or ""
+            name = host[4:] if host.startswith("www.") else host
+            data.append({"name": name.split(".")[0], "link": link})
+
+        if not data:
             return None
 
-        data = [{"name": social[1], "link": social[0]} for social in match]
+        return data
+
+
+class SiteMetadataExtractor(Extractor):
+    """Runs several extractors over sources that are only fetched once."""
+
+    name = "site"
+
+    def __init__(self, extractors: list):
+        self.extractors = extractors
+        self.sources = tuple(
+            dict.fromkeys(source for e in extractors for source in e.sources)
+        )
+
+    def select_chunks(self, chunk_urls: list) -> list:
+        return list(
+            dict.fromkeys(
+                url for e in self.extractors for url in e.select_chunks(chunk_urls)
+            )
+        )
+
+    def parse(self, sources: dict):
+        data = {e.name: e.parse(sources) for e in self.extractors}
+
+        if not any(data.values()):
+            return None
 
         return data
 
@@ -116,16 +226,30 @@ class SocialsExtractorFactory(ExtractorFactory):
         return SocialsExtractor()
 
 
-def extract_data(extractor_name):
-    factories = {
-        "about": AboutExtractorFactory(),
-        "socials": SocialsExtractorFactory(),
-    }
+class SiteMetadataExtractorFactory(ExtractorFactory):
+    def get_extractor(self) -> Extractor:
+        extractors = [
+            factory.get_extractor()
+            for name, factory in EXTRACTOR_FACTORIES.items()
+            if name != "site"
+        ]
+
+        return SiteMetadataExtractor(extractors)
+
+
+# Extractors that are run by get_site_metadata, by name.
+EXTRACTOR_FACTORIES = {
+    "about": AboutExtractorFactory(),
+    "socials": SocialsExtractorFactory(),
+    "site": SiteMetadataExtractorFactory(),
+}
+
 
-    if extractor_name in factories:
-        factory = factories[extractor_name]
+def extract_data(extractor_name, cache=None):
+    if extractor_name in EXTRACTOR_FACTORIES:
+        factory = EXTRACTOR_FACTORIES[extractor_name]
         extractor = factory.get_extractor()
-        data = extractor.get_data()
+        data = extractor.get_data(cache)
 
         return data
 
@@ -0,0 +1,210 @@
+import threading
+
+import requests
+from loading_sdk import events, protocol
+
+
+class RequestsResponse:
+    """Wraps a response from requests in the response interface of the transports."""
+
+    def __init__(self, response):
+        self._response = response
+
+    @property
+    def status(self):
+        return self._response.status_code
+
+    @property
+    def size(self):
+        return len(self._response.content)
+
+    @property
+    def cookies(self):
+        return self._response.cookies
+
+    def json(self):
+        return self._response.json()
+
+
+class RequestsTransport:
+    """Sends requests with requests, one connection per concurrent request.
+
+    :param session: Session to send the requests with, or the requests module to
+        send each request on its own (**optional**)
+    :type session: requests.Session
+    :param timeout: Seconds to wait for a response (**optional**)
+    :type timeout: float
+    """
+
+    def __init__(self, session=None, timeout=10):
+        self.session = requests if session is None else session
+        self.timeout = timeout
+
+    def send(self, request, cookies=None):
+        """Sends a request and returns the response.
+
+        :param request: Request to send
+        :type request: loading_sdk.protocol.Request
+        :param cookies: Cookies to send with the request (**optional**)
+        """
+
+        options = {"headers": request.headers, "timeout": self.timeout}
+
+        if request.data is not None:
+            options["data"] = request.data
+
+        if cookies is not None:
+            options["cookies"] = cookies
+
+        trace = events.current_request()
+        send = getattr(self._get_session(), request.method)
+
+        if trace is None:
+            return RequestsResponse(send(request.url, **options))
+
+        # Streaming returns once the headers are read, so the body is downloaded
+        # separately.
+        response = send(request.url, stream=True, **options)
+        trace.headers(response.status_code)
+        trace.body(len(response.content))
+
+        return RequestsResponse(response)
+
+    def close(self):
+        if self.session is not requests:
+            self.session.close()
+
+    def _get_session(self):
+        return self.session
+
+
+class SessionPoolTransport(RequestsTransport):
+    """Sends requests with one pooled requests session per thread.
+
+    requests sessions aren't thread-safe, so each thread that sends a request gets
+    its own session that keeps its connections alive between requests.
+
+    :param pool_size: Maximum number of connections each session keeps per host
+        (**optional**)
+    :type pool_size: int
+    :param timeout: Seconds to wait for a response (**optional**)
+    :type timeout: float
+    """
+
+    def __init__(self, pool_size=10, timeout=10):
+        super().__init__(timeout=timeout)
+        self.pool_size = pool_size
+        self._local = threading.local()
+        self._sessions = []
+        self._lock = threading.Lock()
+
+    def close(self):
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+
+        for session in sessions:
+            session.close()
+
+    def _get_session(self):
+        session = getattr(self._local, "session", None)
+
+        if session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=1, pool_maxsize=self.pool_size
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self._local.session = session
+
+            with self._lock:
+                self._sessions.append(session)
+
+        return session
+
+
+class HttpxTransport:
+    """Sends requests with httpx over HTTP/2, so concurrent requests are multiplexed
+    over a few connections.
+
+    Requires the ``http2`` extra to be installed.
+
+    :param http2: Whether to use HTTP/2 (**optional**)
+    :type http2: bool
+    :param timeout: Seconds to wait for a response (**optional**)
+    :type timeout: float
+    :param limits: Connection pool limits (**optional**)
+    :type limits: httpx.Limits
+    :param transport: httpx transport to send the requests with instead of the
+        network, like ``httpx.MockTransport`` (**optional**)
+    :type transport: httpx.BaseTransport
+    """
+
+    def __init__(self, http2=True, timeout=10, limits=None, transport=None):
+        # httpx is an optional dependency.
+        import httpx  # pylint: disable=import-outside-toplevel
+
+        options = {"http2": http2, "timeout": timeout}
+
+        if limits is not None:
+            options["limits"] = limits
+
+        if transport is not None:
+            options["transport"] = transport
+
+        self.client = httpx.Client(**options)
+
+    def send(self, request, cookies=None):
+        trace = events.current_request()
+        headers = protocol.cookie_headers(request.headers, cookies)
+
+        if trace is None:
+            response = self.client.request(
+                request.method, request.url, headers=headers, data=request.data
+            )
+
+            return protocol.Response(
+                response.status_code, response.content, response.cookies
+            )
+
+        record = events.connect_timer(trace)
+
+        with self.client.stream(
+            request.method,
+            request.url,
+            headers=headers,
+            data=request.data,
+            extensions={"trace": lambda name, info: record(name)},
+        ) as response:
+            trace.headers(response.status_code)
+            body = response.read()
+            trace.body(len(body))
+
+        return protocol.Response(response.status_code, body, response.cookies)
+
+    def close(self):
+        self.client.close()
+
+
+class FakeTransport:
+    """An in-process transport that answers requests without any network traffic,
+    for tests and benchmarks.
+
+    :param handler: Function that gets a :class:`loading_sdk.protocol.Request` and
+        returns the status code and the json data of the response
+    :type handler: callable
+    """
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.requests = []
+
+    def send(self, request, cookies=None):
+        del cookies
+        self.requests.append(request)
+        status, data = self.handler(request)
+
+        return protocol.Response.from_data(status, data)
+
+    def close(self):
+        pass
@@ -0,0 +1,133 @@
+import functools
+
+from loading_sdk.protocol import reply_pages
+
+# The prefixes of the cache keys of the listing pages of each category.
+LISTING_PREFIXES = {
+    "games": [("category", "games")],
+    "other": [("category", "other")],
+    "texts": [("editorials",)],
+}
+ALL_LISTING_PREFIXES = [("category",), ("editorials",)]
+
+
+def add_post(cache, thread_id, post):
+    """Updates the cached pages of a thread after a post was created in it.
+
+    The post is added to the cached page it ends up on, the reply count of the
+    thread is bumped on every cached page, and the cached listing pages of the
+    thread's category are removed, since the thread moves to the top.
+
+    :param cache: Response cache of a client
+    :param thread_id: Unique thread id
+    :type thread_id: str
+    :param post: The created post
+    :type post: dict
+    """
+
+    thread = _thread(cache, thread_id)
+
+    if thread is None:
+        # Without the first page the page that changed isn't known.
+        cache.delete_prefix(("thread", thread_id))
+        delete_listings(cache)
+        return
+
+    replies = thread["replies"]
+    last_page = reply_pages(replies + 1)
+
+    def update(page, posts):
+        posts = [_bump_replies(item, thread_id) for item in posts]
+
+        if page == last_page:
+            # The thread is always the last post of a page.
+            posts.insert(len(posts) - 1, post)
+
+        return posts
+
+    _update_pages(cache, thread_id, reply_pages(replies), update)
+    _update_post(cache, thread_id, lambda item: _bump_replies(item, thread_id))
+    delete_listings(cache, thread.get("category"))
+
+
+def replace_post(cache, post):
+    """Updates the cached pages of a post after it was edited.
+
+    :param cache: Response cache of a client
+    :param post: The edited post
+    :type post: dict
+    """
+
+    thread_id = post.get("parentId") or post["id"]
+
+    def replace(item):
+        return {**item, **post} if item["id"] == post["id"] else item
+
+    thread = _thread(cache, thread_id)
+
+    if thread is None:
+        cache.delete_prefix(("thread", thread_id))
+    else:
+        _update_pages(
+            cache,
+            thread_id,
+            reply_pages(thread["replies"]),
+            lambda _, posts: [replace(item) for item in posts],
+        )
+
+    _update_post(cache, post["id"], replace)
+
+    # Listings show the first post of their threads.
+    if thread_id == post["id"]:
+        delete_listings(cache, thread and thread.get("category"))
+
+
+def delete_listings(cache, category=None):
+    """Removes the cached listing pages of a category, or of every category if it's
+    not known.
+
+    :param cache: Response cache of a client
+    :param category: Category name (**optional**)
+    :type category: str
+    """
+
+    for prefix in LISTING_PREFIXES.get(category, ALL_LISTING_PREFIXES):
+        cache.delete_prefix(prefix)
+
+
+def _thread(cache, thread_id):
+    entry = cache.peek(("thread", thread_id, 1))
+
+    return entry[0]["posts"][-1] if entry and entry[0].get("posts") else None
+
+
+def _update_pages(cache, thread_id, total_pages, update):
+    for page in range(1, total_pages + 1):
+        _update(cache, ("thread", thread_id, page), functools.partial(update, page))
+
+
+def _update_post(cache, post_id, update):
+    _update(cache, ("post", post_id), lambda posts: [update(item) for item in posts])
+
+
+def _update(cache, key, update):
+    # Peeking doesn't count as a lookup of the cache.
+    entry = cache.peek(key)
+
+    if not entry or not entry[0].get("posts"):
+        return
+
+    data, ttl, size = entry
+    posts = update(data["posts"])
+
+    # Pages that didn't change keep their entry, and the ones that did keep the time
+    # they stay fresh.
+    if posts != data["posts"]:
+        cache.set(key, {**data, "posts": posts}, size=size, ttl=ttl)
+
+
+def _bump_replies(post, thread_id):
+    if post["id"] != thread_id:
+        return post
+
+    return {**post, "replies": post["replies"] + 1}
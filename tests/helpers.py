@@ -0,0 +1,132 @@
+"""Fakes of the api that are shared by several test modules."""
+
+import asyncio
+import threading
+import time
+
+from loading_sdk import protocol
+
+PROFILE = {"id": "1", "name": "test_username"}
+
+
+class Server:
+    """Answers requests like the api, with sessions that can be expired."""
+
+    def __init__(self, password="password"):
+        self.password = password
+        self.logins = 0
+        self.failures = 0
+        self.failure_status = 503
+        self.token = None
+        self._lock = threading.Lock()
+
+    def expire(self):
+        self.token = None
+
+    def respond(self, request, cookies):
+        if request.url == protocol.LOGIN_URL:
+            # Gives concurrent callers time to start their own login.
+            time.sleep(0.01)
+
+            with self._lock:
+                self.logins += 1
+
+                if self.failures:
+                    self.failures -= 1
+                    status = self.failure_status
+                    return protocol.Response.from_data(
+                        status, {"code": status, "message": "Login failed"}
+                    )
+
+                if request.data["password"] != self.password:
+                    return protocol.Response.from_data(
+                        401, {"code": 401, "message": "Incorrect email or password"}
+                    )
+
+                self.token = f"token-{self.logins}"
+
+                return protocol.Response.from_data(200, {}, {"jwt": self.token})
+
+        if request.authenticated and (not cookies or cookies["jwt"] != self.token):
+            return protocol.Response.from_data(
+                401, {"code": 401, "message": "No auth token"}
+            )
+
+        return protocol.Response.from_data(200, PROFILE)
+
+
+class Transport:
+    def __init__(self, server):
+        self.server = server
+
+    def send(self, request, cookies=None):
+        return self.server.respond(request, cookies)
+
+    def close(self):
+        pass
+
+
+class AsyncTransport(Transport):
+    async def send(self, request, cookies=None):
+        await asyncio.sleep(0)
+
+        return self.server.respond(request, cookies)
+
+    async def close(self):
+        pass
+
+
+# A thread with one page, and a post that can't be fetched.
+POSTS = {"posts": [{"id": "1", "title": "Thread", "replies": 1}], "users": []}
+
+
+def thread(request):
+    if request.url.endswith("/missing"):
+        raise ConnectionError("Connection refused")
+
+    return 200, POSTS
+
+
+# A category of threads with different numbers of pages, for the crawlers.
+CATEGORY_PAGES = 5
+THREADS_PER_PAGE = 4
+THREAD_IDS = [
+    f"{page}-{i}"
+    for page in range(1, CATEGORY_PAGES + 1)
+    for i in range(THREADS_PER_PAGE)
+]
+
+
+def forum_thread(thread_id):
+    replies = int(thread_id.split("-")[1]) * 20
+
+    return {"id": thread_id, "title": "Thread", "category": "games", "replies": replies}
+
+
+def reply_ids():
+    return {
+        f"{thread_id}/{page}"
+        for thread_id in THREAD_IDS
+        for page in range(
+            1, protocol.reply_pages(forum_thread(thread_id)["replies"]) + 1
+        )
+    }
+
+
+def forum(request):
+    # Gives the workers time to split each others shards.
+    time.sleep(0.002)
+    page = int(request.headers.get("page", 1))
+
+    if request.url != protocol.POSTS_URL:
+        thread_id = request.url.rsplit("/", 1)[-1]
+        reply = {"id": f"{thread_id}/{page}", "parentId": thread_id}
+
+        return 200, {"posts": [reply, forum_thread(thread_id)], "users": []}
+
+    if "games" not in request.headers or page > CATEGORY_PAGES:
+        return 200, {"posts": [], "users": []}
+
+    posts = [forum_thread(f"{page}-{i}") for i in range(THREADS_PER_PAGE)]
+
+    return 200, {"posts": posts, "users": []}
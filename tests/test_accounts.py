@@ -0,0 +1,184 @@
+import unittest
+
+from loading_sdk import AsyncLoadingApiClient, LoadingApiClient
+from loading_sdk.accounts import AccountPool, AccountRouter, AsyncAccountPool
+from loading_sdk.async_api import transport as async_transport
+from loading_sdk.sync_api.transport import FakeTransport
+
+
+def created(request):
+    return (201 if request.method == "post" else 200), {"id": "2"}
+
+
+def responder(status):
+    def handler(request):
+        del request
+        return status, {"code": status, "message": "Error"}
+
+    return handler
+
+
+def clients(*handlers):
+    return [LoadingApiClient(transport=FakeTransport(handler)) for handler in handlers]
+
+
+def requests_per_account(pool):
+    return [account.client._transport.requests for account in pool.router.accounts]
+
+
+class TestAccountPool(unittest.TestCase):
+    def test_round_robin(self):
+        pool = AccountPool(clients(created, created, created))
+
+        for i in range(6):
+            self.assertEqual(pool.create_post(str(i), "message")["code"], 201)
+
+        self.assertEqual([len(sent) for sent in requests_per_account(pool)], [2, 2, 2])
+        self.assertEqual(pool.stats()["requests"], 6)
+        self.assertEqual(pool.stats()["in_flight"], 0)
+
+    def test_sticky(self):
+        pool = AccountPool(clients(created, created, created), policy="sticky")
+
+        for _ in range(3):
+            pool.create_post("thread-a", "message")
+            pool.edit_thread("thread-b", "message")
+
+        for sent in requests_per_account(pool):
+            self.assertLessEqual(len({request.url for request in sent}), 2)
+            self.assertIn(len(sent), (0, 3, 6))
+
+    def test_rate_limited_account_rests(self):
+        pool = AccountPool(clients(responder(429), created), cooldown=60)
+
+        self.assertEqual(pool.create_post("1", "message")["code"], 429)
+
+        for _ in range(3):
+            self.assertEqual(pool.create_post("1", "message")["code"], 201)
+
+        stats = pool.stats()
+
+        self.assertEqual(stats["rate_limited"], 1)
+        self.assertEqual(stats["healthy"], 1)
+        self.assertFalse(stats["accounts"][0]["healthy"])
+
+    def test_failing_account_is_unhealthy(self):
+        pool = AccountPool(clients(responder(500)), max_failures=2, cooldown=60)
+
+        pool.get_profile()
+        pool.get_profile()
+
+        self.assertEqual(
+            pool.get_profile(), {"code": 503, "message": "No account available"}
+        )
+        self.assertEqual(pool.stats()["errors"], 2)
+
+    def test_edits_are_sent_by_the_author(self):
+        ids = iter(range(100))
+
+        def handler(request):
+            if request.method == "post":
+                return 201, {"id": f"post-{next(ids)}"}
+
+            return 200, {"id": request.url.rsplit("/", 1)[-1]}
+
+        pool = AccountPool(clients(handler, handler, handler))
+        post_ids = [pool.create_post("1", "message")["data"]["id"] for _ in range(3)]
+        thread_id = pool.create_thread("Title", "message", "games")["data"]["id"]
+
+        for post_id in reversed(post_ids):
+            self.assertEqual(pool.edit_post(post_id, "edited")["code"], 200)
+
+        self.assertEqual(pool.edit_thread(thread_id, "edited")["code"], 200)
+
+        authors = {
+            request.url.rsplit("/", 1)[-1]: account.name
+            for account, sent in zip(pool.router.accounts, requests_per_account(pool))
+            for request in sent
+            if request.method == "patch"
+        }
+
+        self.assertEqual(
+            authors, {"post-0": "0", "post-1": "1", "post-2": "2", "post-3": "0"}
+        )
+
+    def test_max_requests(self):
+        pool = AccountPool(clients(created, created), max_requests=2, period=60)
+
+        responses = [pool.create_post("1", "message")["code"] for _ in range(5)]
+
+        self.assertEqual(responses, [201, 201, 201, 201, 503])
+
+    def test_least_loaded(self):
+        router = AccountRouter(["a", "b"], policy="least_loaded")
+
+        first = router.acquire()
+        second = router.acquire()
+
+        self.assertIsNot(first, second)
+
+        router.release(first, {"code": 200})
+
+        self.assertIs(router.acquire(), first)
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            AccountRouter(["a"], policy="random")
+
+    def test_send_times_are_only_kept_with_a_rate_limit(self):
+        router = AccountRouter(["a"])
+        limited = AccountRouter(["a"], max_requests=10, period=60)
+
+        for _ in range(100):
+            router.release(router.acquire(), {"code": 200})
+            account = limited.acquire()
+
+            if account is not None:
+                limited.release(account, {"code": 200})
+
+        self.assertEqual(len(router.accounts[0].sent_at), 0)
+        self.assertEqual(len(limited.accounts[0].sent_at), 10)
+
+
+class TestAsyncAccountPool(unittest.IsolatedAsyncioTestCase):
+    async def test_edits_are_sent_by_the_author(self):
+        ids = iter(range(100))
+
+        def handler(request):
+            if request.method == "post":
+                return 201, {"id": f"post-{next(ids)}"}
+
+            return 200, {}
+
+        accounts = [
+            await AsyncLoadingApiClient(
+                transport=async_transport.FakeTransport(handler)
+            )
+            for _ in range(2)
+        ]
+        pool = AsyncAccountPool(accounts)
+
+        for _ in range(2):
+            await pool.create_post("1", "message")
+
+        await pool.edit_post("post-0", "edited")
+        await pool.edit_post("post-0", "edited")
+        await pool.close()
+
+        self.assertEqual([len(sent) for sent in requests_per_account(pool)], [3, 1])
+
+    async def test_round_robin(self):
+        accounts = [
+            await AsyncLoadingApiClient(
+                transport=async_transport.FakeTransport(created)
+            )
+            for _ in range(2)
+        ]
+        pool = AsyncAccountPool(accounts)
+
+        for i in range(4):
+            self.assertEqual((await pool.create_post(str(i), "message"))["code"], 201)
+
+        await pool.close()
+
+        self.assertEqual([len(sent) for sent in requests_per_account(pool)], [2, 2])
@@ -0,0 +1,125 @@
+import asyncio
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from loading_sdk import AsyncLoadingApiClient, LoadingApiClient
+from tests.helpers import PROFILE, AsyncTransport, Server, Transport
+
+
+class TestAuthentication(unittest.TestCase):
+    def test_login_is_deferred(self):
+        server = Server()
+        api = LoadingApiClient(
+            "test@email.com", "password", transport=Transport(server)
+        )
+
+        api.get_post("1")
+
+        self.assertEqual(server.logins, 0)
+        self.assertEqual(api.get_profile()["data"], PROFILE)
+        self.assertEqual(api.get_profile()["code"], 200)
+        self.assertEqual(server.logins, 1)
+
+    def test_relogin_when_session_expires(self):
+        server = Server()
+        api = LoadingApiClient(
+            "test@email.com", "password", transport=Transport(server)
+        )
+        api.login()
+        server.expire()
+
+        response = api.edit_post("1", "message")
+
+        self.assertEqual(response["code"], 200)
+        self.assertEqual(server.logins, 2)
+
+    def test_failed_login_isnt_retried(self):
+        server = Server(password="other")
+        api = LoadingApiClient(
+            "test@email.com", "password", transport=Transport(server)
+        )
+
+        self.assertFalse(api.login())
+        self.assertEqual(api.get_profile()["message"], "No auth token")
+        self.assertEqual(server.logins, 1)
+
+    def test_login_is_retried_after_server_error(self):
+        server = Server()
+        server.failures = 1
+        api = LoadingApiClient(
+            "test@email.com", "password", transport=Transport(server)
+        )
+
+        self.assertFalse(api.login())
+        self.assertTrue(api.login())
+        self.assertEqual(api.get_profile()["data"], PROFILE)
+        self.assertEqual(server.logins, 2)
+
+    def test_client_errors_arent_retried(self):
+        for status in (400, 401, 403, 422):
+            server = Server()
+            server.failures = 5
+            server.failure_status = status
+            api = LoadingApiClient(
+                "test@email.com", "password", transport=Transport(server)
+            )
+
+            for _ in range(5):
+                api.get_profile()
+
+            self.assertEqual(server.logins, 1)
+
+        server = Server()
+        server.failures = 1
+        server.failure_status = 429
+        api = LoadingApiClient(
+            "test@email.com", "password", transport=Transport(server)
+        )
+
+        self.assertFalse(api.login())
+        self.assertTrue(api.login())
+
+    def test_threads_share_one_login(self):
+        server = Server()
+        api = LoadingApiClient(
+            "test@email.com", "password", transport=Transport(server), thread_safe=True
+        )
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            responses = list(executor.map(lambda _: api.get_profile(), range(16)))
+
+        self.assertTrue(all(response["code"] == 200 for response in responses))
+        self.assertEqual(server.logins, 1)
+
+
+class TestAsyncAuthentication(unittest.IsolatedAsyncioTestCase):
+    async def test_tasks_share_one_login(self):
+        server = Server()
+        api = await AsyncLoadingApiClient(
+            "test@email.com", "password", transport=AsyncTransport(server)
+        )
+
+        self.assertEqual(server.logins, 0)
+
+        responses = await asyncio.gather(*(api.get_profile() for _ in range(10)))
+
+        self.assertTrue(all(response["code"] == 200 for response in responses))
+        self.assertEqual(server.logins, 1)
+
+        server.expire()
+        responses = await asyncio.gather(*(api.get_profile() for _ in range(10)))
+
+        self.assertTrue(all(response["code"] == 200 for response in responses))
+        self.assertEqual(server.logins, 2)
+
+    async def test_login_is_retried_after_server_error(self):
+        server = Server()
+        server.failures = 1
+        api = await AsyncLoadingApiClient(
+            "test@email.com", "password", transport=AsyncTransport(server)
+        )
+
+        self.assertFalse(await api.login())
+        self.assertEqual((await api.get_profile())["data"], PROFILE)
+        self.assertEqual(server.logins, 2)
+        await api.close()
@@ -0,0 +1,86 @@
+import threading
+import unittest
+
+from loading_sdk import BackgroundLoadingApiClient
+from loading_sdk.async_api.transport import FakeTransport
+
+
+def api(request):
+    post_id = request.url.rsplit("/", 1)[-1]
+
+    if post_id == "missing":
+        return 404, {"code": 404, "message": "Post does not exist"}
+
+    page = int(request.headers.get("page", 1))
+    posts = [{"id": f"{post_id}-{page}"}, {"id": post_id, "title": "T", "replies": 65}]
+
+    return 200, {"posts": posts, "users": []}
+
+
+class TestBackgroundLoadingApiClient(unittest.TestCase):
+    def setUp(self):
+        self.transport = FakeTransport(api)
+        self.client = BackgroundLoadingApiClient(transport=self.transport)
+        self.addCleanup(self.client.close)
+
+    def test_blocking_methods(self):
+        response = self.client.get_post("1")
+
+        self.assertEqual(response["code"], 200)
+        self.assertEqual(response["data"]["posts"][-1]["id"], "1")
+
+    def test_get_posts(self):
+        responses = self.client.get_posts(["1", "missing", "3"])
+
+        self.assertEqual([response["code"] for response in responses], [200, 404, 200])
+        self.assertEqual(responses[2]["data"]["posts"][-1]["id"], "3")
+
+    def test_map(self):
+        responses = self.client.map("get_thread", [("1", 3), ("1", 2)])
+
+        self.assertEqual(
+            [response["data"]["posts"][0]["id"] for response in responses],
+            ["1-3", "1-2"],
+        )
+
+    def test_map_submits_a_window_of_calls(self):
+        ahead = []
+
+        def post_ids():
+            for i in range(100):
+                ahead.append(i - len(self.transport.requests))
+                yield str(i)
+
+        responses = self.client.map("get_post", post_ids())
+
+        self.assertEqual(len(responses), 100)
+        self.assertLessEqual(max(ahead), self.client.concurrency)
+
+    def test_iter_thread(self):
+        pages = list(self.client.iter_thread("1"))
+
+        self.assertEqual(
+            [page["data"]["posts"][0]["id"] for page in pages], ["1-1", "1-2", "1-3"]
+        )
+
+    def test_used_from_several_threads(self):
+        results = []
+
+        def worker():
+            results.append(self.client.get_post("1")["code"])
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, [200] * 8)
+
+    def test_close(self):
+        self.client.close()
+        self.client.close()
+
+        self.assertFalse(self.client._thread.is_alive())
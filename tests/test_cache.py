@@ -0,0 +1,62 @@
+import unittest
+from unittest.mock import patch
+
+from loading_sdk.cache import ResponseCache
+
+
+class TestResponseCache(unittest.TestCase):
+    def test_get_and_set(self):
+        cache = ResponseCache()
+        cache.set("key", {"posts": []})
+
+        self.assertIn("key", cache)
+        self.assertEqual(cache.get("key"), {"posts": []})
+        self.assertIsNone(cache.get("missing"))
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    @patch("loading_sdk.cache.time")
+    def test_expired_entries_are_removed(self, mock_time):
+        mock_time.monotonic.return_value = 100
+        cache = ResponseCache(ttl=10)
+        cache.set("key", "value", size=5)
+
+        mock_time.monotonic.return_value = 111
+
+        self.assertNotIn("key", cache)
+        self.assertIsNone(cache.get("key"))
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.size, 0)
+
+    @patch("loading_sdk.cache.time")
+    def test_peek(self, mock_time):
+        mock_time.monotonic.return_value = 100
+        cache = ResponseCache(ttl=10)
+        cache.set("key", "value", size=5)
+
+        mock_time.monotonic.return_value = 104
+
+        self.assertEqual(cache.peek("key"), ("value", 6, 5))
+        self.assertIsNone(cache.peek("missing"))
+        self.assertEqual(cache.stats()["hits"], 0)
+        self.assertEqual(cache.stats()["misses"], 0)
+
+    def test_evicts_least_recently_used_entries(self):
+        cache = ResponseCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertIn("c", cache)
+
+    def test_evicts_entries_when_max_size_is_exceeded(self):
+        cache = ResponseCache(max_size=10)
+        cache.set("a", 1, size=6)
+        cache.set("b", 2, size=6)
+
+        self.assertNotIn("a", cache)
+        self.assertIn("b", cache)
+        self.assertEqual(cache.size, 6)
@@ -0,0 +1,47 @@
+import os
+import tempfile
+import unittest
+
+from loading_sdk.cache import ResponseCache
+from loading_sdk.crawler import Crawler
+from loading_sdk.store import SQLiteStore
+from loading_sdk.sync_api.transport import FakeTransport
+from tests.helpers import CATEGORY_PAGES, THREAD_IDS, forum, reply_ids
+
+
+class TestCrawler(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "crawl.db")
+
+    def test_run(self):
+        crawler = Crawler(
+            self.path, workers=3, shard_size=8, transport=FakeTransport(forum)
+        )
+
+        stats = crawler.run(["games"])
+
+        replies = reply_ids()
+
+        with SQLiteStore(self.path) as store:
+            post_ids = {post["id"] for post in store.iter_posts()}
+
+        self.assertEqual(post_ids, replies | set(THREAD_IDS))
+        self.assertEqual(stats["threads"], len(THREAD_IDS))
+        self.assertEqual(stats["pages"], CATEGORY_PAGES + len(replies))
+
+    def test_split(self):
+        crawler = Crawler(
+            self.path, workers=2, shard_size=1000, transport=FakeTransport(forum)
+        )
+
+        stats = crawler.run(["games"])
+
+        self.assertGreater(stats["splits"], 0)
+        self.assertEqual(stats["threads"], len(THREAD_IDS))
+        self.assertEqual(stats["pages"], CATEGORY_PAGES + len(reply_ids()))
+
+    def test_cache_option(self):
+        with self.assertRaises(ValueError):
+            Crawler(self.path, cache=ResponseCache())
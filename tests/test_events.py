@@ -0,0 +1,138 @@
+import unittest
+
+from loading_sdk import AsyncLoadingApiClient, LoadingApiClient, protocol
+from loading_sdk.async_api import transport as async_transport
+from loading_sdk.cache import ResponseCache
+from loading_sdk.events import EVENTS, PHASES, Hooks
+from loading_sdk.sync_api.transport import FakeTransport
+from tests.helpers import POSTS, Server, Transport, thread
+
+
+def recorder():
+    hooks = Hooks()
+    events = []
+
+    for name in EVENTS:
+        hooks.on(name, events.append)
+
+    return hooks, events
+
+
+class TestEvents(unittest.TestCase):
+    def test_request_events(self):
+        hooks, events = recorder()
+        api = LoadingApiClient(transport=FakeTransport(thread), hooks=hooks)
+
+        api.get_thread("1")
+
+        self.assertEqual(
+            [event.name for event in events],
+            [
+                "request_start",
+                "response_headers",
+                "body_received",
+                "decode_done",
+                "done",
+            ],
+        )
+        self.assertTrue(all(event.endpoint == "get_thread" for event in events))
+        self.assertEqual(events[0].url_template, f"{protocol.POSTS_URL}{{id}}")
+        self.assertEqual(events[0].method, "GET")
+        self.assertEqual(
+            events[2].size, len(protocol.Response.from_data(200, POSTS).body)
+        )
+
+        done = events[-1]
+
+        self.assertEqual(done.status, 200)
+        self.assertEqual(set(done.timings), set(PHASES) | {"total"})
+        self.assertIsNone(done.timings["connect"])
+        self.assertGreaterEqual(
+            done.timings["total"], done.timings["ttfb"] + done.timings["decode"]
+        )
+
+    def test_cache_hit(self):
+        hooks, events = recorder()
+        api = LoadingApiClient(
+            transport=FakeTransport(thread), cache=ResponseCache(), hooks=hooks
+        )
+
+        api.get_post("1")
+        events.clear()
+        api.get_post("1")
+
+        self.assertEqual([event.name for event in events], ["cache_hit", "done"])
+        self.assertEqual(events[-1].size, 0)
+
+    def test_error(self):
+        hooks, events = recorder()
+        api = LoadingApiClient(transport=FakeTransport(thread), hooks=hooks)
+
+        with self.assertRaises(ConnectionError):
+            api.get_post("missing")
+
+        self.assertEqual(
+            [event.name for event in events], ["request_start", "error", "done"]
+        )
+        self.assertIsInstance(events[-1].error, ConnectionError)
+
+    def test_retry(self):
+        server = Server()
+        hooks, events = recorder()
+        api = LoadingApiClient(
+            "test@email.com", "password", transport=Transport(server), hooks=hooks
+        )
+        api.login()
+        server.expire()
+        events.clear()
+
+        self.assertEqual(api.get_profile()["code"], 200)
+
+        names = [event.name for event in events]
+        templates = {event.url_template for event in events if event.url_template}
+
+        self.assertEqual(names.count("retry"), 1)
+        self.assertEqual(names.count("request_start"), 3)
+        self.assertEqual(names.count("done"), 1)
+        self.assertEqual(templates, {protocol.PROFILE_URL, protocol.LOGIN_URL})
+
+    def test_nested_calls(self):
+        hooks, events = recorder()
+        api = LoadingApiClient(transport=FakeTransport(thread), hooks=hooks)
+
+        api.get_total_thread_pages("1")
+
+        self.assertEqual(
+            {event.endpoint for event in events}, {"get_total_thread_pages"}
+        )
+
+    def test_unknown_event(self):
+        with self.assertRaises(ValueError):
+            Hooks().on("response", print)
+
+
+class TestAsyncEvents(unittest.IsolatedAsyncioTestCase):
+    async def test_request_events(self):
+        hooks, events = recorder()
+        api = await AsyncLoadingApiClient(
+            transport=async_transport.FakeTransport(thread),
+            cache=ResponseCache(),
+            hooks=hooks,
+        )
+
+        await api.get_thread("1")
+        await api.get_thread("1")
+        await api.close()
+
+        self.assertEqual(
+            [event.name for event in events],
+            [
+                "request_start",
+                "response_headers",
+                "body_received",
+                "decode_done",
+                "done",
+                "cache_hit",
+                "done",
+            ],
+        )
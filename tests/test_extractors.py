@@ -0,0 +1,297 @@
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from unittest.mock import MagicMock, patch
+
+from loading_sdk import AsyncLoadingApiClient, LoadingApiClient
+from loading_sdk.async_api.extractors import AboutExtractor, Extractor
+from loading_sdk.cache import ExtractorCache
+from loading_sdk.events import Hooks
+from loading_sdk.metrics import Metrics
+from loading_sdk.settings import BASE_URL
+
+PAGE_SOURCE = """<!doctype html><html lang="sv"><head><title>Loading</title>
+<script defer="defer" src="/static/js/main.{}.js"></script></head>
+<body><div id="root"></div></body></html>"""
+MAIN_SCRIPT_SOURCE = (
+    'Object(r.jsx)("a",{href:"https://www.facebook.com/loadingse/",target:"_blank",'
+    'rel:"noreferrer noopener",className:"Footer-icon"}),'
+    'Object(r.jsx)("a",{href:"https://www.patreon.com/loadingse",target:"_blank",'
+    'rel:"noreferrer noopener",className:"Footer-patreon"});'
+    'n.p+"static/js/"+e+"."+{0:"31d6cfe0",7:"8a1d2c3b"}[e]+".chunk.js"'
+)
+ABOUT_SCRIPT_SOURCE = (
+    "(this.webpackJsonploading=this.webpackJsonploading||[]).push([[7],{123:function"
+    '(e,t,n){"use strict";n.r(t);var c=function(){var e=[{name:"Anna Andersson",'
+    'title:"Chefredakt\\u00f6r",image:"anna.jpg"}].map((function(e){return e})),'
+    'a=[{name:"Kiki",image:"kiki.jpg"}].map((function(e){return e}));return null};'
+    "t.default=c}}]);"
+)
+ABOUT = {
+    "people": [
+        {"name": "Anna Andersson", "title": "Chefredaktör", "image": "anna.jpg"}
+    ],
+    "moderators": [{"name": "Kiki", "image": "kiki.jpg"}],
+}
+SOCIALS = [
+    {"name": "facebook", "link": "https://www.facebook.com/loadingse/"},
+    {"name": "patreon", "link": "https://www.patreon.com/loadingse"},
+]
+
+
+# The about chunk isn't the last chunk in this bundle.
+SPLIT_MAIN_SCRIPT_SOURCE = MAIN_SCRIPT_SOURCE.replace(
+    '7:"8a1d2c3b"}', '7:"8a1d2c3b",9:"c0ffee12"}'
+)
+OTHER_SCRIPT_SOURCE = (
+    "(this.webpackJsonploading=[]).push([[9],{5:function(e){e=[1]}}]);"
+)
+
+
+def site(bundle_hash="5ad51bd6", main_script_source=MAIN_SCRIPT_SOURCE):
+    sources = {
+        BASE_URL: PAGE_SOURCE.format(bundle_hash),
+        f"{BASE_URL}/om": PAGE_SOURCE.format(bundle_hash),
+        f"{BASE_URL}/static/js/main.{bundle_hash}.js": main_script_source,
+        f"{BASE_URL}/static/js/0.31d6cfe0.chunk.js": OTHER_SCRIPT_SOURCE,
+        f"{BASE_URL}/static/js/7.8a1d2c3b.chunk.js": ABOUT_SCRIPT_SOURCE,
+        f"{BASE_URL}/static/js/9.c0ffee12.chunk.js": OTHER_SCRIPT_SOURCE,
+    }
+
+    def get(url, headers, timeout):
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.text = sources[url]
+        mock_response.content = sources[url].encode()
+
+        return mock_response
+
+    return get
+
+
+def async_site(bundle_hash="5ad51bd6", main_script_source=MAIN_SCRIPT_SOURCE):
+    get = site(bundle_hash, main_script_source)
+
+    async def get_source(extractor, url):
+        return get(url, None, None).text
+
+    return get_source
+
+
+def async_stream(streamed_urls, bundle_hash="5ad51bd6"):
+    get = site(bundle_hash)
+
+    async def stream_source(extractor, url):
+        streamed_urls.append(url)
+        source = get(url, None, None).text
+
+        # Splits the source so signatures can end up in different pieces.
+        for i in range(0, len(source), 40):
+            yield source[i : i + 40]
+
+    return stream_source
+
+
+class FakeSession:
+    """Answers the requests of aiohttp sessions with the sources of the site."""
+
+    def __init__(self):
+        self.get_source = site()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    def get(self, url, headers):
+        return FakeResponse(self.get_source(url, headers, None).content)
+
+
+class FakeResponse:
+    status = 200
+    charset = "utf-8"
+
+    def __init__(self, body):
+        self.body = body
+        self.content = self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    async def iter_chunked(self, size):
+        for i in range(0, len(self.body), size):
+            yield self.body[i : i + size]
+
+
+class TestExtractors(unittest.TestCase):
+    @patch("loading_sdk.sync_api.extractors.requests")
+    def test_get_socials(self, mock_requests):
+        mock_requests.get.side_effect = site()
+
+        api = LoadingApiClient()
+        response = api.get_socials()
+
+        self.assertEqual(response.get("code"), 200)
+        self.assertEqual(response.get("data"), SOCIALS)
+
+    @patch("loading_sdk.sync_api.extractors.requests")
+    def test_get_about(self, mock_requests):
+        mock_requests.get.side_effect = site()
+
+        api = LoadingApiClient()
+        response = api.get_about()
+
+        self.assertEqual(response.get("code"), 200)
+        self.assertEqual(response.get("data"), ABOUT)
+
+    @patch("loading_sdk.sync_api.extractors.requests")
+    def test_requests_are_traced(self, mock_requests):
+        mock_requests.get.side_effect = site()
+        hooks = Hooks()
+        metrics = Metrics(hooks)
+
+        LoadingApiClient(hooks=hooks).get_about()
+
+        urls = [call.args[0] for call in mock_requests.get.call_args_list]
+        sizes = [len(site()(url, None, None).content) for url in urls]
+        about = metrics.snapshot()["get_about"]
+
+        self.assertEqual(about["calls"], 1)
+        self.assertEqual(about["requests"], len(urls))
+        self.assertEqual(about["response_bytes"], sum(sizes))
+        self.assertEqual(about["in_flight"], 0)
+
+    @patch("loading_sdk.sync_api.extractors.requests")
+    def test_get_site_metadata(self, mock_requests):
+        mock_requests.get.side_effect = site()
+
+        api = LoadingApiClient()
+        response = api.get_site_metadata()
+
+        # The html page, the main bundle and the about chunk.
+        self.assertEqual(mock_requests.get.call_count, 3)
+        self.assertEqual(response.get("code"), 200)
+        self.assertEqual(response.get("data"), {"about": ABOUT, "socials": SOCIALS})
+
+    @patch("loading_sdk.sync_api.extractors.requests")
+    def test_results_are_cached_by_bundle_hash(self, mock_requests):
+        mock_requests.get.side_effect = site()
+
+        api = LoadingApiClient(extractor_cache=ExtractorCache())
+        api.get_socials()
+        response = api.get_socials()
+
+        # The second call only fetches the html page.
+        self.assertEqual(mock_requests.get.call_count, 3)
+        self.assertEqual(response.get("data"), SOCIALS)
+
+        mock_requests.get.side_effect = site("b2d7c0ff")
+        api.get_socials()
+
+        self.assertEqual(mock_requests.get.call_count, 5)
+
+    @patch("loading_sdk.sync_api.extractors.requests")
+    def test_results_are_cached_on_disk(self, mock_requests):
+        mock_requests.get.side_effect = site()
+
+        with tempfile.TemporaryDirectory() as directory:
+            LoadingApiClient(extractor_cache=ExtractorCache(directory)).get_socials()
+            api = LoadingApiClient(extractor_cache=ExtractorCache(directory))
+            response = api.get_socials()
+
+        self.assertEqual(mock_requests.get.call_count, 3)
+        self.assertEqual(response.get("data"), SOCIALS)
+
+    @patch("loading_sdk.sync_api.extractors.requests")
+    def test_max_age_skips_revalidation(self, mock_requests):
+        mock_requests.get.side_effect = site()
+
+        api = LoadingApiClient(extractor_cache=ExtractorCache(max_age=60))
+        api.get_socials()
+        api.get_socials()
+
+        self.assertEqual(mock_requests.get.call_count, 2)
+
+
+class TestAsyncExtractors(unittest.IsolatedAsyncioTestCase):
+    async def test_get_site_metadata(self):
+        with patch.object(Extractor, "get_source", async_site()), patch.object(
+            Extractor, "stream_source", async_stream([])
+        ):
+            api = await AsyncLoadingApiClient()
+            response = await api.get_site_metadata()
+
+        self.assertEqual(response.get("code"), 200)
+        self.assertEqual(response.get("data"), {"about": ABOUT, "socials": SOCIALS})
+
+    async def test_requests_are_traced(self):
+        hooks = Hooks()
+        metrics = Metrics(hooks)
+
+        with patch(
+            "loading_sdk.async_api.extractors.aiohttp.ClientSession", FakeSession
+        ):
+            api = await AsyncLoadingApiClient(hooks=hooks)
+            response = await api.get_about()
+
+        about = metrics.snapshot()["get_about"]
+
+        self.assertEqual(response.get("data"), ABOUT)
+        self.assertGreaterEqual(about["requests"], 3)
+        self.assertGreater(about["response_bytes"], 0)
+        self.assertEqual(about["in_flight"], 0)
+
+    async def test_about_chunk_is_found_by_content(self):
+        streamed_urls = []
+        cache = ExtractorCache()
+
+        with patch.object(
+            Extractor,
+            "get_source",
+            async_site(main_script_source=SPLIT_MAIN_SCRIPT_SOURCE),
+        ), patch.object(Extractor, "stream_source", async_stream(streamed_urls)):
+            api = await AsyncLoadingApiClient(extractor_cache=cache)
+            response = await api.get_about()
+
+        self.assertEqual(response.get("data"), ABOUT)
+        self.assertIn(f"{BASE_URL}/static/js/9.c0ffee12.chunk.js", streamed_urls)
+        self.assertEqual(cache.get_chunk_id("about"), "7")
+
+        # A new bundle only downloads the chunk that had the data last time.
+        streamed_urls.clear()
+
+        with patch.object(
+            Extractor,
+            "get_source",
+            async_site("b2d7c0ff", main_script_source=SPLIT_MAIN_SCRIPT_SOURCE),
+        ), patch.object(Extractor, "stream_source", async_stream(streamed_urls)):
+            response = await api.get_about()
+
+        self.assertEqual(response.get("data"), ABOUT)
+        self.assertEqual(streamed_urls, [f"{BASE_URL}/static/js/7.8a1d2c3b.chunk.js"])
+
+    async def test_parsing_runs_in_executor(self):
+        with patch.object(Extractor, "get_source", async_site()), patch.object(
+            Extractor, "stream_source", async_stream([])
+        ), ProcessPoolExecutor(max_workers=1) as executor:
+            api = await AsyncLoadingApiClient(executor=executor)
+            response = await api.get_site_metadata()
+
+        self.assertEqual(response.get("data"), {"about": ABOUT, "socials": SOCIALS})
+
+    async def test_get_source_joins_streamed_pieces(self):
+        with patch.object(Extractor, "stream_source", async_stream([])):
+            source = await AboutExtractor().get_source(f"{BASE_URL}/om")
+
+        self.assertEqual(source, PAGE_SOURCE.format("5ad51bd6"))
+
+    async def test_chunk_id_is_stored_on_disk(self):
+        with tempfile.TemporaryDirectory() as directory:
+            ExtractorCache(directory).set_chunk_id("about", "5ad51bd6", "7")
+
+            self.assertEqual(ExtractorCache(directory).get_chunk_id("about"), "7")
+            self.assertIsNone(ExtractorCache(directory).get_chunk_id("socials"))
@@ -0,0 +1,59 @@
+import subprocess
+import sys
+import unittest
+
+# Importing the package only defines the lazy attributes, which takes well under a
+# millisecond. Importing requests or aiohttp takes around a hundred.
+MAX_IMPORT_TIME_US = 50000
+
+
+def imported_modules(code):
+    """Runs code in a new interpreter and returns the modules that it imported."""
+
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = {}
+
+    # Lines look like "import time:   self [us] | cumulative | module".
+    for line in output.stderr.splitlines()[1:]:
+        _, cumulative, module = line.split("|")
+        modules[module.strip()] = int(cumulative)
+
+    return modules
+
+
+class TestImports(unittest.TestCase):
+    def test_import_doesnt_import_clients(self):
+        modules = imported_modules("import loading_sdk")
+
+        self.assertIn("loading_sdk", modules)
+        self.assertNotIn("requests", modules)
+        self.assertNotIn("aiohttp", modules)
+        self.assertLess(modules["loading_sdk"], MAX_IMPORT_TIME_US)
+
+    def test_sync_client_doesnt_import_aiohttp_or_bs4(self):
+        modules = imported_modules(
+            "from loading_sdk import LoadingApiClient\nLoadingApiClient()"
+        )
+
+        self.assertIn("loading_sdk.sync_api.client", modules)
+        self.assertNotIn("aiohttp", modules)
+        self.assertNotIn("bs4", modules)
+
+    def test_async_client_is_imported_on_first_use(self):
+        modules = imported_modules("from loading_sdk import AsyncLoadingApiClient")
+
+        self.assertIn("aiohttp", modules)
+        self.assertNotIn("requests", modules)
+
+    def test_unknown_attribute(self):
+        import loading_sdk
+
+        with self.assertRaises(AttributeError):
+            loading_sdk.LoadingClient
+
+        self.assertIn("AsyncLoadingApiClient", dir(loading_sdk))
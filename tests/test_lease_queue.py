@@ -0,0 +1,104 @@
+import os
+import tempfile
+import time
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+from loading_sdk import LoadingApiClient
+from loading_sdk.crawler import crawl_queue, seed_queue
+from loading_sdk.lease_queue import LeaseQueue
+from loading_sdk.sync_api.transport import FakeTransport
+from tests.helpers import CATEGORY_PAGES, THREADS_PER_PAGE, forum
+
+
+def drain(path):
+    claimed = []
+
+    with LeaseQueue(path) as queue:
+        while True:
+            items = queue.claim(3)
+
+            if not items:
+                return claimed
+
+            for item in items:
+                claimed.append(item)
+                queue.complete(item)
+
+
+class TestLeaseQueue(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "queue.db")
+
+    def test_claim_and_complete(self):
+        with LeaseQueue(self.path, owner="a") as a, LeaseQueue(
+            self.path, owner="b"
+        ) as b:
+            a.put([("thread", "1", 1), ("thread", "1", 2)])
+
+            self.assertEqual(a.claim(), [("thread", "1", 1)])
+            self.assertEqual(b.claim(5), [("thread", "1", 2)])
+            self.assertEqual(b.claim(), [])
+
+            a.complete(("thread", "1", 1))
+            b.release(("thread", "1", 2))
+            a.put([("thread", "1", 1)])
+
+            self.assertEqual(a.claim(5), [("thread", "1", 2)])
+            self.assertEqual(a.stats(), {"pending": 0, "leased": 1, "done": 1})
+
+    def test_expired_lease(self):
+        with LeaseQueue(self.path, lease_time=0.05, owner="a") as a, LeaseQueue(
+            self.path, owner="b"
+        ) as b:
+            a.put(["item"])
+
+            self.assertEqual(a.claim(), ["item"])
+
+            a.heartbeat()
+
+            self.assertEqual(b.claim(), [])
+
+            time.sleep(0.1)
+
+            self.assertEqual(b.claim(), ["item"])
+            self.assertEqual(a.heartbeat(), 0)
+
+    def test_processes_claim_disjoint_items(self):
+        items = [("category", "games", page) for page in range(200)]
+
+        with LeaseQueue(self.path) as queue:
+            queue.put(items)
+
+        with ProcessPoolExecutor(max_workers=4) as executor:
+            claimed = [
+                item
+                for result in executor.map(drain, [self.path] * 4)
+                for item in result
+            ]
+
+        self.assertEqual(len(claimed), len(items))
+        self.assertEqual(set(claimed), set(items))
+
+    def test_crawl_queue(self):
+        client = LoadingApiClient(transport=FakeTransport(forum))
+
+        with LeaseQueue(self.path) as queue:
+            seed_queue(queue, client, ["games"])
+            fetched = crawl_queue(queue, client)
+
+            self.assertEqual(queue.stats()["done"], fetched)
+            self.assertEqual(crawl_queue(queue, client), 0)
+
+        thread_requests = [
+            request.key
+            for request in client._transport.requests
+            if request.key[0] == "thread"
+        ]
+
+        # Every page is fetched once.
+        self.assertEqual(len(thread_requests), fetched - CATEGORY_PAGES)
+        self.assertEqual(len(set(thread_requests)), len(thread_requests))
+        self.assertGreater(len(thread_requests), CATEGORY_PAGES * THREADS_PER_PAGE)
@@ -0,0 +1,81 @@
+import unittest
+import urllib.request
+
+from loading_sdk import LoadingApiClient
+from loading_sdk.cache import ResponseCache
+from loading_sdk.events import Hooks
+from loading_sdk.metrics import Histogram, Metrics, RollingHistogram
+from loading_sdk.sync_api.transport import FakeTransport
+from tests.helpers import thread
+
+
+class TestHistogram(unittest.TestCase):
+    def test_percentiles(self):
+        histogram = Histogram()
+
+        for millisecond in range(1, 1001):
+            histogram.record(millisecond / 1000)
+
+        for quantile in (0.5, 0.9, 0.99):
+            self.assertAlmostEqual(
+                histogram.percentile(quantile), quantile, delta=quantile / 100
+            )
+
+        self.assertEqual(histogram.percentile(1), 1)
+        self.assertIsNone(Histogram().percentile(0.5))
+
+    def test_rolling_window(self):
+        histogram = RollingHistogram(window=60, slices=6)
+
+        histogram.record(5, now=0)
+        histogram.record(1, now=30)
+
+        self.assertEqual(histogram.snapshot(now=30).percentile(1), 5)
+        self.assertEqual(histogram.snapshot(now=65).percentile(1), 1)
+        self.assertEqual(histogram.snapshot(now=95).count, 0)
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        hooks = Hooks()
+        self.metrics = Metrics(hooks)
+        self.api = LoadingApiClient(
+            transport=FakeTransport(thread), cache=ResponseCache(), hooks=hooks
+        )
+
+    def test_snapshot(self):
+        for _ in range(4):
+            self.api.get_post("1")
+
+        with self.assertRaises(ConnectionError):
+            self.api.get_post("missing")
+
+        metrics = self.metrics.snapshot()["get_post"]
+
+        self.assertEqual(metrics["calls"], 5)
+        self.assertEqual(metrics["requests"], 2)
+        self.assertEqual(metrics["errors"], 1)
+        self.assertEqual(metrics["cache_hits"], 3)
+        self.assertEqual(metrics["cache_hit_ratio"], 0.6)
+        self.assertEqual(metrics["in_flight"], 0)
+        self.assertGreater(metrics["response_bytes"], 0)
+        self.assertLessEqual(metrics["p50"], metrics["p99"])
+
+    def test_prometheus(self):
+        self.api.get_thread("1")
+        server = self.metrics.serve(port=0)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+
+        with urllib.request.urlopen(url) as response:
+            text = response.read().decode()
+
+        self.assertEqual(text, self.metrics.prometheus_text())
+        self.assertIn("# TYPE loading_sdk_call_duration_seconds summary", text)
+        self.assertIn(
+            'loading_sdk_call_duration_seconds_count{method="get_thread"} 1', text
+        )
+        self.assertIn('loading_sdk_requests_total{method="get_thread"} 1', text)
+        self.assertIn('loading_sdk_in_flight{method="get_thread"} 0', text)
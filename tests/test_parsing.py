@@ -0,0 +1,122 @@
+import re
+import subprocess
+import sys
+import time
+import unittest
+
+from loading_sdk.parsing import (
+    _find_main_script_with_soup,
+    find_main_script,
+    iter_js_literals,
+    parse_js_literal,
+)
+
+PAGE_SOURCE = """<!doctype html><html lang="sv"><head><title>Loading</title>
+<link href="/static/css/main.0b9f4a57.css" rel="stylesheet">
+<script defer="defer" src="/static/js/main.5ad51bd6.js"></script></head>
+<body><script src="/static/js/main.ffffffff.js"></script></body></html>"""
+
+
+class TestParsing(unittest.TestCase):
+    def test_find_main_script(self):
+        self.assertEqual(find_main_script(PAGE_SOURCE), "static/js/main.5ad51bd6.js")
+        self.assertEqual(
+            find_main_script("<SCRIPT SRC='/static/js/main.abc.js'></SCRIPT>"),
+            "static/js/main.abc.js",
+        )
+        self.assertIsNone(find_main_script("<html></html>"))
+
+    def test_soup_fallback_finds_the_same_script(self):
+        self.assertEqual(
+            _find_main_script_with_soup(PAGE_SOURCE), find_main_script(PAGE_SOURCE)
+        )
+
+    def test_bs4_is_not_imported(self):
+        code = (
+            "import sys\n"
+            "from loading_sdk.parsing import find_main_script\n"
+            "find_main_script('<script src=\"/static/js/main.abc.js\">')\n"
+            "print('bs4' in sys.modules)\n"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+
+        self.assertEqual(output.stdout.strip(), "False")
+
+
+class TestJavascriptLiterals(unittest.TestCase):
+    def test_parse_js_literal(self):
+        source = (
+            '[{name:\'It\\\'s "vuxen"\',"title":"Chefredakt\\u00f6r\\nLoading",'
+            "emoji:'\\ud83c\\udfae',count:-1.5e2,hex:0x1F,online:!0,admin:!1,"
+            "image:null,other:undefined,1:`text`},[1,,2]]"
+        )
+
+        value, end = parse_js_literal(source)
+
+        self.assertEqual(end, len(source))
+        self.assertEqual(
+            value,
+            [
+                {
+                    "name": 'It\'s "vuxen"',
+                    "title": "Chefredaktör\nLoading",
+                    "emoji": "\U0001f3ae",
+                    "count": -150.0,
+                    "hex": 31,
+                    "online": True,
+                    "admin": False,
+                    "image": None,
+                    "other": None,
+                    "1": "text",
+                },
+                [1, None, 2],
+            ],
+        )
+
+    def test_expressions_are_skipped(self):
+        source = '{a:Object(r.jsx)("a",{b:[1,"}"]}),c:`${d}`,e:f?1:2,g:"h"};'
+
+        value, end = parse_js_literal(source)
+
+        self.assertEqual(value, {"a": None, "c": None, "e": None, "g": "h"})
+        self.assertEqual(source[end:], ";")
+
+    def test_invalid_literal(self):
+        for source in ("[1,2", "{a 1}", "{'a:1}", "[1 2]"):
+            with self.assertRaises(ValueError):
+                parse_js_literal(source)
+
+    def test_iter_js_literals(self):
+        source = "var e=[{a:1}].map(x),b=[2,[3]],c=[oops,a=[4]"
+        pattern = re.compile(r"[a-z]=\[")
+
+        literals = [
+            (match.group()[0], value)
+            for match, value, _ in iter_js_literals(source, pattern)
+        ]
+
+        self.assertEqual(literals, [("e", [{"a": 1}]), ("b", [2, [3]]), ("a", [4])])
+
+    def test_deeply_nested_literal(self):
+        source = "a=" + "[" * 100000 + "]" * 100000 + ",b=[1]"
+
+        with self.assertRaises(ValueError):
+            parse_js_literal(source, 2)
+
+        literals = [
+            value for _, value, _ in iter_js_literals(source, re.compile(r"=\["))
+        ]
+
+        self.assertEqual(literals, [[1]])
+
+    def test_parse_time_is_linear(self):
+        def parse_time(count):
+            source = "[" + ",".join(["{name:'a\\'b',list:[1,2,!0]}"] * count) + "]"
+            start = time.perf_counter()
+            parse_js_literal(source)
+
+            return time.perf_counter() - start
+
+        self.assertLess(parse_time(40000), parse_time(4000) * 40)
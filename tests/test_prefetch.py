@@ -0,0 +1,69 @@
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from loading_sdk.async_api import PrefetchPolicy
+from loading_sdk.async_api.client import AsyncLoadingApiClient
+
+
+def thread_page(replies):
+    data = {
+        "posts": [
+            {
+                "id": "5f9e4e8c2c32e2001ed17170",
+                "title": "Spelmusik samplad i låtar",
+                "category": "other",
+                "postType": "regular",
+                "replies": replies,
+            }
+        ],
+        "users": [],
+    }
+
+    return 200, data, 100
+
+
+class TestPrefetchPolicy(unittest.IsolatedAsyncioTestCase):
+    @patch.object(AsyncLoadingApiClient, "_fetch_thread_page", new_callable=AsyncMock)
+    async def test_next_page_is_served_from_cache(self, mock_fetch):
+        mock_fetch.return_value = thread_page(replies=65)
+        policy = PrefetchPolicy()
+        api = AsyncLoadingApiClient(prefetch=policy)
+        self.addAsyncCleanup(api.close)
+
+        response = await api.get_thread("5f9e4e8c2c32e2001ed17170", page=1)
+        await api._prefetch.wait_for(("thread", "5f9e4e8c2c32e2001ed17170", 2))
+
+        self.assertEqual(response.get("code"), 200)
+        mock_fetch.assert_awaited_with("5f9e4e8c2c32e2001ed17170", 2)
+
+        response = await api.get_thread("5f9e4e8c2c32e2001ed17170", page=2)
+
+        self.assertEqual(response.get("message"), "OK")
+        self.assertEqual(policy.stats()["hits"], 1)
+        self.assertEqual(policy.stats()["hit_rate"], 1.0)
+
+    @patch.object(AsyncLoadingApiClient, "_fetch_thread_page", new_callable=AsyncMock)
+    async def test_last_page_is_not_prefetched(self, mock_fetch):
+        mock_fetch.return_value = thread_page(replies=10)
+        policy = PrefetchPolicy()
+        api = AsyncLoadingApiClient(prefetch=policy)
+        self.addAsyncCleanup(api.close)
+
+        await api.get_thread("5f9e4e8c2c32e2001ed17170")
+
+        self.assertEqual(mock_fetch.await_count, 1)
+        self.assertEqual(policy.stats()["issued"], 0)
+
+    @patch.object(AsyncLoadingApiClient, "_fetch_thread_page", new_callable=AsyncMock)
+    async def test_prefetch_is_skipped_over_size_limit(self, mock_fetch):
+        mock_fetch.return_value = thread_page(replies=300)
+        policy = PrefetchPolicy(max_size=100)
+        api = AsyncLoadingApiClient(prefetch=policy)
+        self.addAsyncCleanup(api.close)
+
+        await api.get_thread("5f9e4e8c2c32e2001ed17170", page=1)
+        await api._prefetch.wait_for(("thread", "5f9e4e8c2c32e2001ed17170", 2))
+        await api.get_thread("5f9e4e8c2c32e2001ed17170", page=5)
+
+        self.assertEqual(policy.stats()["issued"], 1)
+        self.assertEqual(policy.stats()["skipped"], 1)
@@ -0,0 +1,85 @@
+import unittest
+
+from loading_sdk import protocol
+from loading_sdk.settings import API_URL, USER_AGENT
+
+
+def thread_page(replies=65, title="Thread"):
+    return {
+        "posts": [
+            {"id": "2", "parentId": "1"},
+            {"id": "1", "title": title, "replies": replies},
+        ],
+        "users": [],
+    }
+
+
+class TestProtocol(unittest.TestCase):
+    def test_requests(self):
+        request = protocol.thread_page("5f9e4e8c2c32e2001ed17170", 3)
+
+        self.assertEqual(request.method, "get")
+        self.assertEqual(request.url, f"{API_URL}/v1/posts/5f9e4e8c2c32e2001ed17170")
+        self.assertEqual(request.headers, {"User-Agent": USER_AGENT, "page": "3"})
+        self.assertEqual(request.key, ("thread", "5f9e4e8c2c32e2001ed17170", 3))
+        self.assertFalse(request.authenticated)
+
+        request = protocol.editorials_page(post_type="review", sort="date")
+
+        self.assertEqual(
+            request.headers,
+            {"User-Agent": USER_AGENT, "texts": "texts", "post-type": "review"},
+        )
+        self.assertEqual(request.key, ("editorials", "review", None, 1))
+        self.assertEqual(protocol.listing_page("texts", 1), protocol.editorials_page())
+
+        request = protocol.edit_post("1", "message")
+
+        self.assertEqual(request.method, "patch")
+        self.assertEqual(request.data, {"body": "message"})
+        self.assertTrue(request.authenticated)
+
+    def test_headers_are_built_once(self):
+        self.assertIs(
+            protocol.category_page("games", 2).headers,
+            protocol.category_page("games", 2).headers,
+        )
+        self.assertIs(
+            protocol.thread_page("1").headers, protocol.thread_page("2", 1).headers
+        )
+
+    def test_thread_response(self):
+        data = thread_page()
+
+        self.assertEqual(protocol.thread_response(200, data, 3)["message"], "OK")
+        self.assertEqual(
+            protocol.thread_response(200, data, 4)["message"], "Page number too high"
+        )
+        self.assertEqual(
+            protocol.thread_response(200, data, -1)["message"], "Page number too low"
+        )
+        self.assertEqual(
+            protocol.thread_response(200, thread_page(title=None), None)["message"],
+            "OK",
+        )
+        self.assertEqual(protocol.thread_pages(thread_page(replies=0)), 1)
+
+        error = {"code": 404, "message": "Post does not exist"}
+
+        self.assertIs(protocol.thread_response(404, error), error)
+
+    def test_data_response(self):
+        self.assertEqual(
+            protocol.data_response(201, {"id": "1"}, 201, "Post created"),
+            {"code": 201, "message": "Post created", "data": {"id": "1"}},
+        )
+        self.assertEqual(
+            protocol.data_response(401, {"code": 401}, 201, "Post created"),
+            {"code": 401},
+        )
+
+    def test_response(self):
+        response = protocol.Response(200, b'{"posts": []}', None)
+
+        self.assertEqual(response.json(), {"posts": []})
+        self.assertEqual(response.size, 13)
@@ -0,0 +1,116 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timezone
+
+from loading_sdk.query import PostIndex
+from loading_sdk.store import SQLiteStore
+
+POSTS = [
+    {
+        "id": "thread_games",
+        "title": "B-spel",
+        "category": "games",
+        "postType": "regular",
+        "userId": "user_1",
+        "createdAt": "2022-05-01T10:00:00.000Z",
+        "replies": 2,
+    },
+    {
+        "id": "thread_other",
+        "title": "A-film",
+        "category": "other",
+        "postType": "regular",
+        "userId": "user_2",
+        "createdAt": "2022-05-02T10:00:00.000Z",
+        "replies": 7,
+    },
+    {
+        "id": "reply_1",
+        "parentId": "thread_games",
+        "postType": "regular",
+        "userId": "user_2",
+        "createdAt": "2022-05-03T10:00:00.000Z",
+    },
+    {
+        "id": "reply_2",
+        "parentId": "thread_games",
+        "postType": "regular",
+        "userId": "user_1",
+        "createdAt": "2022-05-10T10:00:00.000Z",
+    },
+    {
+        "id": "review",
+        "title": "Recension",
+        "category": "texts",
+        "postType": "review",
+        "userId": "user_1",
+        "createdAt": "2022-05-11T10:00:00.000Z",
+        "replies": 0,
+    },
+]
+USERS = [{"id": "user_1", "name": "Twiggy"}, {"id": "user_2", "name": "Wirus"}]
+
+
+class TestPostIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = PostIndex(POSTS, USERS)
+
+    def ids(self, response):
+        return [post["id"] for post in response["data"]["posts"]]
+
+    def test_filter_by_user_and_category(self):
+        response = self.index.query(user_id="user_1", category="games")
+
+        self.assertEqual(response.get("code"), 200)
+        self.assertEqual(response.get("message"), "OK")
+        self.assertEqual(self.ids(response), ["reply_2", "thread_games"])
+        self.assertEqual(response["data"]["users"], [USERS[0]])
+
+    def test_filter_by_date_range(self):
+        response = self.index.query(
+            since="2022-05-02T00:00:00.000Z",
+            until=datetime(2022, 5, 10, 10, tzinfo=timezone.utc),
+        )
+
+        self.assertEqual(self.ids(response), ["reply_1", "thread_other"])
+
+    def test_filter_by_post_type_and_thread(self):
+        self.assertEqual(self.ids(self.index.query(post_type="review")), ["review"])
+        self.assertEqual(
+            self.ids(self.index.query(thread_id="thread_games")),
+            ["reply_2", "reply_1"],
+        )
+
+    def test_sort_and_paginate(self):
+        response = self.index.query(sort="replies", per_page=2)
+
+        self.assertEqual(self.ids(response), ["thread_other", "thread_games"])
+
+        response = self.index.query(sort="title", per_page=2, page=2)
+
+        self.assertEqual(self.ids(response)[0], "review")
+
+    def test_page_out_of_range(self):
+        self.assertEqual(self.index.query(page=0).get("message"), "OK")
+        self.assertEqual(
+            self.index.query(page=-1).get("message"), "Page number too low"
+        )
+        self.assertEqual(
+            self.index.query(page=2).get("message"), "Page number too high"
+        )
+
+    def test_no_results(self):
+        response = self.index.query(user_id="user_3")
+
+        self.assertEqual(response.get("message"), "No results")
+        self.assertEqual(response.get("data"), {"posts": [], "users": []})
+
+    def test_from_store(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with SQLiteStore(os.path.join(directory, "loading.db")) as store:
+                store.add(POSTS, USERS)
+                index = PostIndex.from_store(store)
+
+        self.assertEqual(len(index), len(POSTS))
+        self.assertEqual(len(index.query(category="games")["data"]["posts"]), 3)
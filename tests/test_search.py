@@ -0,0 +1,109 @@
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+from loading_sdk import LoadingApiClient
+from loading_sdk.cache import SearchCache
+from loading_sdk.search import normalize_query
+from loading_sdk.search_index import SearchIndex
+from loading_sdk.sync_api.transport import FakeTransport
+
+RESULTS = {
+    "zelda": {
+        "posts": [{"id": "1", "body": "Zelda", "userId": "user_1"}],
+        "users": [{"id": "user_1", "name": "Twiggy"}],
+    },
+    "mario": {
+        "posts": [
+            {"id": "1", "body": "Zelda", "userId": "user_1"},
+            {"id": "2", "body": "Mario", "userId": "user_1"},
+        ],
+        "users": [{"id": "user_1", "name": "Twiggy"}],
+    },
+}
+
+
+def search_response(url, headers, data, timeout):
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = RESULTS.get(
+        data["query"], {"posts": [], "users": []}
+    )
+
+    return mock_response
+
+
+class TestSearch(unittest.TestCase):
+    def test_normalize_query(self):
+        self.assertEqual(normalize_query("  Super   MARIO\tBros "), "super mario bros")
+
+    @patch("loading_sdk.sync_api.client.requests")
+    def test_search_results_are_cached(self, mock_requests):
+        mock_requests.post.side_effect = search_response
+
+        api = LoadingApiClient(search_cache=SearchCache())
+        first_response = api.search("Zelda")
+        second_response = api.search("  zelda ")
+
+        self.assertEqual(mock_requests.post.call_count, 1)
+        self.assertEqual(mock_requests.post.call_args[1]["data"], {"query": "zelda"})
+        self.assertEqual(first_response, second_response)
+        self.assertEqual(second_response.get("message"), "OK")
+
+    @patch("loading_sdk.cache.time")
+    def test_searches_without_results_expire_sooner(self, mock_time):
+        mock_time.monotonic.return_value = 0
+        cache = SearchCache(ttl=30, negative_ttl=5)
+        cache.set("zelda", RESULTS["zelda"])
+        cache.set("metroid", {"posts": [], "users": []})
+
+        mock_time.monotonic.return_value = 10
+
+        self.assertIn("zelda", cache)
+        self.assertNotIn("metroid", cache)
+
+    @patch("loading_sdk.sync_api.client.requests")
+    def test_search_many(self, mock_requests):
+        mock_requests.post.side_effect = search_response
+
+        api = LoadingApiClient()
+        response = api.search_many(["Zelda", "zelda", "Mario", "Metroid"])
+        data = response.get("data")
+
+        self.assertEqual(mock_requests.post.call_count, 3)
+        self.assertEqual(response.get("message"), "OK")
+        self.assertEqual([post["id"] for post in data["posts"]], ["1", "2"])
+        self.assertEqual(len(data["users"]), 1)
+        self.assertEqual(data["results"]["Zelda"], data["results"]["zelda"])
+        self.assertEqual(data["results"]["Metroid"].get("message"), "No results")
+
+    def test_concurrent_search_many_with_index(self):
+        def handler(request):
+            query = request.data["query"]
+            posts = [
+                {"id": f"{query}-{i}", "body": f"spel {query}", "userId": "user_1"}
+                for i in range(10)
+            ]
+
+            return 200, {"posts": posts, "users": [{"id": "user_1"}]}
+
+        index = SearchIndex()
+        api = LoadingApiClient(
+            transport=FakeTransport(handler),
+            search_index=index,
+            search_cache=SearchCache(),
+        )
+        queries = [f"query{i}" for i in range(200)]
+
+        # Switches threads often, so unlocked updates of the index interleave.
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        self.addCleanup(sys.setswitchinterval, interval)
+
+        response = api.search_many(queries, concurrency=16)
+
+        self.assertEqual(len(response["data"]["posts"]), 2000)
+        self.assertEqual(len(index), 2000)
+        self.assertEqual(
+            len(api.search_local("spel", limit=3000)["data"]["posts"]), 2000
+        )
@@ -0,0 +1,83 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from loading_sdk import LoadingApiClient
+from loading_sdk.search_index import SearchIndex, tokenize
+
+POSTS = [
+    {
+        "id": "1",
+        "title": "Spelmusik samplad i låtar",
+        "body": "Har ni upptäckt några samples från spelmusik?",
+        "userId": "user_1",
+    },
+    {
+        "id": "2",
+        "body": "Castlevania har den bästa musiken av alla spelen.",
+        "userId": "user_2",
+    },
+    {
+        "id": "3",
+        "body": "Jag spelar mest Pokémon just nu.",
+        "userId": "user_1",
+    },
+]
+USERS = [{"id": "user_1", "name": "Twiggy"}, {"id": "user_2", "name": "Wirus"}]
+
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = SearchIndex()
+        self.index.add(POSTS, USERS)
+
+    def ids(self, response):
+        return [post["id"] for post in response["data"]["posts"]]
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize("Spelen och SPELET"), ["spel", "spel"])
+        self.assertEqual(tokenize("Pokémon"), ["pokémon"])
+
+    def test_search_ranks_matching_posts(self):
+        response = self.index.search("spelmusik")
+
+        self.assertEqual(response.get("code"), 200)
+        self.assertEqual(response.get("message"), "OK")
+        self.assertEqual(self.ids(response), ["1"])
+        self.assertEqual(response["data"]["users"], [USERS[0]])
+
+    def test_search_limit(self):
+        self.assertEqual(len(self.ids(self.index.search("spelen", limit=1))), 1)
+
+    def test_search_no_results(self):
+        response = self.index.search("zGwszApFEcYesf")
+
+        self.assertEqual(response.get("message"), "No results")
+        self.assertEqual(response.get("data"), {"posts": [], "users": []})
+
+    def test_added_posts_replace_earlier_versions(self):
+        self.index.add([dict(POSTS[0], body="Nu handlar det om Zelda")])
+
+        self.assertEqual(len(self.index), 3)
+        self.assertEqual(self.ids(self.index.search("upptäckt")), [])
+        self.assertEqual(self.ids(self.index.search("zelda")), ["1"])
+
+        self.index.compact()
+
+        self.assertEqual(self.ids(self.index.search("zelda")), ["1"])
+        self.assertEqual(self.ids(self.index.search("castlevania")), ["2"])
+
+    @patch("loading_sdk.sync_api.client.requests")
+    def test_client_indexes_fetched_posts(self, mock_requests):
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"posts": POSTS[1:2], "users": USERS}
+        mock_requests.get.return_value = mock_response
+
+        api = LoadingApiClient(search_index=SearchIndex())
+        api.get_post("2")
+        response = api.search_local("castlevania")
+
+        self.assertEqual(self.ids(response), ["2"])
+        self.assertEqual(
+            LoadingApiClient().search_local("castlevania").get("code"), 400
+        )
@@ -0,0 +1,118 @@
+import http.cookies
+import os
+import pickle
+import stat
+import tempfile
+import unittest
+
+import requests
+from loading_sdk import AsyncLoadingApiClient, LoadingApiClient
+from loading_sdk.cache import ExtractorCache, ResponseCache
+from loading_sdk.state import export_state
+from loading_sdk.store import SQLiteStore
+from loading_sdk.sync_api.transport import FakeTransport
+from tests.helpers import AsyncTransport, Server, Transport
+
+
+def unauthorized(request):
+    del request
+    return 401, {"code": 401, "message": "Unauthorized"}
+
+
+class TestClientState(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def test_export_and_restore(self):
+        cookies = requests.cookies.RequestsCookieJar()
+        cookies.set("jwt", "token")
+        cookies.set("refreshToken", "refresh")
+        api = LoadingApiClient(
+            cache=ResponseCache(ttl=30, max_entries=10),
+            extractor_cache=ExtractorCache(self.directory, max_age=60),
+            thread_safe=True,
+        )
+        api._cookies = cookies
+
+        state = pickle.loads(pickle.dumps(api.export_state()))
+        transport = FakeTransport(unauthorized)
+        restored = LoadingApiClient.from_state(state, transport=transport)
+
+        self.assertEqual(restored._cookies, {"jwt": "token", "refreshToken": "refresh"})
+        self.assertEqual(restored._cache.ttl, 30)
+        self.assertEqual(restored._cache.max_entries, 10)
+        self.assertEqual(restored._extractor_cache.path, self.directory)
+        self.assertIsNone(restored._search_cache)
+        self.assertTrue(restored._thread_safe)
+        self.assertIs(restored._transport, transport)
+        self.assertEqual(transport.requests, [])
+
+    def test_save_and_load(self):
+        path = os.path.join(self.directory, "state.json")
+        store_path = os.path.join(self.directory, "store.db")
+        api = LoadingApiClient(cache=SQLiteStore(store_path, ttl=10))
+        api._cookies = {"jwt": "token"}
+
+        api.save_state(path)
+        restored = LoadingApiClient.load_state(path)
+
+        self.assertEqual(stat.S_IMODE(os.stat(path).st_mode), 0o600)
+        self.assertEqual(restored._cookies, {"jwt": "token"})
+        self.assertIsInstance(restored._cache, SQLiteStore)
+        self.assertEqual(restored._cache.path, store_path)
+        self.assertEqual(restored._cache.ttl, 10)
+
+    def test_anonymous_state_with_credentials(self):
+        server = Server()
+        state = LoadingApiClient().export_state()
+        api = LoadingApiClient.from_state(
+            state,
+            email="test@email.com",
+            password="password",
+            transport=Transport(server),
+        )
+
+        self.assertEqual(api.get_profile()["code"], 200)
+        self.assertEqual(server.logins, 1)
+
+    def test_unsupported_state(self):
+        state = export_state(None, {})
+        state["version"] = 0
+
+        with self.assertRaises(ValueError):
+            LoadingApiClient.from_state(state)
+
+        with self.assertRaises(TypeError):
+            export_state(None, {"cache": object()})
+
+
+class TestAsyncClientState(unittest.IsolatedAsyncioTestCase):
+    async def test_restore(self):
+        cookies = http.cookies.SimpleCookie()
+        cookies["jwt"] = "token"
+        api = await AsyncLoadingApiClient(cache=ResponseCache(ttl=5))
+        api._cookies = cookies
+
+        restored = await AsyncLoadingApiClient(
+            "user@example.com", "password", state=api.export_state()
+        )
+        await api.close()
+        await restored.close()
+
+        self.assertEqual(restored._cookies, {"jwt": "token"})
+        self.assertEqual(restored._cache.ttl, 5)
+
+    async def test_anonymous_state_with_credentials(self):
+        server = Server()
+        api = await AsyncLoadingApiClient()
+        restored = await AsyncLoadingApiClient(
+            "test@email.com",
+            "password",
+            state=api.export_state(),
+            transport=AsyncTransport(server),
+        )
+
+        self.assertEqual((await restored.get_profile())["code"], 200)
+        self.assertEqual(server.logins, 1)
@@ -0,0 +1,142 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from loading_sdk import AsyncLoadingApiClient, LoadingApiClient
+from loading_sdk.async_api.transport import FakeTransport
+from loading_sdk.store import SQLiteStore
+
+THREAD_PAGE = {
+    "posts": [
+        {
+            "id": "609f78fe90c3d5001e889e33",
+            "body": "Fota! Fota! Fota allihop! POKEMON! ",
+            "postType": "regular",
+            "createdAt": "2021-05-15T07:32:14.156Z",
+            "parentId": "609e2783b7a187001e0c0440",
+            "userId": "5d5948e1455110001e3f4d8b",
+            "replies": 0,
+        },
+        {
+            "id": "609e2783b7a187001e0c0440",
+            "title": "Pokémon Snap",
+            "body": "Någon som spelar?",
+            "category": "games",
+            "postType": "regular",
+            "createdAt": "2021-05-14T07:32:14.156Z",
+            "userId": "5bb80ac88fef22001d902d69",
+            "replies": 1,
+        },
+    ],
+    "users": [
+        {"id": "5d5948e1455110001e3f4d8b", "name": "Wirus"},
+        {"id": "5bb80ac88fef22001d902d69", "name": "Twiggy"},
+    ],
+}
+
+
+class TestSQLiteStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "loading.db")
+        self.store = SQLiteStore(self.path)
+
+    def tearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+    def test_set_and_get(self):
+        key = ("thread", "609e2783b7a187001e0c0440", 1)
+        self.store.set(key, THREAD_PAGE)
+
+        self.assertIn(key, self.store)
+        self.assertEqual(self.store.get(key), THREAD_PAGE)
+        self.assertEqual(
+            self.store.get_user("5d5948e1455110001e3f4d8b")["name"], "Wirus"
+        )
+
+    def test_replies_inherit_the_category_of_their_thread(self):
+        self.store.add(THREAD_PAGE["posts"])
+        self.store.flush()
+
+        rows = sqlite3.connect(self.path).execute(
+            "SELECT id FROM posts WHERE category = 'games'"
+        )
+
+        self.assertEqual(len(rows.fetchall()), 2)
+
+    def test_writes_are_batched(self):
+        self.store.batch_size = 100
+        self.store.add(THREAD_PAGE["posts"], THREAD_PAGE["users"])
+        connection = sqlite3.connect(self.path)
+
+        self.assertEqual(connection.execute("SELECT * FROM posts").fetchall(), [])
+
+        self.store.flush()
+
+        self.assertEqual(len(connection.execute("SELECT * FROM posts").fetchall()), 2)
+
+    def test_stale_responses_are_not_returned(self):
+        key = ("post", "609f78fe90c3d5001e889e33")
+        self.store.set(key, THREAD_PAGE, ttl=-1)
+
+        self.assertNotIn(key, self.store)
+        self.assertIsNone(self.store.get(key))
+
+    def test_store_is_shared_between_connections(self):
+        key = ("category", "games", 1)
+        self.store.set(key, THREAD_PAGE)
+        self.store.flush()
+
+        with SQLiteStore(self.path) as other_store:
+            self.assertEqual(other_store.get(key), THREAD_PAGE)
+
+    @patch("loading_sdk.sync_api.client.requests")
+    def test_client_reads_through_store(self, mock_requests):
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = THREAD_PAGE
+        mock_requests.get.return_value = mock_response
+
+        api = LoadingApiClient(cache=self.store)
+        first_response = api.get_thread("609e2783b7a187001e0c0440")
+        second_response = api.get_thread("609e2783b7a187001e0c0440")
+
+        self.assertEqual(mock_requests.get.call_count, 1)
+        self.assertEqual(first_response, second_response)
+        self.assertEqual(second_response.get("data"), THREAD_PAGE)
+
+
+class ThreadRecordingStore(SQLiteStore):
+    def __init__(self, path):
+        super().__init__(path)
+        self.threads = set()
+
+    def get(self, key, default=None):
+        self.threads.add(threading.current_thread())
+        return super().get(key, default)
+
+    def set(self, key, value, size=0, ttl=None):
+        self.threads.add(threading.current_thread())
+        super().set(key, value, size, ttl)
+
+
+class TestAsyncSQLiteStore(unittest.IsolatedAsyncioTestCase):
+    async def test_store_is_used_off_the_loop(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        store = ThreadRecordingStore(os.path.join(directory.name, "loading.db"))
+        self.addCleanup(store.close)
+        transport = FakeTransport(lambda request: (200, THREAD_PAGE))
+        api = await AsyncLoadingApiClient(transport=transport, cache=store)
+
+        first_response = await api.get_thread("609e2783b7a187001e0c0440")
+        second_response = await api.get_thread("609e2783b7a187001e0c0440")
+        await api.close()
+
+        self.assertEqual(first_response, second_response)
+        self.assertEqual(len(transport.requests), 1)
+        self.assertNotIn(threading.current_thread(), store.threads)
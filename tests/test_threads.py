@@ -0,0 +1,103 @@
+import sys
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from loading_sdk import LoadingApiClient
+from loading_sdk.cache import ResponseCache
+from loading_sdk.search_index import SearchIndex
+from loading_sdk.sync_api.transport import FakeTransport, SessionPoolTransport
+
+
+def post(request):
+    post_id = request.url.rsplit("/", 1)[-1]
+
+    return 200, {"posts": [{"id": post_id}], "users": []}
+
+
+class TestThreadSafeClient(unittest.TestCase):
+    def test_default_transport(self):
+        api = LoadingApiClient(thread_safe=True)
+
+        self.assertIsInstance(api._transport, SessionPoolTransport)
+
+    def test_map(self):
+        api = LoadingApiClient(
+            transport=FakeTransport(post), cache=ResponseCache(), thread_safe=True
+        )
+        post_ids = [str(i) for i in range(50)]
+
+        responses = list(api.map("get_post", post_ids, workers=8))
+
+        self.assertEqual(
+            [response["data"]["posts"][0]["id"] for response in responses], post_ids
+        )
+        self.assertEqual(api.get_post("7")["data"]["posts"][0]["id"], "7")
+        self.assertEqual(len(api._transport.requests), 50)
+
+    def test_map_queue_size(self):
+        api = LoadingApiClient(transport=FakeTransport(post), thread_safe=True)
+        consumed = []
+
+        def post_ids():
+            for i in range(20):
+                consumed.append(i)
+                yield str(i)
+
+        responses = api.map("get_post", post_ids(), workers=2, queue_size=3)
+        next(responses)
+
+        self.assertEqual(len(consumed), 4)
+
+        responses.close()
+
+    def test_map_without_thread_safe(self):
+        # The caches and the index are updated under a lock in any case.
+        def thread(request):
+            thread_id = request.url.rsplit("/", 1)[-1]
+            posts = [{"id": f"{thread_id}-{i}", "body": "spel"} for i in range(10)]
+
+            return 200, {"posts": posts, "users": []}
+
+        index = SearchIndex()
+        api = LoadingApiClient(
+            transport=FakeTransport(thread), cache=ResponseCache(), search_index=index
+        )
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        self.addCleanup(sys.setswitchinterval, interval)
+
+        responses = list(api.map("get_post", map(str, range(500)), workers=16))
+
+        self.assertEqual(len(responses), 500)
+        self.assertEqual(len(index), 5000)
+        self.assertEqual(len(api._cache), 500)
+
+    def test_map_tuple_arguments(self):
+        api = LoadingApiClient(transport=FakeTransport(post))
+
+        responses = list(api.map("get_thread", [("1", 1), ("2", 1)]))
+
+        self.assertEqual([response["code"] for response in responses], [200, 200])
+
+
+class TestSessionPoolTransport(unittest.TestCase):
+    def test_session_per_thread(self):
+        transport = SessionPoolTransport(pool_size=4)
+        barrier = threading.Barrier(3)
+
+        def session(_):
+            result = transport._get_session()
+            barrier.wait()
+
+            return result
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            sessions = list(executor.map(session, range(3)))
+
+        self.assertEqual(len(set(map(id, sessions))), 3)
+        self.assertIs(transport._get_session(), transport._get_session())
+
+        transport.close()
+
+        self.assertEqual(transport._sessions, [])
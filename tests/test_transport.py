@@ -0,0 +1,93 @@
+import unittest
+
+from loading_sdk import AsyncLoadingApiClient, LoadingApiClient, protocol
+from loading_sdk.async_api import transport as async_transport
+from loading_sdk.sync_api import transport as sync_transport
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+def thread(request):
+    if request.url.endswith("/missing"):
+        return 404, {"code": 404, "message": "Post does not exist"}
+
+    page = int(request.headers.get("page", 1))
+    posts = [{"id": f"reply-{page}"}, {"id": "1", "title": "Thread", "replies": 65}]
+
+    return 200, {"posts": posts, "users": []}
+
+
+class TestTransport(unittest.TestCase):
+    def test_fake_transport(self):
+        transport = sync_transport.FakeTransport(thread)
+        api = LoadingApiClient(transport=transport)
+
+        response = api.get_thread("1", page=2)
+
+        self.assertEqual(response["code"], 200)
+        self.assertEqual(response["data"]["posts"][0]["id"], "reply-2")
+        self.assertEqual(api.get_post("missing")["message"], "Post does not exist")
+        self.assertEqual(
+            [request.key for request in transport.requests],
+            [("thread", "1", 2), ("post", "missing")],
+        )
+
+    @unittest.skipIf(httpx is None, "httpx isn't installed")
+    def test_httpx_transport(self):
+        def handler(request):
+            self.assertEqual(request.headers["cookie"], "jwt=token")
+            self.assertEqual(request.content, b"body=message")
+
+            return httpx.Response(201, json={"id": "2"})
+
+        transport = sync_transport.HttpxTransport(
+            transport=httpx.MockTransport(handler)
+        )
+        api = LoadingApiClient(transport=transport)
+        api._cookies = {"jwt": "token"}
+
+        response = api.create_post("1", "message")
+        api.close()
+
+        self.assertEqual(
+            response, {"code": 201, "message": "Post created", "data": {"id": "2"}}
+        )
+
+    def test_cookie_headers(self):
+        headers = {"User-Agent": "agent"}
+
+        self.assertIs(protocol.cookie_headers(headers, None), headers)
+        self.assertEqual(
+            protocol.cookie_headers(headers, {"jwt": "a", "refreshToken": "b"}),
+            {"User-Agent": "agent", "Cookie": "jwt=a; refreshToken=b"},
+        )
+
+
+class TestAsyncTransport(unittest.IsolatedAsyncioTestCase):
+    async def test_fake_transport(self):
+        transport = async_transport.FakeTransport(thread)
+        api = await AsyncLoadingApiClient(transport=transport)
+
+        response = await api.get_thread("1", page=3)
+        await api.close()
+
+        self.assertEqual(response["data"]["posts"][0]["id"], "reply-3")
+        self.assertEqual(len(transport.requests), 1)
+
+    @unittest.skipIf(httpx is None, "httpx isn't installed")
+    async def test_httpx_transport(self):
+        def handler(request):
+            return httpx.Response(200, json={"posts": [{"id": "1"}], "users": []})
+
+        transport = async_transport.HttpxTransport(
+            transport=httpx.MockTransport(handler)
+        )
+        api = await AsyncLoadingApiClient(transport=transport)
+
+        response = await api.get_games()
+        await api.close()
+
+        self.assertEqual(response["code"], 200)
@@ -0,0 +1,147 @@
+import os
+import tempfile
+import unittest
+
+from loading_sdk import AsyncLoadingApiClient, LoadingApiClient, protocol
+from loading_sdk.async_api import transport as async_transport
+from loading_sdk.cache import ResponseCache
+from loading_sdk.store import SQLiteStore
+from loading_sdk.sync_api.transport import FakeTransport
+
+
+def forum(replies):
+    thread = {"id": "t1", "title": "Thread", "category": "games", "replies": replies}
+    reply = {"id": "p1", "parentId": "t1", "body": "First"}
+
+    def handler(request):
+        if request.method == "post":
+            post = {"id": "p2", "parentId": "t1", "body": request.data["body"]}
+            return 201, post
+
+        if request.method == "patch":
+            post = reply if request.url.endswith("/p1") else thread
+            return 200, {**post, "body": request.data["body"], "edits": 1}
+
+        if request.url == protocol.POSTS_URL:
+            return 200, {"posts": [thread], "users": []}
+
+        if request.url.endswith("/p1"):
+            return 200, {"posts": [reply], "users": []}
+
+        return 200, {"posts": [reply, thread], "users": []}
+
+    return handler
+
+
+class TestWriteThrough(unittest.TestCase):
+    def client(self, replies=1, cache=None):
+        transport = FakeTransport(forum(replies))
+        api = LoadingApiClient(
+            transport=transport, cache=ResponseCache() if cache is None else cache
+        )
+        api.get_thread("t1")
+        api.get_post("p1")
+        api.get_games(1)
+
+        return api, transport
+
+    def test_create_post(self):
+        api, transport = self.client()
+
+        self.assertEqual(api.create_post("t1", "Second")["code"], 201)
+
+        requests = len(transport.requests)
+        posts = api.get_thread("t1")["data"]["posts"]
+
+        self.assertEqual([post["id"] for post in posts], ["p1", "p2", "t1"])
+        self.assertEqual(posts[-1]["replies"], 2)
+        self.assertEqual(len(transport.requests), requests)
+
+        api.get_games(1)
+
+        self.assertEqual(len(transport.requests), requests + 1)
+
+    def test_create_post_on_a_new_page(self):
+        api, _ = self.client(replies=30)
+
+        api.create_post("t1", "Second")
+        posts = api.get_thread("t1")["data"]["posts"]
+
+        self.assertEqual([post["id"] for post in posts], ["p1", "t1"])
+        self.assertEqual(posts[-1]["replies"], 31)
+
+    def test_edit_post(self):
+        api, transport = self.client()
+
+        self.assertEqual(api.edit_post("p1", "Edited")["code"], 200)
+
+        requests = len(transport.requests)
+
+        self.assertEqual(api.get_post("p1")["data"]["posts"][0]["body"], "Edited")
+        self.assertEqual(
+            api.get_thread("t1")["data"]["posts"][0],
+            {"id": "p1", "parentId": "t1", "body": "Edited", "edits": 1},
+        )
+        self.assertEqual(len(transport.requests), requests)
+
+        # Only edits of the thread itself changes the listings.
+        api.get_games(1)
+        api.edit_thread("t1", "Edited")
+        api.get_games(1)
+
+        self.assertEqual(len(transport.requests), requests + 2)
+
+    def test_updates_keep_stats_and_ttl(self):
+        cache = ResponseCache(ttl=60)
+        api, _ = self.client(cache=cache)
+        stats = cache.stats()
+        thread = cache._entries[("thread", "t1", 1)]
+        post = cache._entries[("post", "p1")]
+
+        api.edit_thread("t1", "Edited")
+
+        self.assertEqual(cache.stats()["hits"], stats["hits"])
+        self.assertEqual(cache.stats()["misses"], stats["misses"])
+        self.assertAlmostEqual(
+            cache._entries[("thread", "t1", 1)][0], thread[0], delta=1
+        )
+        self.assertIs(cache._entries[("post", "p1")], post)
+
+    def test_thread_without_cached_first_page(self):
+        api, transport = self.client()
+        api._cache.delete(("thread", "t1", 1))
+        api.get_thread("t1", 2)
+
+        api.create_post("t1", "Second")
+        requests = len(transport.requests)
+        api.get_thread("t1", 2)
+
+        self.assertEqual(len(transport.requests), requests + 1)
+
+    def test_store(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+
+        with SQLiteStore(os.path.join(directory.name, "store.db")) as store:
+            api, transport = self.client(cache=store)
+            api.create_post("t1", "Second")
+            requests = len(transport.requests)
+            posts = api.get_thread("t1")["data"]["posts"]
+
+            self.assertEqual([post["id"] for post in posts], ["p1", "p2", "t1"])
+            self.assertEqual(len(transport.requests), requests)
+            self.assertNotIn(("category", "games", 1), store)
+
+
+class TestAsyncWriteThrough(unittest.IsolatedAsyncioTestCase):
+    async def test_create_post(self):
+        transport = async_transport.FakeTransport(forum(1))
+        api = await AsyncLoadingApiClient(transport=transport, cache=ResponseCache())
+        await api.get_thread("t1")
+
+        await api.create_post("t1", "Second")
+        response = await api.get_thread("t1")
+        await api.close()
+
+        self.assertEqual(len(response["data"]["posts"]), 3)
+        self.assertEqual(len(transport.requests), 2)
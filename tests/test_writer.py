@@ -0,0 +1,139 @@
+import asyncio
+import unittest
+
+from loading_sdk.async_api import WriteQueue
+from loading_sdk.async_api.writer import Job
+
+
+class Client:
+    """Records the writes it gets and answers them with the given responses."""
+
+    def __init__(self, *responses, delay=0):
+        self.responses = list(responses)
+        self.delay = delay
+        self.calls = []
+        self.release = None
+
+    async def _write(self, name, *args):
+        self.calls.append((name, *args))
+
+        if self.release is not None:
+            await self.release.wait()
+
+        await asyncio.sleep(self.delay)
+        response = self.responses.pop(0) if self.responses else {"code": 201}
+
+        if isinstance(response, Exception):
+            raise response
+
+        return response
+
+    async def create_post(self, thread_id, message):
+        return await self._write("create_post", thread_id, message)
+
+    async def edit_post(self, post_id, message):
+        return await self._write("edit_post", post_id, message)
+
+
+class TestWriteQueue(unittest.IsolatedAsyncioTestCase):
+    async def test_writes_to_a_thread_are_ordered(self):
+        client = Client(delay=0.001)
+
+        async with WriteQueue(client, concurrency=4, rate=1000) as queue:
+            futures = [
+                await queue.create_post(thread_id, str(i))
+                for i in range(5)
+                for thread_id in ("a", "b")
+            ]
+
+        for future in futures:
+            self.assertEqual(future.result(), {"code": 201})
+
+        for thread_id in ("a", "b"):
+            messages = [call[2] for call in client.calls if call[1] == thread_id]
+            self.assertEqual(messages, ["0", "1", "2", "3", "4"])
+
+    async def test_retries(self):
+        client = Client({"code": 429}, {"code": 503}, {"code": 201})
+
+        async with WriteQueue(client, rate=1000, backoff=0) as queue:
+            future = await queue.create_post("a", "message")
+
+        self.assertEqual(future.result(), {"code": 201})
+        self.assertEqual(len(client.calls), 3)
+
+    async def test_new_posts_arent_retried_after_errors(self):
+        client = Client(ConnectionError(), ConnectionError(), {"code": 200})
+
+        async with WriteQueue(client, rate=1000, backoff=0) as queue:
+            post = await queue.create_post("a", "message")
+            edit = await queue.edit_post("1", "message")
+
+        with self.assertRaises(ConnectionError):
+            post.result()
+
+        self.assertEqual(edit.result(), {"code": 200})
+        self.assertEqual(len(client.calls), 3)
+
+    async def test_new_posts_arent_retried_after_gateway_errors(self):
+        client = Client({"code": 502}, {"code": 504}, {"code": 200})
+
+        async with WriteQueue(client, rate=1000, backoff=0) as queue:
+            post = await queue.create_post("a", "message")
+            edit = await queue.edit_post("1", "message")
+
+        self.assertEqual(post.result(), {"code": 502})
+        self.assertEqual(edit.result(), {"code": 200})
+        self.assertEqual(len(client.calls), 3)
+
+    async def test_new_posts_are_retried_when_not_sent(self):
+        client = Client(ConnectionRefusedError(), {"code": 201})
+
+        async with WriteQueue(client, rate=1000, backoff=0) as queue:
+            post = await queue.create_post("a", "message")
+
+        self.assertEqual(post.result(), {"code": 201})
+        self.assertEqual(len(client.calls), 2)
+
+    async def test_idempotency_key(self):
+        client = Client()
+
+        async with WriteQueue(client, rate=1000) as queue:
+            first = await queue.create_post("a", "message", idempotency_key="key")
+            second = await queue.create_post("a", "message", idempotency_key="key")
+            await queue.join()
+            third = await queue.create_post("a", "message", idempotency_key="key")
+
+        self.assertIs(first, second)
+        self.assertEqual(third.result(), first.result())
+        self.assertEqual(len(client.calls), 1)
+
+    async def test_backpressure(self):
+        client = Client()
+        client.release = asyncio.Event()
+        queue = WriteQueue(client, max_size=1, concurrency=1, rate=1000)
+
+        await queue.create_post("a", "1")
+        await asyncio.sleep(0)
+        await queue.create_post("b", "2")
+
+        with self.assertRaises(asyncio.QueueFull):
+            queue.submit_nowait(Job("create_post", ("c", "3"), "c"))
+
+        self.assertEqual(queue.pending, 2)
+
+        client.release.set()
+        await queue.close()
+
+        self.assertEqual(queue.pending, 0)
+
+    async def test_rate(self):
+        client = Client()
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+
+        async with WriteQueue(client, rate=50) as queue:
+            for i in range(5):
+                await queue.create_post(str(i), "message")
+
+        self.assertGreaterEqual(loop.time() - start, 0.08)